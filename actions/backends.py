@@ -0,0 +1,111 @@
+"""
+OS input backends used by the action dispatcher worker.
+All of them expose the same small API: press, hotkey, scroll, lock_workstation,
+plus move_to / screen_size for the pointer thread (actions.pointer)
+"""
+import time
+
+
+class PyAutoGuiBackend:
+    """real keyboard/mouse injection (pyautogui is imported on first use, or by warm_up())"""
+    def __init__(self, pause=0.0):
+        self.pause = pause
+        self._pyautogui = None
+
+    @property
+    def pyautogui(self):
+        if self._pyautogui is None:
+            import pyautogui
+            #pyautogui sleeps PAUSE seconds after every call, the dispatcher paces actions itself
+            pyautogui.PAUSE = self.pause
+            self._pyautogui = pyautogui
+        return self._pyautogui
+
+    def warm_up(self):
+        """does the slow import now (call it off the frame loop, e.g. on the dispatcher worker)"""
+        self.pyautogui
+
+    def press(self, key):
+        self.pyautogui.press(key)
+
+    def hotkey(self, *keys):
+        self.pyautogui.hotkey(*keys)
+
+    def scroll(self, amount):
+        self.pyautogui.scroll(amount)
+
+    def lock_workstation(self):
+        import ctypes
+        ctypes.windll.user32.LockWorkStation()
+
+    def move_to(self, x, y):
+        self.pyautogui.moveTo(x, y, _pause=False)
+
+    def screen_size(self):
+        return tuple(self.pyautogui.size())
+
+
+class NullBackend:
+    """swallows every action (headless runs, benchmarks)"""
+    def __init__(self, size=(1920, 1080)):
+        self.size = size
+
+    def press(self, key):
+        pass
+
+    def hotkey(self, *keys):
+        pass
+
+    def scroll(self, amount):
+        pass
+
+    def lock_workstation(self):
+        pass
+
+    def move_to(self, x, y):
+        pass
+
+    def screen_size(self):
+        return self.size
+
+
+class RecordingBackend:
+    """keeps every action in memory as (time, name, args) -> headless tests and latency checks"""
+    def __init__(self, size=(1920, 1080)):
+        self.calls = []
+        self.size = size                  #pretend screen for the pointer
+
+    def _record(self, name, *args):
+        self.calls.append((time.perf_counter(), name, args))
+
+    def press(self, key):
+        self._record('press', key)
+
+    def hotkey(self, *keys):
+        self._record('hotkey', *keys)
+
+    def scroll(self, amount):
+        self._record('scroll', amount)
+
+    def lock_workstation(self):
+        self._record('lock_workstation')
+
+    def move_to(self, x, y):
+        self._record('move_to', x, y)
+
+    def screen_size(self):
+        return self.size
+
+
+BACKENDS = {
+    'pyautogui': PyAutoGuiBackend,
+    'null': NullBackend,
+    'recording': RecordingBackend,
+}
+
+
+def make_backend(name):
+    """backend instance by config name: 'pyautogui' | 'null' | 'recording'"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown action backend '{name}', use one of {sorted(BACKENDS)}")
+    return BACKENDS[name]()
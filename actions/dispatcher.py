@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import deque
+
+from utils.metrics import Metrics
+
+
+class ActionDispatcher:
+    """
+    Runs OS actions on a dedicated worker thread so the frame loop never blocks on input injection.
+
+    - submit() only appends to a queue and returns immediately
+    - an action whose key is already waiting in the queue is coalesced (dropped), so a gesture
+      held over several frames can't pile up repeated key presses
+    - enqueue -> execution latency and execution time go to metrics ('action_queue', 'action_exec')
+    """
+    def __init__(self, metrics=None, maxsize=32):
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
+        self.maxsize = maxsize
+        self.pending = deque()
+        self.pending_keys = set()
+        self.busy = False
+        self.running = True
+        self.coalesced = 0
+        self.executed = 0
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='ActionDispatcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, key, fn, *args):
+        """queues fn(*args); returns False if an identical action (same key) is already pending or the queue is full"""
+        with self._cond:
+            if key in self.pending_keys or len(self.pending) >= self.maxsize:
+                self.coalesced += 1
+                self.metrics.count('actions_coalesced')
+                return False
+            self.pending_keys.add(key)
+            self.pending.append((key, fn, args, time.perf_counter()))
+            self._cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self.pending or not self.running)
+                if not self.pending:
+                    return
+                key, fn, args, queued_at = self.pending.popleft()
+                self.pending_keys.discard(key)
+                self.busy = True
+
+            start = time.perf_counter()
+            self.metrics.observe('action_queue', start - queued_at)
+            try:
+                fn(*args)
+            except Exception as e:           #a failing backend must not kill the worker
+                print(f"Action '{key}' failed: {e}")
+            self.metrics.observe('action_exec', time.perf_counter() - start)
+            self.metrics.count('actions_executed')
+
+            with self._cond:
+                self.executed += 1
+                self.busy = False
+                self._cond.notify_all()
+
+    def flush(self, timeout=2.0):
+        """waits until every queued action ran (tests / shutdown); True if the queue drained"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self.pending and not self.busy, timeout=timeout)
+
+    def stop(self, timeout=2.0):
+        """runs what is still queued, then ends the worker"""
+        self.flush(timeout)
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
@@ -0,0 +1,82 @@
+"""
+Declarative gesture -> action bindings.
+
+Bindings come from utils.config.GESTURE_BINDINGS, e.g.
+    {"left_wink": "copy", "head_turn_right": "task_view", "smile": ["hotkey:ctrl+s", "press:enter"]}
+
+An action is a KeyboardActions method name (optionally written "KeyboardActions.copy"),
+"press:<key>" or "hotkey:<key>+<key>". Everything is resolved once at startup into a
+gesture -> handlers dispatch table, so per frame it's one dict lookup per emitted event
+and unbound gestures (and the detectors only they need) cost nothing.
+"""
+from functools import partial
+
+# gesture -> detector that produces it
+GESTURES = {
+    'head_turn_left': 'head',
+    'head_turn_right': 'head',
+    'left_wink': 'eye',
+    'right_wink': 'eye',
+    'both_blink': 'eye',
+    'eyebrow_hold': 'eye',
+    'smile': 'mouth',
+    'dwell_top_left': 'gaze',
+    'dwell_top': 'gaze',
+    'dwell_top_right': 'gaze',
+    'dwell_left': 'gaze',
+    'dwell_center': 'gaze',
+    'dwell_right': 'gaze',
+    'dwell_bottom_left': 'gaze',
+    'dwell_bottom': 'gaze',
+    'dwell_bottom_right': 'gaze',
+    'fist': 'hand',
+    'open_palm': 'hand',
+    'pinch': 'hand',
+    'fingers_1': 'hand',
+    'fingers_2': 'hand',
+    'fingers_3': 'hand',
+    'fingers_4': 'hand',
+}
+
+
+def _resolve(actions, action):
+    """action spec string -> zero-argument callable on `actions`"""
+    if action.startswith('press:'):
+        return partial(actions.press_key, action[len('press:'):])
+    if action.startswith('hotkey:'):
+        return partial(actions.press_hotkeys, action[len('hotkey:'):].split('+'))
+
+    name = action.split('.')[-1]          #"KeyboardActions.copy" -> "copy"
+    fn = getattr(actions, name, None)
+    if name.startswith('_') or not callable(fn):
+        raise ValueError(f"Unknown action '{action}' in gesture bindings")
+    return fn
+
+
+class GestureRules:
+    def __init__(self, bindings, actions):
+        """
+        bindings -> {gesture: action spec | [action specs] | None (disabled)}
+        actions  -> KeyboardActions instance the specs are resolved against
+        """
+        self.table = {}
+        for gesture, specs in bindings.items():
+            if gesture not in GESTURES:
+                raise ValueError(f"Unknown gesture '{gesture}', use one of {sorted(GESTURES)}")
+            if not specs:
+                continue
+            if isinstance(specs, str):
+                specs = [specs]
+            self.table[gesture] = tuple(_resolve(actions, spec) for spec in specs)
+
+        #only these detectors have to run for the bindings to work
+        self.detectors = frozenset(GESTURES[gesture] for gesture in self.table)
+
+    def dispatch(self, events):
+        """runs the handlers bound to each emitted gesture event (detectors.events.GestureEvent)"""
+        table = self.table
+        for event in events:
+            handlers = table.get(event.type)
+            if handlers:
+                for handler in handlers:
+                    handler()
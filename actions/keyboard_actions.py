@@ -1,99 +1,132 @@
-import pyautogui
-import time 
-import ctypes 
+import time
+
+from actions.backends import PyAutoGuiBackend
+from actions.dispatcher import ActionDispatcher
 
 class KeyboardActions:
-    def __init__(self, cooldown=0.5):
-        """ cooldown -> minimum time between actions to prevent accidental spam"""
+    def __init__(self, cooldown=0.5, backend=None, dispatcher=None, metrics=None):
+        """
+        cooldown   -> minimum time between actions to prevent accidental spam
+        backend    -> OS input backend (actions.backends), default pyautogui
+        dispatcher -> worker queue the actions run on, a private one is started if not given
+        every public method only queues the action and returns at once, it never blocks the frame loop
+        """
         self.cooldown = cooldown
         self.last_press_time = 0
+        self.backend = backend if backend is not None else PyAutoGuiBackend()
+        self.dispatcher = dispatcher if dispatcher is not None else ActionDispatcher(metrics=metrics)
 
     def _log_action(self, action_name):
         """prints a clean message for debugging in terminal"""
         print(f"[{time.strftime('%H:%M:%S')}] KEYBOARD: {action_name}")
-    
+
     def _can_press(self):
-        """checks if enough time has passed since the last action"""
+        """checks if enough time has passed since the last action (runs on the dispatcher worker)"""
         now = time.time()
         if now - self.last_press_time >= self.cooldown:
             self.last_press_time = now
             return True
         return False
 
+    def _submit(self, key, fn, *args):
+        """queues fn(*args) on the worker, repeats of the same key coalesce while still pending"""
+        return self.dispatcher.submit(key, fn, *args)
+
+    # ── WORKER SIDE (executed on the dispatcher thread) ──────────────
+    def _do_press(self, key):
+        if self._can_press():
+            self.backend.press(key)
+            self._log_action(f"Pressed '{key}'")
+
+    def _do_hotkey(self, keys):
+        if self._can_press():
+            self.backend.hotkey(*keys)
+            self._log_action(f"Hotkey {' + '.join(keys)}")
+
+    def _do_lock(self):
+        print(">>> Windows Locking Activated")
+        self.backend.lock_workstation()
+        self.last_press_time = time.time() + 2.0 # Add extra delay after locking
+
     # ── GENERIC HELPERS ──────────────────────────────────────────────
     def press_key(self, key: str):
         """press a single key like 'enter', 'esc', 'f' , etc """
-        if self._can_press():
-            pyautogui.press(key)
-            self._log_action(f"Pressed '{key}'")
+        self._submit(('press', key), self._do_press, key)
 
     def press_hotkeys(self, keys: list):
         """press combo keys like ctrl + c, ctrl + v, etc"""
-        if self._can_press():
-            pyautogui.press(*keys)
-            self._log_action(f"Hotkey {" + ".join(keys)}")
+        self._submit(('hotkey', tuple(keys)), self._do_hotkey, list(keys))
 
     # ── ESSENTIAL ACTIONS ────────────────────────────────────────────
     def copy(self):
         self.press_hotkeys(['ctrl','c'])
-    
+
     def cut(self):
         self.press_hotkeys(['ctrl','x'])
 
     def paste(self):
         self.press_hotkeys(['ctrl','v'])
-    
+
     def undo(self):
         self.press_hotkeys(['ctrl','z'])
-    
+
     def redo(self):
         self.press_hotkeys(['ctrl','y'])
-    
+
     def select_all(self):
         self.press_hotkeys(['ctrl','a'])
 
     def screenshot(self):
         self.press_hotkeys(['win','prtscr'])
-    
+
     def switch_window(self):
-        if self._can_press():
-            self.press_hotkeys(['alt','tab'])
-    
+        self.press_hotkeys(['alt','tab'])
+
     def task_view(self):
         self.press_hotkeys(['win','tab'])
-    
+
     # ── SCROLLING & NAVIGATION ───────────────────────────────────────
     def scroll_up(self, amount=300):
         """as scroll often needs no cooldown or faster one, so we bypass normal cooldown"""
-        pyautogui.scroll(amount)
-    
+        self._submit(('scroll', amount), self.backend.scroll, amount)
+
     def scroll_down(self, amount=-300):
-        pyautogui.scroll(amount)
-    
+        self._submit(('scroll', amount), self.backend.scroll, amount)
+
     def page_up(self):
         self.press_key('pgup')
-    
+
     def page_down(self):
         self.press_key('pgdn')
 
     # ── MEDIA CONTROLS ───────────────────────────────────────────────
     def volume_up(self):
-        pyautogui.press('volumeup')
+        self._submit(('media', 'volumeup'), self.backend.press, 'volumeup')
 
     def volume_down(self):
-        pyautogui.press('volumedown')
-    
+        self._submit(('media', 'volumedown'), self.backend.press, 'volumedown')
+
     def volume_mute(self):
-        pyautogui.press('volumemute')
-        self._log_action("Mute/Unmute")
-    
+        self._submit(('media', 'volumemute'), self._do_media, 'volumemute', "Mute/Unmute")
+
     def play_pause(self):
-        pyautogui.press('playpause')
-        self._log_action('Media Play/Pause')
-    
+        self._submit(('media', 'playpause'), self._do_media, 'playpause', 'Media Play/Pause')
+
+    def _do_media(self, key, label):
+        self.backend.press(key)
+        self._log_action(label)
+
     # ── SYSTEM ───────────────────────────────────────────────────────
     def lock_windows(self):
         """we bypass delay here"""
-        print(">>> Windows Locking Activated")
-        ctypes.windll.user32.LockWorkStation()
-        self.last_press_time = time.time() + 2.0 # Add extra delay after locking
\ No newline at end of file
+        self._submit(('lock',), self._do_lock)
+
+    def warm_up(self):
+        """lets the backend do its slow setup (imports) on the worker, before the first real action"""
+        warm_up = getattr(self.backend, 'warm_up', None)
+        if warm_up is not None:
+            self._submit(('warm_up',), warm_up)
+
+    def close(self):
+        """lets queued actions finish and stops the worker"""
+        self.dispatcher.stop()
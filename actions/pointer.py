@@ -0,0 +1,166 @@
+"""
+Pointer control: a landmark (nose tip, iris centres or index fingertip) steers the mouse cursor.
+
+The camera gives a new position ~30 times a second; a dedicated thread moves the cursor at its own
+rate (120 Hz by default), extrapolating from the latest samples in between, so the pointer glides
+instead of jumping once per frame and the frame loop never waits on OS input calls.
+"""
+import math
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# landmark indices averaged per source ('index' takes hand landmarks, the others face landmarks)
+SOURCES = {
+    'nose': (1,),                 #nose tip
+    'iris': (468, 473),           #both iris centres (refined mesh)
+    'index': (8,),                #index fingertip (MediaPipe Hands)
+}
+
+
+class PointerMapper:
+    """
+    landmark -> normalized screen position (0..1, 0..1).
+    The first position seen (or the one at recenter()) maps to the screen centre; moving by
+    1/gain of the frame from there reaches the screen edge.
+    """
+    def __init__(self, source='nose', gain=5.0):
+        if source not in SOURCES:
+            raise ValueError(f"Unknown pointer source '{source}', use one of {sorted(SOURCES)}")
+        self.source = source
+        self.points = np.array(SOURCES[source])
+        self.gain = gain
+        self.center = None
+
+    def recenter(self):
+        """the next position becomes the screen centre"""
+        self.center = None
+
+    def map(self, landmarks):
+        """landmarks: (N, 3) normalized array -> (x, y) in 0..1"""
+        point = landmarks[self.points, :2].mean(axis=0)
+        if self.center is None:
+            self.center = point.copy()
+        x, y = ((point - self.center) * self.gain + 0.5).tolist()
+        return min(max(x, 0.0), 1.0), min(max(y, 0.0), 1.0)
+
+
+class PointerController:
+    """
+    Moves the cursor from its own thread at `rate` Hz.
+
+    update() (frame loop, ~camera fps) only stores the newest sample, nothing is queued: samples that
+    arrive faster than the cursor thread uses them simply replace each other. Every tick the thread
+    predicts where the pointer is now (last sample + velocity x time since its capture, capped at
+    max_predict), smooths towards it and calls backend.move_to() only when the pixel position changed.
+    """
+    def __init__(self, backend, rate=120, max_predict=0.05, smoothing=0.015, metrics=None):
+        """
+        backend     -> actions.backends instance (move_to, screen_size)
+        max_predict -> longest extrapolation past the last sample (s); the pointer stops there when the face is lost
+        smoothing   -> time constant (s) of the exponential smoothing towards the predicted position, 0 = off
+        """
+        self.backend = backend
+        self.period = 1.0 / rate
+        self.max_predict = max_predict
+        self.smoothing = smoothing
+        self.metrics = metrics
+
+        self._lock = threading.Lock()
+        self._sample = None               #(x, y, capture timestamp) normalized
+        self._velocity = (0.0, 0.0)       #normalized units / s
+        self._thread = None
+        self._running = False
+
+        self.ticks = 0
+        self.moves = 0
+        self.samples = 0
+        self.tick_intervals = deque(maxlen=1000)
+        self.latencies = deque(maxlen=1000)   #capture of the newest sample -> cursor move (s)
+
+    # ── frame loop side ──────────────────────────────────────────────
+    def update(self, x, y, timestamp):
+        """new normalized target from the frame captured at `timestamp`"""
+        with self._lock:
+            if self._sample is not None:
+                dt = timestamp - self._sample[2]
+                if dt <= 0:
+                    return
+                vx = (x - self._sample[0]) / dt
+                vy = (y - self._sample[1]) / dt
+                #half-weight average, one noisy frame shouldn't fling the pointer
+                self._velocity = (0.5 * (self._velocity[0] + vx), 0.5 * (self._velocity[1] + vy))
+            self._sample = (x, y, timestamp)
+            self.samples += 1
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='PointerController', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    # ── cursor thread ───────────────────────────────────────────────
+    def predict(self, now):
+        """normalized (x, y, capture timestamp of the sample used) at time `now`, or None before the first sample"""
+        with self._lock:
+            if self._sample is None:
+                return None
+            x, y, timestamp = self._sample
+            vx, vy = self._velocity
+        ahead = min(max(now - timestamp, 0.0), self.max_predict)
+        return min(max(x + vx * ahead, 0.0), 1.0), min(max(y + vy * ahead, 0.0), 1.0), timestamp
+
+    def _run(self):
+        width, height = self.backend.screen_size()        #may import the backend, keep it off the frame loop
+        position = None
+        sent = None
+        last_tick = next_tick = time.perf_counter()
+        while self._running:
+            now = time.perf_counter()
+            self.ticks += 1
+            self.tick_intervals.append(now - last_tick)
+            last_tick = now
+
+            target = self.predict(now)
+            if target is not None:
+                x, y, timestamp = target
+                if position is None or self.smoothing <= 0:
+                    position = [x, y]
+                else:
+                    alpha = 1.0 - math.exp(-self.period / self.smoothing)
+                    position[0] += alpha * (x - position[0])
+                    position[1] += alpha * (y - position[1])
+                pixel = (round(position[0] * (width - 1)), round(position[1] * (height - 1)))
+                if pixel != sent:
+                    self.backend.move_to(*pixel)
+                    sent = pixel
+                    self.moves += 1
+                    self.latencies.append(time.perf_counter() - timestamp)
+
+            #fixed-rate ticks; when the thread fell behind, skip the missed ones instead of bursting
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    def stats(self):
+        """tick rate / jitter and capture -> move latency in ms (for tuning, or with the recording backend in tests)"""
+        intervals = np.array(self.tick_intervals)[1:] * 1000
+        latencies = np.array(self.latencies) * 1000
+        return {
+            'ticks': self.ticks,
+            'moves': self.moves,
+            'samples': self.samples,
+            'tick_ms': float(intervals.mean()) if len(intervals) else 0.0,
+            'jitter_ms': float(intervals.std()) if len(intervals) else 0.0,
+            'latency_ms': float(latencies.mean()) if len(latencies) else 0.0,
+            'latency_p95_ms': float(np.percentile(latencies, 95)) if len(latencies) else 0.0,
+        }
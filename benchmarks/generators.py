@@ -0,0 +1,127 @@
+"""
+Inputs for the benchmarks, none of them needs a camera:
+
+- synthetic_landmarks(): a (T, 478, 3) face track built from the points the detectors read,
+  animated with blinks, winks, brow raises, smiles and head turns so every branch
+  (and every event) of the detectors gets exercised
+- synthetic_results(): the same landmarks wrapped like FaceMesh output, for FaceMeshEngine.get_landmarks()
+- recorded_landmarks(): a landmark recording from main.py (RECORD_PATH), see utils.landmark_recording
+- video_frames(): decoded frames of a short clip for the full-loop run
+- synthetic_frames(): drawn face-like frames for the full-loop run when there's no clip
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from detectors import features
+
+NUM_LANDMARKS = 478
+
+
+def _eye(center, width, openness):
+    """6 EAR points p1..p6 around `center`: corners at +-width/2, lids `openness` apart"""
+    cx, cy = center
+    half, lid = width / 2, openness / 2
+    return np.array([[cx - half, cy], [cx - half / 3, cy - lid], [cx + half / 3, cy - lid],
+                     [cx + half, cy], [cx + half / 3, cy + lid], [cx - half / 3, cy + lid]])
+
+
+def synthetic_landmarks(frames=420, fps=30.0, seed=0):
+    """
+    -> (landmarks (T, 478, 3) float32, timestamps (T,) float64)
+    one gesture held for 1.4s every 2s: blink, left wink, right wink, brow raise, smile, turn left, turn right
+    """
+    rng = np.random.default_rng(seed)
+    #filler points (cheeks, forehead...) scattered over the face oval, only the drawing looks at them
+    angle = rng.uniform(0, 2 * np.pi, NUM_LANDMARKS)
+    radius = np.sqrt(rng.uniform(0, 1, NUM_LANDMARKS))
+    base = np.stack([0.5 + 0.12 * radius * np.cos(angle), 0.45 + 0.16 * radius * np.sin(angle),
+                     rng.normal(0, 0.02, NUM_LANDMARKS)], axis=-1)
+
+    out = np.repeat(base[None].astype(np.float32), frames, axis=0)
+    timestamps = np.arange(frames) / fps
+    for t in range(frames):
+        slot, phase = divmod(timestamps[t], 2.0)
+        gesture = int(slot) % 7 if 0.2 < phase < 1.6 else -1
+        sway = 0.004 * np.sin(timestamps[t] * 2.1)           #small idle motion
+        lm = out[t]
+
+        left_open = 0.0 if gesture in (0, 1) else 0.012
+        right_open = 0.0 if gesture in (0, 2) else 0.012
+        lm[features.LEFT_EYE, :2] = _eye((0.44 + sway, 0.40), 0.04, left_open)
+        lm[features.RIGHT_EYE, :2] = _eye((0.56 + sway, 0.40), 0.04, right_open)
+
+        brow = 0.085 if gesture == 3 else 0.05
+        lm[features.LEFT_EYE_TOP, :2] = [0.44 + sway, 0.40]
+        lm[features.RIGHT_EYE_TOP, :2] = [0.56 + sway, 0.40]
+        lm[features.LEFT_BROW, :2] = [0.44 + sway, 0.40 - brow]
+        lm[features.RIGHT_BROW, :2] = [0.56 + sway, 0.40 - brow]
+
+        width, height, corners = (0.10, 0.024, 0.01) if gesture == 4 else (0.08, 0.03, -0.002)
+        lm[features.MOUTH_POINTS, :2] = [[0.5 - width / 2 + sway, 0.55 - corners], [0.5 + width / 2 + sway, 0.55 - corners],
+                                          [0.5 + sway, 0.55 - height / 2], [0.5 + sway, 0.55 + height / 2]]
+
+        nose_x = 0.5 + sway + {5: -0.1, 6: 0.1}.get(gesture, 0.0)
+        #nose, left ear, right ear, chin, forehead, left eye outer, right eye outer
+        lm[features.POSE_POINTS, :2] = [[nose_x, 0.47], [0.38 + sway, 0.45], [0.62 + sway, 0.45], [0.5 + sway, 0.62],
+                                        [0.5 + sway, 0.28], [0.42 + sway, 0.40], [0.58 + sway, 0.40]]
+    return out, timestamps
+
+
+def synthetic_results(landmarks):
+    """(N, 3) array -> object shaped like FaceMesh results (multi_face_landmarks[0] is a NormalizedLandmarkList)"""
+    from mediapipe.framework.formats import landmark_pb2
+    face = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in landmarks.tolist():
+        face.landmark.add(x=x, y=y, z=z)
+    return SimpleNamespace(multi_face_landmarks=[face])
+
+
+def recorded_landmarks(path):
+    """-> (landmarks (T, N, 3), timestamps (T,)) of the frames with a face in a recording"""
+    from utils.landmark_recording import load_recording
+    recording = load_recording(path)
+    keep = recording['has_face'].astype(bool)
+    return np.ascontiguousarray(recording['landmarks'][keep]), np.asarray(recording['timestamp'][keep])
+
+
+def video_frames(path, count=150):
+    """up to `count` decoded BGR frames of a video file (decoded up front, so decoding isn't timed)"""
+    import cv2
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"No frames read from {path}")
+    return frames
+
+
+def synthetic_frames(count=90, size=(480, 640), seed=0):
+    """
+    `count` BGR frames of a drawn, slowly moving face (skin oval, eyes, brows, mouth) on a noisy background.
+    FaceMesh tracks it like a real face, so the loop runs the detectors and the mesh overlay too.
+    """
+    import cv2
+    rng = np.random.default_rng(seed)
+    h, w = size
+    background = rng.integers(40, 90, (h, w, 3), dtype=np.uint8)
+    frames = []
+    for i in range(count):
+        image = background.copy()
+        cx, cy = int(w / 2 + 20 * np.sin(i / 15)), h // 2
+        fw, fh = w // 7, h // 4
+        cv2.ellipse(image, (cx, cy), (fw, fh), 0, 0, 360, (150, 180, 220), -1)
+        for side in (-1, 1):
+            ex, ey = cx + side * fw // 2, cy - fh // 5
+            cv2.ellipse(image, (ex, ey), (fw // 5, fh // 12 if i % 40 > 3 else 1), 0, 0, 360, (255, 255, 255), -1)
+            cv2.circle(image, (ex, ey), fh // 14, (40, 30, 20), -1)
+            cv2.line(image, (ex - fw // 4, ey - fh // 5), (ex + fw // 4, ey - fh // 5), (40, 50, 70), 4)
+        cv2.ellipse(image, (cx, cy + fh // 2), (fw // 3, fh // 12), 0, 0, 180, (60, 60, 170), -1)
+        cv2.line(image, (cx, cy - fh // 10), (cx - fw // 10, cy + fh // 4), (110, 140, 190), 3)
+        frames.append(image)
+    return frames
@@ -0,0 +1,229 @@
+"""
+Microbenchmarks of the per-frame hot paths + full-loop throughput, compared against a JSON baseline.
+
+    python -m benchmarks.run                         # time, compare with benchmarks/baseline.json
+    python -m benchmarks.run --save                  # time, write the baseline
+    python -m benchmarks.run --recording s.olm       # detectors on recorded landmarks instead of synthetic ones
+    python -m benchmarks.run --video clip.mp4        # full loop (FaceMesh, detectors, overlay) on a real clip
+
+Every case is timed `--rounds` times over the whole input, the fastest pass (ns per call) is kept:
+noise only ever makes a pass slower. Stateful cases (detectors) get fresh instances every pass, so
+each pass sees the same monotonic timestamps and runs the same branches.
+A case fails when it got slower than its baseline by more than the tolerance and by more than
+ABS_FLOOR_NS -> exit code 1. Baselines are per machine: save one on the machine (and power plan) you compare on.
+No camera or GPU needed; without a video (benchmarks/data/clip.mp4 is used when present) the full loop
+runs on synthetic frames (generators.synthetic_frames).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from benchmarks import generators
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+DEFAULT_VIDEO = os.path.join(HERE, 'data', 'clip.mp4')
+
+# allowed slowdown vs baseline (fraction); the full loop includes the model, so it's noisier
+TOLERANCE = 0.25
+CASE_TOLERANCE = {'loop.frame': 0.35}
+# slowdowns smaller than this (ns per call) never count, sub-microsecond cases jitter by more than 25%
+ABS_FLOOR_NS = 1000
+
+
+def measure(make, inputs, rounds):
+    """
+    fastest of `rounds` passes of fn(item) for every item -> ns per call.
+    make() -> fn, called before every pass (not timed) so stateful cases start each pass fresh
+    """
+    per_call = []
+    gc.disable()                          #like timeit: no collector pauses inside a pass
+    try:
+        for _ in range(rounds):
+            fn = make()
+            start = time.perf_counter_ns()
+            for item in inputs:
+                fn(item)
+            per_call.append((time.perf_counter_ns() - start) / len(inputs))
+    finally:
+        gc.enable()
+    return float(min(per_call))
+
+
+def _per_frame(method):
+    """method(landmarks, timestamp) -> fn((landmarks, timestamp))"""
+    return lambda frame: method(*frame)
+
+
+# ── cases ────────────────────────────────────────────────────────
+def detector_cases(landmarks, timestamps):
+    """name -> (make, inputs) for the detectors and the overlay on one landmark track, make() -> fn with fresh state"""
+    from detectors import features
+    from detectors.eye_detector import EyeDetector
+    from detectors.head_detector import HeadDetector
+    from detectors.mouth_detector import MouthDetector
+    from detectors.gaze_detector import GazeDetector
+    from detectors.feature_graph import FrameFeatures
+    from ui.overlay_renderer import OverlayRenderer
+
+    frames = list(zip(landmarks, timestamps.tolist()))
+    yaws = [(float(features.head_pose(lm)[0]), ts) for lm, ts in frames]
+
+    renderer = OverlayRenderer('full')
+    canvas = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    def detect_all():
+        #all four detectors on one shared feature graph, like main.detect()
+        detectors = (HeadDetector(), EyeDetector(debug=False), MouthDetector(), GazeDetector())
+
+        def run(frame):
+            shared = FrameFeatures(frame[0])
+            for detector in detectors:
+                detector.process(shared, frame[1])
+        return run
+
+    return {
+        'features.extract_features': (lambda: features.extract_features, landmarks),
+        'eye.process': (lambda: _per_frame(EyeDetector(debug=False).process), frames),
+        'head.update': (lambda: HeadDetector().update, landmarks),
+        'head.detect_single_turn': (lambda: _per_frame(HeadDetector().detect_single_turn), yaws),
+        'mouth.process': (lambda: _per_frame(MouthDetector().process), frames),
+        'gaze.process': (lambda: _per_frame(GazeDetector().process), frames),
+        'detect.all': (detect_all, frames),
+        'overlay.draw_mesh': (lambda: lambda lm: renderer.draw_mesh(canvas, lm), landmarks),
+    }
+
+
+def engine_cases(landmarks):
+    """FaceMeshEngine.get_landmarks on FaceMesh-shaped results (needs mediapipe, not a camera)"""
+    from core.face_mesh_engine import FaceMeshEngine
+    results = [generators.synthetic_results(lm) for lm in landmarks[:60]]
+    cases = {}
+    for mirror in (False, True):
+        engine = FaceMeshEngine(mirror=mirror)
+        cases[f"engine.get_landmarks{'[mirror]' if mirror else ''}"] = (lambda engine=engine: engine.get_landmarks, results)
+    return cases
+
+
+def loop_case(images, name='loop.frame'):
+    """one full frame: FaceMesh -> landmarks -> detectors -> overlay, on decoded (or synthetic) frames"""
+    from core.face_mesh_engine import FaceMeshEngine
+    from detectors.eye_detector import EyeDetector
+    from detectors.head_detector import HeadDetector
+    from detectors.mouth_detector import MouthDetector
+    from ui.overlay_renderer import OverlayRenderer
+
+    engine = FaceMeshEngine(mirror=True)                  #one graph for every pass, building it takes seconds
+    renderer = OverlayRenderer('full', display_fps=0)
+    clock = {'t': 0.0}                                    #video time keeps running across passes -> monotonic
+
+    def make():
+        eye, head, mouth = EyeDetector(debug=False), HeadDetector(), MouthDetector()
+
+        def frame(image):
+            clock['t'] += 1 / 30                          #detector holds don't depend on the replay speed
+            landmarks = engine.get_landmarks(engine.process(image))
+            if landmarks is not None:
+                eye.process(landmarks, clock['t'])
+                head.process(landmarks, clock['t'])
+                mouth.process(landmarks, clock['t'])
+            renderer.render(image, landmarks, mirror=True)
+        return frame
+
+    return {name: (make, images)}
+
+
+# ── baseline ─────────────────────────────────────────────────────
+def machine():
+    return {'node': platform.node(), 'machine': platform.machine(), 'processor': platform.processor(),
+            'python': platform.python_version(), 'cpus': os.cpu_count()}
+
+
+def compare(results, baseline, tolerance):
+    """prints the table, returns the names of the cases that regressed"""
+    old = baseline.get('results', {}) if baseline else {}
+    regressed = []
+    print(f"\n{'case':<34}{'ns/call':>12}{'baseline':>12}{'change':>9}")
+    for name, ns in results.items():
+        base = old.get(name)
+        if base is None:
+            print(f"{name:<34}{ns:>12,.0f}{'-':>12}{'new':>9}")
+            continue
+        change = ns / base - 1
+        limit = tolerance if tolerance is not None else CASE_TOLERANCE.get(name.split('[')[0], TOLERANCE)
+        flag = ''
+        if change > limit and ns - base > ABS_FLOOR_NS:
+            regressed.append(name)
+            flag = f'  REGRESSION (> +{limit:.0%})'
+        print(f"{name:<34}{ns:>12,.0f}{base:>12,.0f}{change:>+9.1%}{flag}")
+    if baseline and baseline.get('machine', {}).get('node') != platform.node():
+        print(f"\nnote: baseline was saved on {baseline.get('machine', {}).get('node')}, not on this machine")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks with a JSON baseline guard")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help=f"allowed slowdown as a fraction (default {TOLERANCE}, full loop {CASE_TOLERANCE['loop.frame']})")
+    parser.add_argument('--rounds', type=int, default=15)
+    parser.add_argument('--frames', type=int, default=420, help="synthetic landmark frames")
+    parser.add_argument('--recording', help="landmark recording (.olm) instead of synthetic landmarks")
+    parser.add_argument('--video', default=DEFAULT_VIDEO if os.path.exists(DEFAULT_VIDEO) else None,
+                        help="short clip for the full-loop case (synthetic frames without one)")
+    parser.add_argument('--video-frames', type=int, default=90)
+    parser.add_argument('--no-engine', action='store_true', help="skip the cases that build the MediaPipe graph")
+    args = parser.parse_args()
+
+    if args.recording:
+        landmarks, timestamps = generators.recorded_landmarks(args.recording)
+        source = args.recording
+    else:
+        landmarks, timestamps = generators.synthetic_landmarks(args.frames)
+        source = f'synthetic x{args.frames}'
+    print(f"landmarks: {source} ({len(landmarks)} frames), {args.rounds} rounds per case")
+
+    cases = detector_cases(landmarks, timestamps)
+    if not args.no_engine:
+        cases.update(engine_cases(landmarks))
+        if args.video:
+            cases.update(loop_case(generators.video_frames(args.video, args.video_frames)))
+        else:
+            #separate case name: a baseline saved on a real clip isn't comparable
+            cases.update(loop_case(generators.synthetic_frames(args.video_frames), 'loop.frame[synthetic]'))
+
+    results = {}
+    for name, (make, inputs) in cases.items():
+        make()(inputs[0])                                 #first-call setup (imports, graph warm-up) on a throwaway instance
+        results[name] = measure(make, inputs, args.rounds)
+        print(f"  {name}: {results[name]:,.0f} ns")
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressed = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine': machine(), 'source': source, 'rounds': args.rounds,
+                       'saved': time.strftime('%Y-%m-%d %H:%M:%S'), 'results': results}, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"\nNo baseline at {args.baseline} yet, run with --save to create one")
+    elif regressed:
+        print(f"\n{len(regressed)} hot path(s) regressed: {', '.join(regressed)}")
+        sys.exit(1)
+    else:
+        print("\nNo regressions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""
+One capture + inference process per camera, so several cameras use several cores instead of
+sharing one GIL.
+
+- each worker owns two SharedRing buffers: mirrored frames (H, W, 3) uint8 and landmarks (N, 3) float32;
+  the supervisor reads them straight from shared memory, nothing image-sized is ever pickled
+- each worker runs its own detectors and sends only the small GestureEvents back on one shared queue
+- the supervisor (aggregator) merges those event streams in the main process, where the
+  keyboard actions run, so one OS input backend serves every camera
+"""
+import multiprocessing as mp
+import queue
+import time
+
+import numpy as np
+
+from core.shared_ring import SharedRing
+
+# worker -> supervisor status messages: ('ready', camera, frame spec, landmark spec) | ('error', camera, text)
+#                                       | ('stopped', camera, frames processed)
+
+
+def _camera_worker(camera, source, options, status, events, stop):
+    """process entry point: capture -> mirror into the frame ring -> FaceMesh -> landmark ring -> detectors"""
+    import cv2
+    from core.webcam import WebCam
+    from core.face_mesh_engine import FaceMeshEngine
+    from detectors.eye_detector import EyeDetector
+    from detectors.gaze_detector import GazeDetector
+    from detectors.head_detector import HeadDetector
+    from detectors.mouth_detector import MouthDetector
+
+    try:
+        cam = WebCam(source, threaded=True)
+    except RuntimeError as e:
+        status.put(('error', camera, str(e)))
+        return
+    packet = cam.read()
+    if packet is None:
+        cam.release()
+        status.put(('error', camera, f"No frames from source '{source}'"))
+        return
+
+    engine = FaceMeshEngine(roi=options.get('roi', False), roi_size=options.get('roi_size', 256),
+                            roi_padding=options.get('roi_padding', 0.3))
+    slots = options.get('slots', 3)
+    frames = SharedRing(packet.image.shape, np.uint8, slots)
+    landmark_ring = SharedRing((engine.num_landmarks, 3), np.float32, slots)
+    status.put(('ready', camera, frames.spec, landmark_ring.spec))
+
+    needed = options.get('needed', ('head', 'eye', 'mouth'))
+    head_detector = HeadDetector() if 'head' in needed else None
+    eye_detector = EyeDetector(debug=False) if 'eye' in needed else None
+    mouth_detector = MouthDetector() if 'mouth' in needed else None
+    gaze_detector = GazeDetector() if 'gaze' in needed else None
+
+    #hand bindings -> this worker's own hand model, on the frames' shared RGB conversion like main's loop
+    hand_scheduler = hand_detector = None
+    if 'hand' in needed:
+        from core.hand_engine import HandEngine
+        from core.hand_scheduler import HandScheduler
+        from detectors.hand_detector import HandDetector
+        hand_options = options.get('hands', {})
+        hand_scheduler = HandScheduler(HandEngine(max_hands=hand_options.get('max_hands', 2)),
+                                       mode=hand_options.get('mode', 'interleave'),
+                                       cpu_budget=hand_options.get('cpu_budget', 0.5))
+        hand_detector = HandDetector()
+
+    seq = 0
+    h, w = frames.shape[:2]
+    try:
+        while not stop.is_set():
+            if packet is None:
+                packet = cam.read()
+                if packet is None:
+                    break
+            image = frames.begin(seq)
+            if packet.image.shape != frames.shape:       #source changed resolution -> fit the ring
+                packet = packet._replace(image=cv2.resize(packet.image, (w, h)))
+            cv2.flip(packet.image, 1, dst=image)         #mirror straight into shared memory
+
+            rgb = hand_scheduler.prepare(image) if hand_scheduler is not None else None
+            face_start = time.perf_counter()
+            landmarks = engine.get_landmarks(engine.process(image, rgb=rgb))
+            out = landmark_ring.begin(seq)
+            timestamp = packet.timestamp
+            found = []
+            if landmarks is not None:
+                out[:] = landmarks
+
+                if head_detector is not None:
+                    found += head_detector.process(landmarks, timestamp)['events']
+                if eye_detector is not None:
+                    found += eye_detector.process(landmarks, timestamp)['events']
+                if mouth_detector is not None:
+                    found += mouth_detector.process(landmarks, timestamp)['events']
+                if gaze_detector is not None:
+                    found += gaze_detector.process(landmarks, timestamp)['events']
+            if hand_scheduler is not None:
+                hands = hand_scheduler.step(rgb, timestamp, time.perf_counter() - face_start)
+                if hands is not None:
+                    found += hand_detector.process(hands.landmarks, hands.handedness, hands.timestamp)['events']
+            for event in found:
+                events.put((camera, event))
+
+            #landmarks first: once the frame is visible its landmarks must be too
+            landmark_ring.publish(seq, packet.timestamp, flag=landmarks is not None)
+            frames.publish(seq, packet.timestamp)
+            seq += 1
+            packet = None
+    finally:
+        if hand_scheduler is not None:
+            hand_scheduler.stop()
+        cam.release()
+        frames.close()
+        landmark_ring.close()
+        status.put(('stopped', camera, seq))
+
+
+class CameraSupervisor:
+    """
+    Starts one worker process per source and aggregates them.
+
+    sources -> camera indices / video paths / image folders
+    options -> worker settings: roi, roi_size, roi_padding, needed (detectors), slots (ring depth),
+               hands ({'max_hands', 'mode', 'cpu_budget'}, used when 'hand' is needed)
+    """
+    def __init__(self, sources, options=None):
+        self.sources = list(sources)
+        self.options = dict(options or {})
+        self._ctx = mp.get_context('spawn')      #no fork of a process that already holds threads / graphs
+        self.status = self._ctx.Queue()
+        self.events = self._ctx.Queue()
+        self.stop_event = self._ctx.Event()
+        self.processes = []
+        self.frames = {}                  #camera -> attached frame SharedRing
+        self.landmarks = {}               #camera -> attached landmark SharedRing
+        self._frame_out = {}              #camera -> local copy buffers handed out by read()
+        self._landmark_out = {}
+        self.last_seq = {}
+        self.processed = {}               #camera -> frames the worker handled (after stop)
+
+    def start(self, timeout=30.0):
+        """spawns the workers and waits until each one opened its source; returns the cameras that are live"""
+        for camera, source in enumerate(self.sources):
+            process = self._ctx.Process(target=_camera_worker, name=f'camera-{camera}', daemon=True,
+                                        args=(camera, source, self.options, self.status, self.events,
+                                              self.stop_event))
+            process.start()
+            self.processes.append(process)
+
+        deadline = time.perf_counter() + timeout
+        pending = set(range(len(self.sources)))
+        while pending:
+            try:
+                message = self.status.get(timeout=max(deadline - time.perf_counter(), 0.01))
+            except queue.Empty:
+                print(f"Cameras {sorted(pending)} did not start in {timeout:.0f}s")
+                break
+            kind, camera = message[0], message[1]
+            pending.discard(camera)
+            if kind == 'ready':
+                self._attach(camera, message[2], message[3])
+            elif kind == 'error':
+                print(f"Camera {camera} ({self.sources[camera]}): {message[2]}")
+        return sorted(self.frames)
+
+    def _attach(self, camera, frame_spec, landmark_spec):
+        self.frames[camera] = frames = SharedRing.attach(frame_spec)
+        self.landmarks[camera] = landmarks = SharedRing.attach(landmark_spec)
+        self._frame_out[camera] = np.empty(frames.shape, frames.dtype)
+        self._landmark_out[camera] = np.empty(landmarks.shape, landmarks.dtype)
+        self.last_seq[camera] = -1
+
+    def poll(self):
+        """drains the merged event stream -> list of (camera, GestureEvent), oldest first"""
+        found = []
+        while True:
+            try:
+                found.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        found.sort(key=lambda item: item[1].timestamp)
+        return found
+
+    def read(self, camera):
+        """
+        newest unseen frame of a camera -> (seq, timestamp, image, landmarks or None), or None if nothing new.
+        image / landmarks are local buffers reused on the next read of that camera
+        """
+        frames, ring = self.frames[camera], self.landmarks[camera]
+        seq = frames.latest
+        if seq <= self.last_seq[camera]:
+            return None
+        got = frames.read(seq, self._frame_out[camera])
+        if got is None:
+            return None
+        meta = ring.read(seq, self._landmark_out[camera])
+        if meta is None:
+            return None                   #landmark slot not readable (yet) -> retry, don't report the frame as faceless
+        self.last_seq[camera] = seq
+        landmarks = self._landmark_out[camera] if meta[1] else None
+        return seq, got[0], self._frame_out[camera], landmarks
+
+    def _drain_status(self):
+        while True:
+            try:
+                message = self.status.get_nowait()
+            except queue.Empty:
+                return
+            if message[0] == 'stopped':
+                self.processed[message[1]] = message[2]
+
+    @property
+    def alive(self):
+        """cameras whose worker process is still running"""
+        return [camera for camera in self.frames if self.processes[camera].is_alive()]
+
+    def stop(self, timeout=5.0):
+        """stops the workers; events still queued are discarded"""
+        self.stop_event.set()
+        #keep draining: a worker can't exit while its queue feeder still holds unread items
+        deadline = time.perf_counter() + timeout
+        while any(p.is_alive() for p in self.processes) and time.perf_counter() < deadline:
+            self.poll()
+            self._drain_status()
+            time.sleep(0.01)
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout)
+        self.poll()
+        self._drain_status()
+        for ring in list(self.frames.values()) + list(self.landmarks.values()):
+            ring.close()
+        self.frames.clear()
+        self.landmarks.clear()
@@ -1,16 +1,37 @@
 import cv2
 import mediapipe as mp
+import numpy as np
+
+from utils.metrics import Metrics
+from core.mesh_symmetry import mirror_landmarks
+from core.landmark_wire import wire_records, fill_landmarks
 
 class FaceMeshEngine:
     """
-    MediaPipe Face Mesh - 468 landmarks with iris refinement. 
-    used for detailed face analysis (head pose, mouth, eye)
+    MediaPipe Face Mesh - 468 face landmarks, + 10 iris landmarks (468-477) with refine_landmarks.
+    used for detailed face analysis (head pose, mouth, eye, gaze)
     """
     def __init__(self, 
                  max_faces=1,
                  refine_landmarks=True,
                  min_detection_conf=0.7,
-                 min_tracking_conf=0.7):
+                 min_tracking_conf=0.7,
+                 roi=False,
+                 roi_size=256,
+                 roi_padding=0.3,
+                 mirror=False,
+                 metrics=None):
+        """
+        roi         -> run inference only on a square crop around the face found on the previous frame
+                       (single face only), falls back to the full frame when the face is lost
+        roi_size    -> crop is downscaled to (roi_size x roi_size) px before inference
+        roi_padding -> extra margin around the face box, as a fraction of the face size
+        mirror      -> frames are NOT flipped for the selfie view, landmarks are mirrored instead
+                       (x -> 1 - x and left/right points swapped, see core.mesh_symmetry), so nobody
+                       has to allocate a flipped copy of every frame
+        metrics     -> optional utils.metrics.Metrics, times the 'color' and 'inference' stages
+        """
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
         self.mp_face_mesh = mp.solutions.face_mesh
         self.face_mesh = self.mp_face_mesh.FaceMesh(
             static_image_mode=False,
@@ -23,10 +44,119 @@ class FaceMeshEngine:
         self.mp_draw = mp.solutions.drawing_utils
         self.drawing_spec = self.mp_draw.DrawingSpec(thickness=1, circle_radius=1)
 
-    def process(self, frame):
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results=self.face_mesh.process(rgb)
+        #preallocated (N, 3) landmark buffer reused every frame (478 pts. with iris refinement)
+        self.num_landmarks = 478 if refine_landmarks else 468
+        self._landmarks = np.zeros((self.num_landmarks, 3), dtype=np.float32)
+        self.max_faces = max_faces
+        self._faces = np.zeros((max_faces, self.num_landmarks, 3), dtype=np.float32)   #multi-face buffer
+        self.mirror = mirror
+        if mirror:
+            #unmirrored model output is parsed here first, then mirrored into the buffers above
+            self._raw = np.zeros_like(self._landmarks)
+            self._raw_faces = np.zeros_like(self._faces)
+        self._buffers = {}                #name -> reused uint8 image buffer (RGB input, ROI crop)
+
+        # ── Face ROI tracking ──
+        self.roi = roi and max_faces == 1
+        self.roi_size = roi_size
+        self.roi_padding = roi_padding
+        self.roi_box = None               #(x0, y0, side) square crop in px used for the next frame, None = full frame
+        self.roi_hits = 0                 #frames inferred on the crop
+        self.roi_misses = 0               #crop lost the face -> re-ran on the full frame
+        if self.roi:
+            #separate graph for crops: MediaPipe tracks in normalized image coords, so mixing
+            #full frames and crops in one graph would hand it a wrong previous-face region
+            self.roi_face_mesh = self.mp_face_mesh.FaceMesh(
+                static_image_mode=False,
+                max_num_faces=1,
+                refine_landmarks=refine_landmarks,
+                min_detection_confidence=min_detection_conf,
+                min_tracking_confidence=min_tracking_conf
+            )
+
+    def _buffer(self, name, shape):
+        """preallocated image buffer, reallocated only when the frame size changes"""
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = self._buffers[name] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def _infer(self, face_mesh, bgr, buffer='rgb', rgb=None):
+        #MediaPipe copies the input into its own packet, so the RGB buffer can be reused next frame
+        if rgb is None:
+            with self.metrics.timer('color'):
+                rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=self._buffer(buffer, bgr.shape))
+        with self.metrics.timer('inference'):
+            return face_mesh.process(rgb)
+
+    def process(self, frame, rgb=None):
+        """frame: BGR image. rgb: the same frame already converted (shared with another model) -> no conversion here"""
+        if not self.roi:
+            return self._infer(self.face_mesh, frame, rgb=rgb)
+
+        if self.roi_box is not None:
+            results = self._process_roi(frame, self.roi_box, rgb)
+            if results.multi_face_landmarks:
+                self.roi_hits += 1
+                self._track(results, frame.shape)
+                return results
+            self.roi_misses += 1
+            self.roi_box = None           #tracking lost -> full frame detection below
+
+        results = self._infer(self.face_mesh, frame, rgb=rgb)
+        if results.multi_face_landmarks:
+            self._track(results, frame.shape)
         return results
+
+    def _process_roi(self, frame, box, rgb=None):
+        """infers on the (downscaled) crop and maps the landmarks back to full-frame normalized coords"""
+        x0, y0, side = box
+        crop = (frame if rgb is None else rgb)[y0:y0 + side, x0:x0 + side]
+        if side > self.roi_size:
+            with self.metrics.timer('roi_resize'):
+                crop = cv2.resize(crop, (self.roi_size, self.roi_size), interpolation=cv2.INTER_AREA,
+                                  dst=self._buffer('roi', (self.roi_size, self.roi_size, 3)))
+        if rgb is None:
+            results = self._infer(self.roi_face_mesh, crop, 'roi_rgb')
+        else:
+            if not crop.flags['C_CONTIGUOUS']:        #unresized slice of the shared frame, the graph wants packed rows
+                packed = self._buffer('roi_rgb', crop.shape)
+                np.copyto(packed, crop)
+                crop = packed
+            results = self._infer(self.roi_face_mesh, None, rgb=crop)
+
+        if results.multi_face_landmarks:
+            h, w = frame.shape[:2]
+            #crop is square -> one scale for x/y/z (z is in units of image width like x)
+            scale = np.float32(side / w), np.float32(side / h), np.float32(side / w)
+            offset = np.float32(x0 / w), np.float32(y0 / h), np.float32(0.0)
+            self._map_landmarks(results.multi_face_landmarks[0], scale, offset)
+        return results
+
+    def _track(self, results, shape):
+        """keeps the ROI box while the face stays well inside it, re-centres it otherwise"""
+        h, w = shape[:2]
+        points = self._fill_landmarks(results.multi_face_landmarks[0], self._landmarks)
+        x_min, y_min = points[:, 0].min() * w, points[:, 1].min() * h
+        x_max, y_max = points[:, 0].max() * w, points[:, 1].max() * h
+        face_size = max(x_max - x_min, y_max - y_min)
+
+        if self.roi_box is not None:
+            x0, y0, side = self.roi_box
+            margin = side * self.roi_padding / (1 + 2 * self.roi_padding) / 2
+            inside = (x_min > x0 + margin and y_min > y0 + margin and
+                      x_max < x0 + side - margin and y_max < y0 + side - margin)
+            if inside and 0.7 < face_size * (1 + 2 * self.roi_padding) / side < 1.3:
+                return                    #stable crop -> MediaPipe's own tracking stays valid
+
+        side = int(min(face_size * (1 + 2 * self.roi_padding), w, h))
+        if side < 32:
+            self.roi_box = None
+            return
+        cx, cy = (x_min + x_max) / 2, (y_min + y_max) / 2
+        x0 = int(min(max(cx - side / 2, 0), w - side))
+        y0 = int(min(max(cy - side / 2, 0), h - side))
+        self.roi_box = (x0, y0, side)
     
     def draw_mesh(self, frame, results):
         """draw the full face mesh (tesselation + contours)"""
@@ -50,6 +180,55 @@ class FaceMeshEngine:
         return frame 
     
     def get_landmarks(self, results):
-        """returns a list of (x,y,z) for all 468 pts. normalized (0-1)"""
-        if results.multi_face_landmarks:
-            return [[lm.x, lm.y, lm.z] for lm in results.multi_face_landmarks[0].landmark]
\ No newline at end of file
+        """
+        returns a (N, 3) float32 array of (x,y,z) for all pts. normalized (0-1), or None.
+        N = num_landmarks: 478 with refine_landmarks (468 mesh + 2 x 5 iris: centre 468 / 473, then its 4 edge pts.), else 468
+        NOTE: the array is a buffer reused on the next call -> .copy() it if you keep it across frames
+        """
+        if not results.multi_face_landmarks:
+            return None
+        if self.mirror:
+            raw = self._fill_face(results.multi_face_landmarks[0], self._raw)
+            return mirror_landmarks(raw, self._landmarks)
+        return self._fill_landmarks(results.multi_face_landmarks[0], self._landmarks)
+
+    def get_all_landmarks(self, results):
+        """
+        returns a (F, N, 3) float32 array with every detected face, or None.
+        NOTE: a view of a buffer reused on the next call, like get_landmarks()
+        """
+        faces = results.multi_face_landmarks
+        if not faces:
+            return None
+        for i, face_landmarks in enumerate(faces[:self.max_faces]):
+            if self.mirror:
+                mirror_landmarks(self._fill_face(face_landmarks, self._raw_faces[i]), self._faces[i])
+            else:
+                self._fill_face(face_landmarks, self._faces[i])
+        return self._faces[:min(len(faces), self.max_faces)]
+
+    def _map_landmarks(self, face_landmarks, scale, offset):
+        """in-place affine remap of a NormalizedLandmarkList: v -> v * scale + offset per axis"""
+        rec = wire_records(face_landmarks)
+        if rec is not None:
+            rec = rec.copy()
+            for axis, name in enumerate(('x', 'y', 'z')):
+                rec[name] = rec[name] * scale[axis] + offset[axis]
+            face_landmarks.ParseFromString(rec.tobytes())
+            return
+
+        for lm in face_landmarks.landmark:
+            lm.x = lm.x * scale[0] + offset[0]
+            lm.y = lm.y * scale[1] + offset[1]
+            lm.z = lm.z * scale[2] + offset[2]
+
+    def _fill_landmarks(self, face_landmarks, out):
+        """copies a NormalizedLandmarkList into `out` without building per-point python objects"""
+        count = len(face_landmarks.landmark)
+        if out.shape[0] != count:
+            out = self._landmarks = np.zeros((count, 3), dtype=np.float32)
+        return self._fill_face(face_landmarks, out)
+
+    def _fill_face(self, face_landmarks, out):
+        """_fill_landmarks() into an `out` of the right length"""
+        return fill_landmarks(face_landmarks, out)
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class FaceTracker:
+    """
+    Stable face IDs across frames by cheap box-centroid association.
+
+    - each face's box comes from its landmarks' min/max (one vectorized pass over all faces)
+    - detections are matched greedily to the closest known face, distance measured in units
+      of that face's box size so it works the same for near and far faces
+    - an unmatched detection gets a new ID, a face unseen for longer than `max_age` seconds is forgotten
+    """
+    def __init__(self, max_distance=0.5, max_age=0.5):
+        """
+        max_distance -> largest centroid jump (fraction of face size) still counted as the same face
+        max_age      -> seconds a face may be missing (occlusion, missed detection) before its ID is dropped
+        """
+        self.max_distance = max_distance
+        self.max_age = max_age
+        self.next_id = 0
+
+        # ── Known faces, one row each ──
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.centroids = np.zeros((0, 2), dtype=np.float32)
+        self.sizes = np.zeros(0, dtype=np.float32)
+        self.last_seen = np.zeros(0, dtype=np.float64)
+
+        self.lost = []                    #IDs dropped by the latest update()
+
+    @staticmethod
+    def boxes(faces):
+        """(F, N, 3) landmarks -> (centroids (F, 2), sizes (F,)) in normalized image coords"""
+        points = faces[..., :2]
+        low, high = points.min(axis=1), points.max(axis=1)
+        return (low + high) / 2, (high - low).max(axis=1)
+
+    def update(self, faces, timestamp):
+        """
+        faces: (F, N, 3) landmarks of this frame (or None / empty when no face)
+        returns an (F,) int array -> the ID of each row of `faces`
+        """
+        count = 0 if faces is None else len(faces)
+        assigned = np.full(count, -1, dtype=np.int64)
+
+        if count:
+            centroids, sizes = self.boxes(faces)
+            if len(self.ids):
+                #(tracks, detections) distance in units of the track's face size
+                cost = np.sqrt(((self.centroids[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=-1))
+                cost /= np.maximum(self.sizes, 1e-6)[:, None]
+
+                #greedy: closest pairs first, each track and detection used once
+                used_tracks = np.zeros(len(self.ids), dtype=bool)
+                for flat in np.argsort(cost, axis=None):
+                    track, det = divmod(int(flat), count)
+                    if cost[track, det] > self.max_distance:
+                        break
+                    if used_tracks[track] or assigned[det] >= 0:
+                        continue
+                    used_tracks[track] = True
+                    assigned[det] = self.ids[track]
+                    self.centroids[track] = centroids[det]
+                    self.sizes[track] = sizes[det]
+                    self.last_seen[track] = timestamp
+
+            # ── new faces ──
+            new = np.flatnonzero(assigned < 0)
+            if len(new):
+                assigned[new] = np.arange(self.next_id, self.next_id + len(new))
+                self.next_id += len(new)
+                self.ids = np.concatenate([self.ids, assigned[new]])
+                self.centroids = np.concatenate([self.centroids, centroids[new]])
+                self.sizes = np.concatenate([self.sizes, sizes[new]])
+                self.last_seen = np.concatenate([self.last_seen, np.full(len(new), timestamp)])
+
+        # ── forget faces gone for too long ──
+        keep = timestamp - self.last_seen <= self.max_age
+        self.lost = self.ids[~keep].tolist()
+        if self.lost:
+            self.ids, self.centroids = self.ids[keep], self.centroids[keep]
+            self.sizes, self.last_seen = self.sizes[keep], self.last_seen[keep]
+        return assigned
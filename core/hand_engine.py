@@ -0,0 +1,71 @@
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from utils.metrics import Metrics
+from core.landmark_wire import fill_landmarks
+
+NUM_HAND_LANDMARKS = 21
+
+
+class HandEngine:
+    """
+    MediaPipe Hands - 21 landmarks per hand (wrist, 4 pts. per finger), plus handedness.
+    used for hand commands (fist, pinch, finger count)
+    """
+    def __init__(self,
+                 max_hands=2,
+                 model_complexity=0,
+                 min_detection_conf=0.6,
+                 min_tracking_conf=0.6,
+                 mirror=False,
+                 metrics=None):
+        """
+        model_complexity -> 0 (lite, fast) or 1 (full)
+        mirror           -> frames are the raw (unflipped) camera image, landmarks are mirrored to the
+                            selfie view like FaceMeshEngine(mirror=True) and handedness follows the user
+        metrics          -> optional utils.metrics.Metrics, times 'hand_color' / 'hand_inference'
+        """
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
+        self.hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=max_hands,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_conf,
+            min_tracking_confidence=min_tracking_conf
+        )
+        self.max_hands = max_hands
+        self.mirror = mirror
+        self._landmarks = np.zeros((max_hands, NUM_HAND_LANDMARKS, 3), dtype=np.float32)
+        self._rgb = None
+
+    def process(self, frame, rgb=None):
+        """frame: BGR image. rgb: the same frame already converted (shared with FaceMeshEngine)"""
+        if rgb is None:
+            with self.metrics.timer('hand_color'):
+                if self._rgb is None or self._rgb.shape != frame.shape:
+                    self._rgb = np.empty_like(frame)
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        with self.metrics.timer('hand_inference'):
+            return self.hands.process(rgb)
+
+    def get_landmarks(self, results):
+        """
+        returns (landmarks, handedness) or None when no hand is visible
+        landmarks  -> (H, 21, 3) float32 normalized array (a view of a buffer reused on the next call)
+        handedness -> list of 'Left' / 'Right', one per row, as seen by the user
+        """
+        hands = results.multi_hand_landmarks
+        if not hands:
+            return None
+        count = min(len(hands), self.max_hands)
+        handedness = []
+        for i in range(count):
+            out = fill_landmarks(hands[i], self._landmarks[i])
+            label = results.multi_handedness[i].classification[0].label
+            #MediaPipe labels hands assuming a mirrored (selfie) input image
+            if self.mirror:
+                np.subtract(1.0, out[:, 0], out=out[:, 0])
+                label = 'Left' if label == 'Right' else 'Right'
+            handedness.append(label)
+        return self._landmarks[:count], handedness
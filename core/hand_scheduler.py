@@ -0,0 +1,138 @@
+import math
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# one hand-model run: landmarks (H, 21, 3) float32 (own copy, H may be 0), handedness list, frame timestamp
+HandResult = namedtuple('HandResult', ['landmarks', 'handedness', 'timestamp'])
+
+
+class HandScheduler:
+    """
+    Runs HandEngine next to FaceMesh without slowing face gestures down.
+
+    - prepare() converts each frame BGR -> RGB once; the same buffer feeds FaceMesh and the hand model
+    - mode 'interleave': hands run on the calling thread, only every K-th frame
+      mode 'parallel'  : hands run on their own thread on the newest frame whenever it is idle,
+                         face inference never waits for them
+    - K follows the CPU budget: measured hand time per run <= cpu_budget x measured face time per frame
+    """
+    def __init__(self, engine, mode='interleave', cpu_budget=0.5, smoothing=0.2, metrics=None):
+        """
+        cpu_budget -> hand model time allowed, as a fraction of face model time (0.5 = hands may add 50%)
+        smoothing  -> weight of the newest timing sample in the running averages
+        """
+        if mode not in ('interleave', 'parallel'):
+            raise ValueError(f"Unknown hand scheduling mode '{mode}', use 'interleave' or 'parallel'")
+        self.engine = engine
+        self.mode = mode
+        self.cpu_budget = cpu_budget
+        self.smoothing = smoothing
+        self.metrics = metrics
+
+        self.interval = 1                 #current K
+        self.frames_since_run = 0
+        self.hand_time = 0.0              #running averages (seconds)
+        self.face_time = 0.0
+        self.runs = 0
+        self.frames = 0
+
+        #two RGB buffers: the parallel worker may still read one while the next frame fills the other
+        self._rgb = [None, None]
+        self._next = 0
+        self._latest = None               #newest HandResult not yet handed out
+        self._cond = threading.Condition()
+        self._job = None                  #(buffer index, timestamp) waiting for the worker
+        self._busy = None                 #buffer index the worker is reading (at most one of _job / _busy is set)
+        self._running = True
+        self._thread = None
+        if mode == 'parallel':
+            self._thread = threading.Thread(target=self._worker, name='HandScheduler', daemon=True)
+            self._thread.start()
+
+    def prepare(self, bgr):
+        """BGR frame -> RGB in a reused buffer (pass it to FaceMeshEngine.process(rgb=) and step())"""
+        with self._cond:
+            #the worker's buffer is taken from the moment step() queues it, not only once the worker wakes up
+            taken = self._job[0] if self._job is not None else self._busy
+            index = self._next if taken != self._next else 1 - self._next
+            self._next = 1 - index
+        buf = self._rgb[index]
+        if buf is None or buf.shape != bgr.shape:
+            buf = self._rgb[index] = np.empty_like(bgr)
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=buf)
+
+    def step(self, rgb, timestamp, face_seconds):
+        """
+        call once per frame after the face model ran on `rgb`.
+        face_seconds -> how long the face model took on this frame (drives the CPU budget)
+        returns a new HandResult when one finished since the last call, else None
+        """
+        self.frames += 1
+        self.face_time += self.smoothing * (face_seconds - self.face_time)
+        self.frames_since_run += 1
+
+        if self.frames_since_run >= self.interval:
+            if self.mode == 'interleave':
+                self.frames_since_run = 0
+                self._run(rgb, timestamp)
+            else:
+                index = next(i for i, buf in enumerate(self._rgb) if buf is rgb)
+                with self._cond:
+                    if self._busy is None and self._job is None:     #idle -> newest frame, else skip it
+                        self.frames_since_run = 0
+                        self._job = (index, timestamp)
+                        self._cond.notify()
+
+        with self._cond:
+            result, self._latest = self._latest, None
+        return result
+
+    def _run(self, rgb, timestamp):
+        start = time.perf_counter()
+        found = self.engine.get_landmarks(self.engine.process(None, rgb=rgb))
+        elapsed = time.perf_counter() - start
+        if found is None:
+            result = HandResult(np.zeros((0, 21, 3), dtype=np.float32), [], timestamp)
+        else:
+            result = HandResult(found[0].copy(), found[1], timestamp)
+
+        with self._cond:
+            self._latest = result
+            self.runs += 1
+            if self.runs == 1:
+                self.hand_time = elapsed
+            else:
+                self.hand_time += self.smoothing * (elapsed - self.hand_time)
+            #hands every K frames so their average cost per frame stays within budget
+            budget = self.cpu_budget * max(self.face_time, 1e-4)
+            self.interval = max(1, math.ceil(self.hand_time / budget))
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._job is not None or not self._running)
+                if not self._running:
+                    return
+                (index, timestamp), self._job = self._job, None
+                self._busy = index
+            try:
+                self._run(self._rgb[index], timestamp)
+            finally:
+                with self._cond:
+                    self._busy = None
+
+    @property
+    def run_ratio(self):
+        """fraction of frames the hand model ran on"""
+        return self.runs / self.frames if self.frames else 0.0
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
@@ -0,0 +1,110 @@
+import numpy as np
+
+
+class AdaptiveInference:
+    """
+    Runs FaceMeshEngine only every K frames and predicts the landmarks in between.
+
+    - K adapts to measured landmark speed: grows by one per still model run (up to max_interval),
+      drops straight back to 1 as soon as the face moves
+    - in-between frames get landmarks extrapolated with a constant-velocity filter
+    - request_inference() forces a real model run on the next frame (call it when a detector
+      is close to its threshold so gestures are confirmed on real landmarks, never predictions)
+    """
+    def __init__(self, engine, max_interval=3, still_speed=0.03, moving_speed=0.10, smoothing=0.5):
+        """
+        max_interval -> longest gap (frames) between two model runs
+        still_speed  -> mean landmark speed (normalized units / s) below which K may grow
+        moving_speed -> speed above which K resets to 1 (every frame)
+        smoothing    -> weight of the newest velocity measurement (0-1)
+        """
+        self.engine = engine
+        self.max_interval = max_interval
+        self.still_speed = still_speed
+        self.moving_speed = moving_speed
+        self.smoothing = smoothing
+
+        self.interval = 1                 #current K
+        self.frames_since_inference = 0
+        self.force_next = False
+
+        # ── Motion filter state ──
+        self.last_results = None
+        self.last_landmarks = None        #(N, 3) from the latest model run
+        self.last_time = None
+        self.velocity = None              #(N, 3) normalized units per second
+        self.speed = 0.0
+        self._predicted = None            #reused output buffer for predicted frames
+
+        # ── Counters ──
+        self.inferred_frames = 0
+        self.predicted_frames = 0
+
+    def request_inference(self):
+        """next frame runs the real model (safe to call from another thread)"""
+        self.force_next = True
+
+    def step(self, frame, timestamp, rgb=None):
+        """
+        returns (results, landmarks, predicted)
+        results   -> MediaPipe results of the latest real model run (for drawing)
+        landmarks -> (N, 3) array or None, measured on this frame or predicted if predicted=True
+        rgb       -> optional pre-converted frame, passed on to the engine
+        """
+        self.frames_since_inference += 1
+        due = (self.force_next or self.last_landmarks is None or
+               self.frames_since_inference >= self.interval)
+        if not due:
+            self.predicted_frames += 1
+            return self.last_results, self._predict(timestamp), True
+
+        self.force_next = False
+        self.frames_since_inference = 0
+        self.inferred_frames += 1
+
+        results = self.engine.process(frame, rgb=rgb)
+        landmarks = self.engine.get_landmarks(results)
+        self._measure(landmarks, timestamp)
+        self.last_results = results
+        return results, landmarks, False
+
+    def _measure(self, landmarks, timestamp):
+        """feeds one real measurement to the motion filter and adapts K"""
+        if landmarks is None:
+            #no face -> keep checking every frame until it comes back
+            self.last_landmarks = None
+            self.velocity = None
+            self.interval = 1
+            return
+
+        if self.last_landmarks is None or self.last_landmarks.shape != landmarks.shape:
+            self.last_landmarks = landmarks.copy()
+            self.velocity = np.zeros_like(landmarks)
+            self._predicted = np.empty_like(landmarks)
+        else:
+            dt = timestamp - self.last_time
+            if dt > 0:
+                measured = (landmarks - self.last_landmarks) / np.float32(dt)
+                self.velocity += np.float32(self.smoothing) * (measured - self.velocity)
+            self.last_landmarks[:] = landmarks
+        self.last_time = timestamp
+
+        #mean 2D landmark speed drives K
+        self.speed = float(np.sqrt((self.velocity[:, :2] ** 2).sum(axis=1)).mean())
+        if self.speed > self.moving_speed:
+            self.interval = 1
+        elif self.speed < self.still_speed:
+            self.interval = min(self.interval + 1, self.max_interval)
+
+    def _predict(self, timestamp):
+        """constant-velocity extrapolation from the latest model run"""
+        dt = np.float32(timestamp - self.last_time)
+        np.multiply(self.velocity, dt, out=self._predicted)
+        self._predicted += self.last_landmarks
+        return self._predicted
+
+    @property
+    def inference_ratio(self):
+        """fraction of frames that ran the real model"""
+        total = self.inferred_frames + self.predicted_frames
+        return self.inferred_frames / total if total else 1.0
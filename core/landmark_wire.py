@@ -0,0 +1,40 @@
+"""
+Fast NormalizedLandmarkList -> numpy conversion shared by the MediaPipe engines (face mesh, hands).
+Parses the serialized protobuf as packed float32 records instead of building per-point python objects.
+"""
+import numpy as np
+
+# wire layout of one serialized NormalizedLandmark holding only x, y, z:
+# [0x0a len=0x0f][0x0d x:f32][0x15 y:f32][0x1d z:f32]  -> 17 bytes per landmark
+LANDMARK_WIRE = np.dtype([('head', 'u1', (3,)), ('x', '<f4'),
+                          ('tag_y', 'u1'), ('y', '<f4'),
+                          ('tag_z', 'u1'), ('z', '<f4')])
+_LANDMARK_HEAD = np.array([0x0a, 0x0f, 0x0d], dtype=np.uint8)
+
+
+def wire_records(landmark_list):
+    """the serialized NormalizedLandmarkList viewed as float32 records, or None if the layout differs"""
+    raw = landmark_list.SerializeToString()
+    if len(raw) != len(landmark_list.landmark) * LANDMARK_WIRE.itemsize:
+        return None
+    rec = np.frombuffer(raw, dtype=LANDMARK_WIRE)
+    if ((rec['head'] == _LANDMARK_HEAD).all() and (rec['tag_y'] == 0x15).all()
+            and (rec['tag_z'] == 0x1d).all()):
+        return rec
+    return None
+
+
+def fill_landmarks(landmark_list, out):
+    """copies a NormalizedLandmarkList into `out` ((N, 3) float32 of the right length)"""
+    #fast path: view the serialized protobuf straight as float32 records
+    rec = wire_records(landmark_list)
+    if rec is not None:
+        out[:, 0] = rec['x']
+        out[:, 1] = rec['y']
+        out[:, 2] = rec['z']
+        return out
+
+    #slow path: a coordinate was exactly 0 (omitted on the wire) or extra fields are set
+    for i, lm in enumerate(landmark_list.landmark):
+        out[i] = (lm.x, lm.y, lm.z)
+    return out
@@ -0,0 +1,140 @@
+import threading
+from collections import deque
+
+
+class DropOldestQueue:
+    """
+    Bounded hand-off between pipeline stages.
+    put() never blocks: when full, the oldest item is thrown away (and counted),
+    so a slow stage always works on the freshest frame instead of a growing backlog
+    """
+    def __init__(self, maxsize=2):
+        self.items = deque()
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        with self._cond:
+            if len(self.items) >= self.maxsize:
+                self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """returns the oldest queued item, or None on timeout / once closed and empty"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.items or self.closed, timeout=timeout)
+            if not self.items:
+                return None
+            return self.items.popleft()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class FrameJob:
+    """one frame travelling through the pipeline; seq/timestamp come from capture and never change"""
+    __slots__ = ('seq', 'timestamp', 'image', 'results', 'landmarks', 'hands', 'states')
+
+    def __init__(self, seq, timestamp, image):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.image = image
+        self.results = None
+        self.landmarks = None
+        self.hands = None                 #core.hand_scheduler.HandResult when the hand model ran on this frame
+        self.states = None
+
+
+class Pipeline:
+    """
+    Runs capture and each stage on its own thread, linked by DropOldestQueues:
+
+        capture -> stage 1 -> stage 2 -> ... -> output queue (read with get() on the caller's thread)
+
+    stages: list of (name, fn) where fn(job) fills in the job and returns it (or None to discard it).
+    Rendering stays on the caller's thread since cv2.imshow/waitKey must run on the main thread.
+    An exception in capture or a stage stops the pipeline and is re-raised by get() on the caller's thread.
+    """
+    def __init__(self, cam, stages, queue_size=2):
+        self.cam = cam
+        self.stages = stages
+        self.queues = [DropOldestQueue(queue_size) for _ in range(len(stages) + 1)]
+        self.threads = []
+        self.running = False
+        self.source_ended = False
+        self.error = None                 #first exception raised on a pipeline thread
+
+    def start(self):
+        self.running = True
+        self.threads.append(threading.Thread(target=self._capture_loop, name='pipeline-capture', daemon=True))
+        for i, (name, fn) in enumerate(self.stages):
+            thread = threading.Thread(target=self._stage_loop, args=(fn, self.queues[i], self.queues[i + 1]),
+                                      name=f'pipeline-{name}', daemon=True)
+            self.threads.append(thread)
+        for thread in self.threads:
+            thread.start()
+
+    def _capture_loop(self):
+        try:
+            while self.running:
+                packet = self.cam.read()
+                if packet is None:
+                    self.source_ended = True
+                    break
+                self.queues[0].put(FrameJob(packet.seq, packet.timestamp, packet.image))
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self.queues[0].close()
+
+    def _stage_loop(self, fn, inbox, outbox):
+        #closing the outbox on the way out (also on an exception) lets the next stages and get() drain and end
+        try:
+            while self.running:
+                job = inbox.get(timeout=0.5)
+                if job is None:
+                    if inbox.closed:
+                        break
+                    continue
+                job = fn(job)
+                if job is not None:
+                    outbox.put(job)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            outbox.close()
+
+    def _fail(self, error):
+        """keeps the first error for get() and stops the other threads"""
+        if self.error is None:
+            self.error = error
+        self.running = False
+
+    def get(self, timeout=1.0):
+        """next finished job, or None if nothing arrived in time / the pipeline drained; raises a stage's exception"""
+        job = self.queues[-1].get(timeout=timeout)
+        if job is None and self.error is not None:
+            raise self.error              #after the jobs finished before it, never reported as "source ended"
+        return job
+
+    @property
+    def finished(self):
+        return self.queues[-1].closed and not self.queues[-1].items
+
+    def dropped(self):
+        """frames dropped at the input of each stage (+ the output queue) -> {name: count}"""
+        names = [name for name, _ in self.stages] + ['output']
+        return {name: queue.dropped for name, queue in zip(names, self.queues)}
+
+    def stop(self):
+        self.running = False
+        for queue in self.queues:
+            queue.close()
+        for thread in self.threads:
+            thread.join(timeout=1.0)
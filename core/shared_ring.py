@@ -0,0 +1,81 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedRing:
+    """
+    Fixed-shape array ring in multiprocessing.shared_memory: one writer process, any number of readers,
+    payloads are never pickled or sent through a pipe.
+
+    layout: [seq int64 x slots][timestamp float64 x slots][flag int64 x slots][slots x payload]
+    frame `seq` lives in slot seq % slots. The writer marks the slot invalid (seq -1) while it fills it,
+    so a reader that raced with the writer notices (seq changed after its copy) and just skips the frame.
+
+    create: SharedRing(shape, dtype, slots)   attach: SharedRing.attach(ring.spec)
+    """
+    def __init__(self, shape, dtype, slots=3, name=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.owner = name is None
+
+        payload = int(np.prod(self.shape)) * self.dtype.itemsize
+        header = 3 * 8 * slots
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=header + payload * slots)
+
+        buf = self.shm.buf
+        self.seqs = np.ndarray((slots,), np.int64, buffer=buf, offset=0)
+        self.timestamps = np.ndarray((slots,), np.float64, buffer=buf, offset=8 * slots)
+        self.flags = np.ndarray((slots,), np.int64, buffer=buf, offset=16 * slots)
+        self.data = np.ndarray((slots,) + self.shape, self.dtype, buffer=buf, offset=header)
+        if self.owner:
+            self.seqs[:] = -1
+
+    @property
+    def spec(self):
+        """small picklable description another process attaches with"""
+        return (self.shm.name, self.shape, self.dtype.str, self.slots)
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype, slots = spec
+        return cls(shape, dtype, slots, name=name)
+
+    # ── Writer side ──────────────────────────────────────────────────
+    def begin(self, seq):
+        """invalidates frame seq's slot and returns it as a writable array view"""
+        slot = seq % self.slots
+        self.seqs[slot] = -1
+        return self.data[slot]
+
+    def publish(self, seq, timestamp, flag=0):
+        """makes the slot filled since begin(seq) visible to readers"""
+        slot = seq % self.slots
+        self.timestamps[slot] = timestamp
+        self.flags[slot] = flag
+        self.seqs[slot] = seq
+
+    # ── Reader side ──────────────────────────────────────────────────
+    @property
+    def latest(self):
+        """newest published seq, -1 while nothing was published"""
+        return int(self.seqs.max())
+
+    def read(self, seq, out):
+        """copies frame seq into `out` -> (timestamp, flag), or None if it's gone / being rewritten"""
+        slot = seq % self.slots
+        if self.seqs[slot] != seq:
+            return None
+        timestamp, flag = float(self.timestamps[slot]), int(self.flags[slot])
+        np.copyto(out, self.data[slot])
+        if self.seqs[slot] != seq:        #writer came round during the copy
+            return None
+        return timestamp, flag
+
+    def close(self):
+        #drop the numpy views first, SharedMemory.close() refuses while buffers are exported
+        self.seqs = self.timestamps = self.flags = self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
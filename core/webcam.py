@@ -1,25 +1,158 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
 import cv2
 
+# one captured frame, tagged with its sequence number and capture time (time.perf_counter clock)
+Frame = namedtuple('Frame', ['image', 'seq', 'timestamp'])
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+
+
+class ImageFolderCapture:
+    """
+    Minimal cv2.VideoCapture look-alike over a folder of images (sorted by name).
+    lets the loop be driven from stills without a webcam
+    """
+    def __init__(self, folder, fps=30.0):
+        self.files = sorted(os.path.join(folder, f) for f in os.listdir(folder)
+                            if f.lower().endswith(IMAGE_EXTENSIONS))
+        self.fps = fps
+        self.index = 0
+        first = cv2.imread(self.files[0]) if self.files else None
+        self.shape = first.shape if first is not None else (0, 0, 3)
+
+    def isOpened(self):
+        return len(self.files) > 0
+
+    def read(self):
+        if self.index >= len(self.files):
+            return False, None
+        frame = cv2.imread(self.files[self.index])
+        self.index += 1
+        return frame is not None, frame
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.shape[1]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.shape[0]
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.files)
+        return 0
+
+    def release(self):
+        self.files = []
+
+
 class WebCam:
-    def __init__(self, camera_index=0):
-        self.cap = cv2.VideoCapture(camera_index)
+    """
+    source   -> camera index (int), path to a video file or a folder of images
+    threaded -> grab frames on a background thread and keep only the newest one,
+                so the main loop never waits on camera I/O or works on stale buffered frames
+    realtime -> for file/folder sources, pace reading to the source fps (default: on when threaded)
+    """
+    def __init__(self, source=0, threaded=False, realtime=None):
+        self.source = source
+        self.is_file = not isinstance(source, int)
+
+        if self.is_file and os.path.isdir(source):
+            self.cap = ImageFolderCapture(source)
+        else:
+            self.cap = cv2.VideoCapture(source)
 
         if not self.cap.isOpened():
+            if self.is_file:
+                raise RuntimeError(f"Cannot open source '{source}'. Check the path.")
             raise RuntimeError("Cannot open webcam. Check if another app is using it.")
-        
+
         #get camera resolution
         self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
 
         print(f'WebCam Opened: {self.width} * {self.height}')
 
+        # ── Frame bookkeeping ──
+        self.seq = 0                      #sequence number of the last grabbed frame
+        self.dropped_frames = 0           #frames overwritten before anyone read them
+        self.last_read_seq = 0
+
+        self.threaded = threaded
+        self.realtime = threaded if realtime is None else realtime
+        self._latest = None
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+        if threaded:
+            self._thread = threading.Thread(target=self._grab_loop, name='WebCamGrabber', daemon=True)
+            self._thread.start()
+
+    def _grab(self):
+        """reads one frame from the source and tags it, or None at end of stream / failure"""
+        ret, image = self.cap.read()
+        if not ret:
+            return None
+        self.seq += 1
+        return Frame(image, self.seq, time.perf_counter())
+
+    def _grab_loop(self):
+        """background thread: keep overwriting the single latest-frame slot"""
+        pace = 1.0 / self.fps if (self.is_file and self.realtime) else 0.0
+        next_due = time.perf_counter()
+
+        while not self._stopped:
+            if pace:
+                delay = next_due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                next_due += pace
+
+            packet = self._grab()
+            with self._cond:
+                if packet is None:
+                    self._stopped = True
+                elif self._latest is not None and self._latest.seq > self.last_read_seq:
+                    self.dropped_frames += 1          #previous frame never got consumed
+                if packet is not None:
+                    self._latest = packet
+                self._cond.notify_all()
+
+    def read(self, timeout=1.0):
+        """returns the newest Frame(image, seq, timestamp), or None if the source ended / failed"""
+        if not self.threaded:
+            packet = self._grab()
+            if packet is not None:
+                self.last_read_seq = packet.seq
+            return packet
+
+        with self._cond:
+            #wait for a frame we haven't handed out yet
+            fresh = self._cond.wait_for(
+                lambda: self._stopped or (self._latest is not None and self._latest.seq > self.last_read_seq),
+                timeout=timeout)
+            if not fresh or self._latest is None or self._latest.seq <= self.last_read_seq:
+                return None
+            packet = self._latest
+            self.last_read_seq = packet.seq
+            return packet
 
     def read_frame(self):
         #returns one frame (BGR image) or None if failed
-        ret, frame = self.cap.read()
-        if not ret:
+        packet = self.read()
+        if packet is None:
             return None
-        return frame
-    
+        return packet.image
+
     def release(self):
-        self.cap.release()
\ No newline at end of file
+        self._stopped = True
+        if self._thread is not None:
+            with self._cond:
+                self._cond.notify_all()
+            self._thread.join(timeout=1.0)
+        self.cap.release()
@@ -0,0 +1,164 @@
+"""
+Online calibration: watch a few seconds of a neutral face, derive per-user thresholds.
+
+Only running statistics are kept (utils.streaming_stats), so memory is constant however long
+calibration runs. The result is a plain dict ("profile") that utils.profiles stores per user + camera
+and apply_profile() pushes into the detectors.
+"""
+import math
+
+from utils.config import EYE_CONFIG, BROW_CONFIG, MOUTH_CONFIG, YAW_THRESHOLD
+from utils.streaming_stats import RunningStats, P2Quantile
+
+# metrics watched during calibration (names of detectors.features.extract_features)
+CALIBRATED = ('left_ear', 'right_ear', 'brow_distance', 'mouth_ratio', 'yaw', 'gaze_x', 'gaze_y')
+QUANTILES = (0.05, 0.5, 0.95)
+
+# calibrated thresholds stay within [DEFAULT_WINDOW[0] x, DEFAULT_WINDOW[1] x] the config default
+DEFAULT_WINDOW = (0.5, 2.0)
+
+
+def default_thresholds():
+    """profile thresholds of the global config (what every detector uses without calibration)"""
+    return {
+        'left_ear_threshold': EYE_CONFIG['LEFT_THRESHOLD'],
+        'right_ear_threshold': EYE_CONFIG['RIGHT_THRESHOLD'],
+        'brow_raise_threshold': BROW_CONFIG['RAISE_THRESHOLD'],
+        'smile_threshold': MOUTH_CONFIG['SMILE_THRESHOLD'],
+        'smile_reset': MOUTH_CONFIG['SMILE_RESET'],
+        'yaw_threshold': YAW_THRESHOLD,
+    }
+
+
+class FeatureStats:
+    """RunningStats + a few P2 quantiles for one metric"""
+    __slots__ = ('stats', 'quantiles')
+
+    def __init__(self, quantiles=QUANTILES):
+        self.stats = RunningStats()
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def update(self, value):
+        self.stats.update(value)
+        for quantile in self.quantiles.values():
+            quantile.update(value)
+
+    def summary(self):
+        summary = {'mean': self.stats.mean, 'std': self.stats.std, 'count': self.stats.count}
+        for p, quantile in self.quantiles.items():
+            summary[f'q{round(p * 100):02d}'] = quantile.value
+        return summary
+
+
+class Calibrator:
+    """
+    duration    -> seconds of neutral face to watch (frame timestamps, not wall clock)
+    min_samples -> frames with a face needed before it can finish
+    """
+    def __init__(self, duration=5.0, min_samples=30):
+        self.duration = duration
+        self.min_samples = min_samples
+        self.started = None
+        self.samples = 0
+        self.stats = {name: FeatureStats() for name in CALIBRATED}
+
+    def update(self, metrics, timestamp):
+        """metrics: dict from features.extract_features() for one face; returns True once calibration is done"""
+        if self.started is None:
+            self.started = timestamp
+        self.samples += 1
+        for name, stats in self.stats.items():
+            value = float(metrics[name])
+            if value == value:            #NaN: gaze without iris landmarks
+                stats.update(value)
+        return self.done(timestamp)
+
+    def done(self, timestamp):
+        return (self.started is not None and self.samples >= self.min_samples and
+                timestamp - self.started >= self.duration)
+
+    def remaining(self, timestamp):
+        """seconds left (for the HUD)"""
+        return self.duration if self.started is None else max(self.duration - (timestamp - self.started), 0.0)
+
+    def profile(self, defaults=None):
+        """
+        per-user thresholds from the neutral statistics, bounded by bound_profile().
+        defaults: overrides of default_thresholds() (the config values the bounds are built around)
+        """
+        s = {name: stats.summary() for name, stats in self.stats.items()}
+
+        def eye_threshold(eye):
+            #closed = clearly below the lowest open-eye values seen while neutral
+            return min(s[eye]['q50'] * 0.75, s[eye]['q05'] * 0.9)
+
+        brow = s['brow_distance']
+        mouth = s['mouth_ratio']
+        yaw = s['yaw']
+        smile = max(mouth['q95'] * 1.08, mouth['q50'] * 1.2)
+        defaults = dict(default_thresholds(), **(defaults or {}))
+        return bound_profile({
+            'left_ear_threshold': eye_threshold('left_ear'),
+            'right_ear_threshold': eye_threshold('right_ear'),
+            #raised = above the neutral range with some headroom for expression noise
+            'brow_raise_threshold': max(brow['q95'] + 2 * brow['std'], brow['q50'] * 1.2),
+            'smile_threshold': smile,
+            'smile_reset': (mouth['q95'] + smile) / 2,
+            #camera off to the side -> neutral yaw isn't 0; jittery pose -> wider threshold
+            'yaw_offset': yaw['q50'],
+            'yaw_threshold': max(defaults['yaw_threshold'], 6 * yaw['std']),
+            #looking at the screen centre while neutral -> that's the gaze centre (None without iris points)
+            'gaze_center': [s['gaze_x']['q50'], s['gaze_y']['q50']] if s['gaze_x']['count'] else None,
+            'stats': s,
+        }, defaults)
+
+
+def _bounded(value, default, low=None, high=None):
+    """value clamped to [low, high] (default: DEFAULT_WINDOW around default); NaN / inf / missing -> default"""
+    if value is None or not math.isfinite(value):
+        return default
+    low = default * DEFAULT_WINDOW[0] if low is None else low
+    high = default * DEFAULT_WINDOW[1] if high is None else high
+    return min(max(value, low), high)
+
+
+def bound_profile(profile, defaults=None):
+    """
+    keeps every threshold of a profile reachable: each one stays within DEFAULT_WINDOW of its config
+    default (EAR within 0.12-0.30), non-finite values fall back to the default.
+    Also applied to loaded profiles, so one saved from a bad calibration can't break later launches.
+    """
+    defaults = defaults or default_thresholds()
+    bounded = dict(profile)
+    for eye in ('left_ear_threshold', 'right_ear_threshold'):
+        bounded[eye] = _bounded(profile.get(eye), defaults[eye], 0.12, 0.30)
+    for name in ('brow_raise_threshold', 'smile_threshold', 'yaw_threshold'):
+        bounded[name] = _bounded(profile.get(name), defaults[name])
+    #reset below the trigger, or the smile never re-arms
+    bounded['smile_reset'] = min(_bounded(profile.get('smile_reset'), defaults['smile_reset']),
+                                 bounded['smile_threshold'] * defaults['smile_reset'] / defaults['smile_threshold'])
+    #a neutral head can't sit past half the turn threshold
+    limit = defaults['yaw_threshold'] * 0.5
+    bounded['yaw_offset'] = _bounded(profile.get('yaw_offset'), 0.0, -limit, limit)
+    gaze_center = profile.get('gaze_center')
+    if gaze_center is not None and not all(math.isfinite(value) for value in gaze_center):
+        bounded['gaze_center'] = None
+    return bounded
+
+
+def apply_profile(profile, eye_detector=None, head_detector=None, mouth_detector=None, gaze_detector=None):
+    """pushes a profile's thresholds (bounded, see bound_profile()) into the detectors (any of them may be None)"""
+    profile = bound_profile(profile)
+    if eye_detector is not None:
+        eye_detector.left_ear_threshold = profile['left_ear_threshold']
+        eye_detector.right_ear_threshold = profile['right_ear_threshold']
+        eye_detector.brow_raise_threshod = profile['brow_raise_threshold']
+    if head_detector is not None:
+        head_detector.yaw_offset = profile['yaw_offset']
+        head_detector.yaw_threshold = profile['yaw_threshold']
+        head_detector.return_threshold = profile['yaw_threshold'] * 0.7
+    if mouth_detector is not None:
+        mouth_detector.smile_threshold = profile['smile_threshold']
+        mouth_detector.reset_threshold = profile['smile_reset']
+    if gaze_detector is not None and profile.get('gaze_center'):       #older profiles have none
+        gaze_detector.center = tuple(profile['gaze_center'])
@@ -0,0 +1,68 @@
+# slack on time comparisons so a hold of 0.1s completes after exactly 3 frames @ 30fps (3 * 1/30 < 0.1 in floats)
+_EPS = 1e-6
+
+
+class HoldDebouncer:
+    """
+    Incremental hold / hysteresis / one-shot state machine, constant work per frame.
+
+    Times come from frame timestamps (seconds), never from frame counts or the wall clock,
+    so gesture timing is the same at 15 or 60 fps and stays correct when frames are dropped.
+
+    hold     -> condition must stay true this long before the state turns active
+    release  -> once active, the release condition must stay true this long to deactivate
+    cooldown -> minimum time between two activations
+
+    update(on, timestamp, off=None) -> active
+        off: optional separate release condition (value hysteresis, e.g. turn at 0.45, reset below 0.3);
+             defaults to `not on`
+    after update(), `triggered` is True only on the frame the state turned active (one-shot)
+    """
+    __slots__ = ('hold', 'release', 'cooldown', 'active', 'triggered',
+                 'on_since', 'off_since', 'last_trigger')
+
+    def __init__(self, hold=0.0, release=0.0, cooldown=0.0):
+        self.hold = hold
+        self.release = release
+        self.cooldown = cooldown
+        self.reset()
+
+    def reset(self):
+        self.active = False
+        self.triggered = False
+        self.on_since = None              #timestamp the condition became true, None while false
+        self.off_since = None             #timestamp the release condition became true while active
+        self.last_trigger = float('-inf')
+
+    def update(self, on, timestamp, off=None):
+        self.triggered = False
+        if off is None:
+            off = not on
+
+        # ── track how long the condition has been true ──
+        if on:
+            if self.on_since is None:
+                self.on_since = timestamp
+        else:
+            self.on_since = None
+
+        if not self.active:
+            if (on and timestamp - self.on_since >= self.hold - _EPS and
+                    timestamp - self.last_trigger >= self.cooldown - _EPS):
+                self.active = True
+                self.triggered = True
+                self.last_trigger = timestamp
+                self.off_since = None
+        elif off:
+            if self.off_since is None:
+                self.off_since = timestamp
+            if timestamp - self.off_since >= self.release - _EPS:
+                self.active = False
+                self.off_since = None
+        else:
+            self.off_since = None
+        return self.active
+
+    def held_for(self, timestamp):
+        """seconds the condition has been continuously true (0 when false)"""
+        return 0.0 if self.on_since is None else timestamp - self.on_since
@@ -0,0 +1,28 @@
+from collections import namedtuple
+
+# one gesture emitted by a detector
+#   type      -> one of the event types below
+#   timestamp -> capture time of the frame it was detected on (seconds)
+#   face_id   -> which face (0 for single-face mode); hand events: 0 = user's left hand, 1 = right hand
+#   value     -> metric that fired it (EAR, brow distance, mouth ratio, yaw, pinch distance, finger count), for logs / tuning
+GestureEvent = namedtuple('GestureEvent', ['type', 'timestamp', 'face_id', 'value'])
+
+# ── Event types ──────────────────────────────────────────────────
+LEFT_WINK = 'left_wink'
+RIGHT_WINK = 'right_wink'
+BOTH_BLINK = 'both_blink'
+EYEBROW_HOLD = 'eyebrow_hold'
+SMILE = 'smile'
+HEAD_TURN_LEFT = 'head_turn_left'
+HEAD_TURN_RIGHT = 'head_turn_right'
+FIST = 'fist'
+OPEN_PALM = 'open_palm'
+PINCH = 'pinch'
+FINGERS = ('fingers_1', 'fingers_2', 'fingers_3', 'fingers_4')   #FINGERS[n - 1] -> n fingers up (0 = fist, 5 = open palm)
+
+# gaze dwell on one of the 3x3 screen zones, row by row (value -> seconds dwelled)
+GAZE_ZONES = ('top_left', 'top', 'top_right', 'left', 'center', 'right', 'bottom_left', 'bottom', 'bottom_right')
+DWELL = tuple(f'dwell_{zone}' for zone in GAZE_ZONES)
+
+HAND_EVENT_TYPES = (FIST, OPEN_PALM, PINCH) + FINGERS
+EVENT_TYPES = (LEFT_WINK, RIGHT_WINK, BOTH_BLINK, EYEBROW_HOLD, SMILE, HEAD_TURN_LEFT, HEAD_TURN_RIGHT) + DWELL + HAND_EVENT_TYPES
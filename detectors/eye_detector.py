@@ -1,64 +1,51 @@
-import numpy as np
-from collections import deque
+import time
 from utils.config import EYE_CONFIG, BROW_CONFIG
+from detectors import features
+from detectors.feature_graph import frame_features
+from detectors.debounce import HoldDebouncer
+from detectors.events import GestureEvent, LEFT_WINK, RIGHT_WINK, BOTH_BLINK, EYEBROW_HOLD
 
 class EyeDetector:
-    def __init__(self, fps=30):
+    def __init__(self, face_id=0, debug=True):
+        """debug -> print the brow hold progress while raised (main turns it off per frame under load)"""
+        self.face_id = face_id
+        self.debug = debug
+        self.debug_skipped = False        #last frame had a brow print to show but debug was off
         self.left_ear_threshold = EYE_CONFIG['LEFT_THRESHOLD']
         self.right_ear_threshold = EYE_CONFIG['RIGHT_THRESHOLD']
-        self.ear_consec_frames = EYE_CONFIG['CONSEC_FRAMES']
-        self.fps = fps
+        self.closed_hold = EYE_CONFIG['CLOSED_HOLD_SEC']
 
-        #for left and right eye separately
-        self.left_ear_history = deque(maxlen=self.ear_consec_frames)
-        self.right_ear_history = deque(maxlen=self.ear_consec_frames)
+        #eye counts as closed once EAR stayed under the threshold for `closed_hold` seconds (left and right separately)
+        self.left_closed = HoldDebouncer(hold=self.closed_hold)
+        self.right_closed = HoldDebouncer(hold=self.closed_hold)
 
-        #landmark indices (MediaPipe Face Mesh Standard)
-        self.LEFT_EYE = [33, 160, 158, 133, 153, 144]
-        self.RIGHT_EYE = [362, 385, 387, 263, 373, 380]
+        #landmark indices (MediaPipe Face Mesh Standard), shared with the feature kernel
+        self.LEFT_EYE = features.LEFT_EYE
+        self.RIGHT_EYE = features.RIGHT_EYE
 
         # Eyebrow landmarks (middle points for average)
-        self.LEFT_BROW = [70, 63, 105]
-        self.RIGHT_BROW = [300, 293, 334]
-        self.LEFT_EYE_TOP = [159, 145]
-        self.RIGHT_EYE_TOP = [386, 374]
+        self.LEFT_BROW = features.LEFT_BROW
+        self.RIGHT_BROW = features.RIGHT_BROW
+        self.LEFT_EYE_TOP = features.LEFT_EYE_TOP
+        self.RIGHT_EYE_TOP = features.RIGHT_EYE_TOP
 
-        #for holding raised eyebrows
-        self.raised_count = 0
-        self.raised_threshold_frames = BROW_CONFIG['HOLD_FRAMES']
+        #for holding raised eyebrows -> fires once per hold, re-arms when the brows come down
+        self.brow_hold = BROW_CONFIG['HOLD_SEC']
         self.brow_raise_threshod = BROW_CONFIG['RAISE_THRESHOLD']
-
-    def _eye_aspect_ratio(self, eye_points):
-        """calculate EAR for one eye (6 pts.)"""
-        p1, p2, p3, p4, p5, p6 = eye_points
-        vertical1 = np.linalg.norm(p2 - p6)
-        vertical2 = np.linalg.norm(p3 - p5)
-        horizontal = np.linalg.norm(p1 - p4)
-
-        ear = (vertical1 + vertical2) / (2.0 * horizontal)
-        return ear
-    
-    def _get_eyebrow_distance(self, landmarks):
-        """returns average normalized vertical distance between eye and brow"""
-        if landmarks is None:
-            return 0.0
-        
-        #left side
-        left_brow_y = np.mean([landmarks[i][1] for i in self.LEFT_BROW])
-        left_eye_y = np.mean([landmarks[i][1] for i in self.LEFT_EYE_TOP])
-
-        #right side
-        right_brow_y = np.mean([landmarks[i][1] for i in self.RIGHT_BROW])
-        right_eye_y = np.mean([landmarks[i][1] for i in self.RIGHT_EYE_TOP])
-
-        #average distance (larger = raiser)
-        dist_left = left_eye_y - left_brow_y
-        dist_right = right_eye_y - right_brow_y
-
-        return (dist_left + dist_right) / 2
-    
-    def process(self, landmarks):
-        """landmarks: list of 468 pts [x, y, z] (normalized).    Returns dict with blink/wink states"""
+        self.brow = HoldDebouncer(hold=self.brow_hold)
+
+        #one-shot edges of the wink/blink level states
+        self.left_wink = HoldDebouncer()
+        self.right_wink = HoldDebouncer()
+        self.both_blink = HoldDebouncer()
+
+    def process(self, landmarks, timestamp=None):
+        """
+        landmarks: (N, 3) array (or list) of pts [x, y, z] (normalized), or the frame's shared
+                   detectors.feature_graph.FrameFeatures
+        timestamp: capture time of the frame (seconds, perf_counter clock), now if not given
+        Returns dict with blink/wink states, 'events' -> GestureEvents that fired on this frame
+        """
         if landmarks is None or len(landmarks) < 468:
             return {
                 "left_wink": False,
@@ -66,24 +53,28 @@ class EyeDetector:
                 "both_blink": False,
                 "left_closed": False,
                 "right_closed": False,
+                "eyebrow_raised_3sec": False,
+                "eyebrow_triggered": False,
                 "left_ear": 0.3,
-                "right_ear": 0.3
+                "right_ear": 0.3,
+                "brow_distance": 0.0,
+                "events": []
             }
+        if timestamp is None:
+            timestamp = time.perf_counter()
         
-        #extract eye points
-        left_eye_pts = [np.array(landmarks[i][:2]) for i in self.LEFT_EYE]
-        right_eye_pts = [np.array(landmarks[i][:2]) for i in self.RIGHT_EYE]
-
-        left_ear = self._eye_aspect_ratio(left_eye_pts)
-        right_ear = self._eye_aspect_ratio(right_eye_pts)
-
-        #store in history
-        self.left_ear_history.append(left_ear)
-        self.right_ear_history.append(right_ear)
-
-        #blink in EAR < ear_threshold for enough consecutive frames
-        left_closed = all(e < self.left_ear_threshold for e in self.left_ear_history)
-        right_closed = all(e < self.right_ear_threshold for e in self.right_ear_history)
+        frame = frame_features(landmarks)
+        return self.process_metrics(float(frame['left_ear']), float(frame['right_ear']),
+                                    float(frame['brow_distance']), timestamp)
+
+    def process_metrics(self, left_ear, right_ear, brow_dist, timestamp):
+        """
+        state update from already computed metrics (e.g. one row of features.extract_features
+        run on a batch of faces) -> same dict as process()
+        """
+        #blink in EAR < ear_threshold held for long enough
+        left_closed = self.left_closed.update(left_ear < self.left_ear_threshold, timestamp)
+        right_closed = self.right_closed.update(right_ear < self.right_ear_threshold, timestamp)
 
         both_blink = left_closed and right_closed
         #key logic:  wink = one eye clearly closed and another eye cleared open
@@ -91,34 +82,26 @@ class EyeDetector:
         right_wink = right_closed and (left_ear > self.right_ear_threshold * 1.3)
 
         # ────────────────────────── EyeBrow Raise detection logic ────────────────> start
-        brow_dist = self._get_eyebrow_distance(landmarks)
         is_raised = brow_dist > self.brow_raise_threshod
 
-        eyebrow_held = False
-        eyebrow_triggered = False
-
-        if is_raised:                     #testing printing on terminal , for how many is eyebrows up
-            print(f"Raised! dist={brow_dist:.4f}  count={self.raised_count}/{self.raised_threshold_frames}")
-           
-        if is_raised:
-            self.raised_count += 1
-            if self.raised_count >= self.raised_threshold_frames:
-                eyebrow_held = True
-                #logic below lets only perform the action once set to picking up eyebrows 3 sec     -> start
-                # If we haven't triggered yet in this hold → fire action
-                if not hasattr(self, 'already_triggered') or not self.already_triggered:
-                    eyebrow_triggered = True # Matches initialization now
-                    self.already_triggered = True# Block further triggers
-                    #trigger action only once eyebrows picking up 3sec            -> end
-            else:
-                eyebrow_held = False
-        else:
-            self.raised_count = 0
-            eyebrow_held = False
-            self.already_triggered = False  # Allow next raise to trigger again
-        #Eyebrow raise detection logic starts here              -> start
-
-
+        eyebrow_held = self.brow.update(is_raised, timestamp)
+        eyebrow_triggered = self.brow.triggered          #only the frame the hold completed
+
+        if is_raised and self.debug:      #testing printing on terminal , for how long the eyebrows are up
+            print(f"Raised! dist={brow_dist:.4f}  held={self.brow.held_for(timestamp):.2f}/{self.brow_hold:.2f}s")
+        self.debug_skipped = is_raised and not self.debug
+        # ────────────────────────── EyeBrow Raise detection logic ────────────────> end
+
+        # ── events (rising edges only) ──
+        events = []
+        if self.both_blink.update(both_blink, timestamp) and self.both_blink.triggered:
+            events.append(GestureEvent(BOTH_BLINK, timestamp, self.face_id, min(left_ear, right_ear)))
+        if self.left_wink.update(left_wink, timestamp) and self.left_wink.triggered:
+            events.append(GestureEvent(LEFT_WINK, timestamp, self.face_id, left_ear))
+        if self.right_wink.update(right_wink, timestamp) and self.right_wink.triggered:
+            events.append(GestureEvent(RIGHT_WINK, timestamp, self.face_id, right_ear))
+        if eyebrow_triggered:
+            events.append(GestureEvent(EYEBROW_HOLD, timestamp, self.face_id, brow_dist))
 
         return {
             "left_wink": left_wink,
@@ -130,6 +113,12 @@ class EyeDetector:
             "eyebrow_triggered": eyebrow_triggered,       # True only once per hold
             "left_ear": left_ear,
             "right_ear": right_ear,
-            "brow_distance": brow_dist
+            "brow_distance": brow_dist,
+            "events": events
         }
 
+    def near_threshold(self, states, margin=0.15):
+        """True while an EAR / brow metric is within `margin` (fraction) of its trigger -> worth a real model run"""
+        return (states['left_ear'] < self.left_ear_threshold * (1 + margin) or
+                states['right_ear'] < self.right_ear_threshold * (1 + margin) or
+                states.get('brow_distance', 0.0) > self.brow_raise_threshod * (1 - margin))
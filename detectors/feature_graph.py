@@ -0,0 +1,228 @@
+"""
+Lazy per-frame feature graph shared by all detectors.
+
+Every derived quantity (eye points, inter-ocular distance, face scale, EAR, mouth geometry, pose, gaze)
+is registered once below as a node; a node reads the nodes it depends on through the same lookup.
+The formulas themselves are the point kernels of detectors.features, the graph only decides which
+points feed them (all gathered in one go) and shares the results.
+FrameFeatures(landmarks) computes a node the first time somebody asks for it and memoizes it for
+that frame, so detectors that share inputs (eye corners 33 / 263 feed EAR, roll, face scale and gaze)
+pay for them once, and a detector that isn't running costs nothing.
+
+Works on any leading shape like detectors.features: (N, 3) -> scalars, (T, N, 3) / (F, N, 3) -> arrays.
+
+Face-scale normalization: with normalize=True, the metrics measured in image units (brow distance,
+corner raise, yaw, pitch) are rescaled to a face of `reference_scale` inter-ocular distance, so their
+thresholds hold whether you sit close to the camera or far away. Ratios (EAR, mouth ratio, gaze) are
+scale-free already.
+"""
+import numpy as np
+
+from utils.config import FEATURE_CONFIG
+from detectors import features
+
+_NODES = {}
+
+
+def node(fn):
+    """registers fn(frame) as the node named like the function"""
+    _NODES[fn.__name__] = fn
+    return fn
+
+
+class FrameFeatures:
+    """memoized feature lookup for one frame (or one batch): frame['left_ear'], frame['face_scale'], ..."""
+    __slots__ = ('landmarks', 'normalize', 'reference_scale', '_values')
+
+    def __init__(self, landmarks, normalize=FEATURE_CONFIG['SCALE_NORMALIZE'],
+                 reference_scale=FEATURE_CONFIG['REFERENCE_SCALE']):
+        self.landmarks = np.asarray(landmarks, dtype=np.float32)
+        self.normalize = normalize
+        self.reference_scale = reference_scale
+        self._values = {}
+
+    def __getitem__(self, name):
+        values = self._values
+        if name not in values:
+            values[name] = _NODES[name](self)
+        return values[name]
+
+    def __len__(self):
+        """number of landmarks (like len() of the landmark array)"""
+        return self.landmarks.shape[-2]
+
+    @property
+    def computed(self):
+        """names of the nodes evaluated so far on this frame"""
+        return tuple(self._values)
+
+
+def frame_features(landmarks):
+    """FrameFeatures of landmarks; passes an existing FrameFeatures through (so detectors share one)"""
+    if isinstance(landmarks, FrameFeatures):
+        return landmarks
+    return FrameFeatures(landmarks)
+
+
+# ── shared geometry ──────────────────────────────────────────────
+# every point a node reads, gathered with one fancy index per frame; nodes slice views out of it
+_GROUPS = (('left_eye', features.LEFT_EYE), ('right_eye', features.RIGHT_EYE), ('mouth', features.MOUTH_POINTS),
+           ('pose', features.POSE_POINTS[:5]), ('eye_tops', features.EYE_TOPS.ravel()),
+           ('brows', features.BROWS.ravel()), ('iris', features.GAZE_POINTS[:, 2]))        #iris last, only gathered on 478-pt. meshes
+
+
+def _layout(groups):
+    """-> (group name -> slice into the gathered points, concatenated landmark indices)"""
+    slices, start = {}, 0
+    for name, indices in groups:
+        slices[name] = slice(start, start + len(indices))
+        start += len(indices)
+    return slices, np.concatenate([indices for _, indices in groups])
+
+
+_SLICES, _POINTS = _layout(_GROUPS)
+_MESH_POINTS = _POINTS[:_SLICES['iris'].start]
+
+
+@node
+def xy(f):
+    """(..., P, 2) x/y of the points in _POINTS (without the iris on a 468-pt. mesh)"""
+    landmarks = f.landmarks
+    points = _POINTS if landmarks.shape[-2] >= features.NUM_IRIS_LANDMARKS else _MESH_POINTS
+    return landmarks[..., points, :2]
+
+
+@node
+def left_eye_points(f):
+    return f['xy'][..., _SLICES['left_eye'], :]        #p1..p6, p1 = corner 33, p4 = corner 133
+
+
+@node
+def right_eye_points(f):
+    return f['xy'][..., _SLICES['right_eye'], :]       #p1 = corner 362, p4 = corner 263
+
+
+@node
+def outer_corners(f):
+    """outer eye corners 33 and 263, (..., 2, 2)"""
+    return np.stack([f['left_eye_points'][..., 0, :], f['right_eye_points'][..., 3, :]], axis=-2)
+
+
+@node
+def interocular(f):
+    corners = f['outer_corners']
+    return features._norm(corners[..., 1, :] - corners[..., 0, :])
+
+
+@node
+def face_scale(f):
+    """inter-ocular distance (frame widths), the size of the face in the image"""
+    return f['interocular']
+
+
+@node
+def scale_factor(f):
+    """multiplier that brings image-unit metrics to the reference face size (1 when not normalizing)"""
+    if not f.normalize:
+        return 1.0
+    scale = f['face_scale']
+    return f.reference_scale / np.where(scale > 0, scale, f.reference_scale)
+
+
+# ── eyes ─────────────────────────────────────────────────────────
+@node
+def left_ear(f):
+    return features.ear(f['left_eye_points'])
+
+
+@node
+def right_ear(f):
+    return features.ear(f['right_eye_points'])
+
+
+@node
+def brow_distance(f):
+    y = f['xy'][..., 1]
+    #(..., 2 sides, points per side), sizes spelled out so empty batches reshape too
+    tops = y[..., _SLICES['eye_tops']].reshape(y.shape[:-1] + features.EYE_TOPS.shape)
+    brows = y[..., _SLICES['brows']].reshape(y.shape[:-1] + features.BROWS.shape)
+    return features.brow_gap(tops, brows) * f['scale_factor']
+
+
+# ── mouth ────────────────────────────────────────────────────────
+@node
+def mouth_points(f):
+    return f['xy'][..., _SLICES['mouth'], :]          #left corner, right corner, upper center, lower center
+
+
+@node
+def mouth(f):
+    """(width/height ratio, corner raise)"""
+    return features.mouth_shape(f['mouth_points'])
+
+
+@node
+def mouth_ratio(f):
+    return f['mouth'][0]
+
+
+@node
+def corners_raised(f):
+    return f['mouth'][1] * f['scale_factor']
+
+
+# ── head pose ────────────────────────────────────────────────────
+@node
+def pose_points(f):
+    return f['xy'][..., _SLICES['pose'], :]           #nose, left ear, right ear, chin, forehead
+
+
+@node
+def yaw_pitch(f):
+    return features.yaw_pitch(f['pose_points'])
+
+
+@node
+def yaw(f):
+    return f['yaw_pitch'][0] * f['scale_factor']
+
+
+@node
+def pitch(f):
+    return f['yaw_pitch'][1] * f['scale_factor']
+
+
+@node
+def roll(f):
+    corners = f['outer_corners']
+    return features.roll_angle(corners[..., 0, :], corners[..., 1, :])
+
+
+# ── gaze ─────────────────────────────────────────────────────────
+@node
+def gaze(f):
+    """(gaze_x, gaze_y) like features.gaze(), reusing the eye corner points"""
+    landmarks = f.landmarks
+    if landmarks.shape[-2] < features.NUM_IRIS_LANDMARKS:
+        nan = np.full(landmarks.shape[:-2], np.nan, dtype=np.float32)
+        return nan, nan
+    left, right = f['left_eye_points'], f['right_eye_points']
+    start = np.stack([left[..., 0, :], right[..., 0, :]], axis=-2)
+    end = np.stack([left[..., 3, :], right[..., 3, :]], axis=-2)
+    return features.iris_gaze(start, end, f['xy'][..., _SLICES['iris'], :])
+
+
+@node
+def gaze_x(f):
+    return f['gaze'][0]
+
+
+@node
+def gaze_y(f):
+    return f['gaze'][1]
+
+
+@node
+def min_ear(f):
+    """the more closed eye's EAR (gaze ignores blinks)"""
+    return np.minimum(f['left_ear'], f['right_ear'])
@@ -0,0 +1,145 @@
+"""
+Vectorized landmark -> metric kernels shared by all detectors.
+
+Every function takes landmarks shaped (..., N, 3): a single face (N, 3), a recording (T, N, 3)
+or several faces (F, N, 3), and returns the metric with the leading shape kept
+(scalar for one face, (T,) / (F,) arrays for batches). No python loops over frames.
+"""
+import numpy as np
+
+# ── Landmark indices (MediaPipe Face Mesh Standard) ──────────────────
+LEFT_EYE = np.array([33, 160, 158, 133, 153, 144])       #p1..p6 for EAR
+RIGHT_EYE = np.array([362, 385, 387, 263, 373, 380])
+
+LEFT_BROW = np.array([70, 63, 105])                       #eyebrow middle points
+RIGHT_BROW = np.array([300, 293, 334])
+LEFT_EYE_TOP = np.array([159, 145])
+RIGHT_EYE_TOP = np.array([386, 374])
+
+MOUTH_POINTS = np.array([61, 291, 13, 14])                #left corner, right corner, upper center, lower center
+
+# nose, left ear, right ear, chin, forehead, left eye outer, right eye outer
+POSE_POINTS = np.array([11, 234, 454, 152, 10, 33, 263])
+
+# per eye (same order as LEFT_EYE / RIGHT_EYE): corner nearer image-left, corner nearer image-right, iris centre
+# iris centres only exist with refine_landmarks (478 pts.)
+GAZE_POINTS = np.array([[33, 133, 468], [362, 263, 473]])
+NUM_IRIS_LANDMARKS = 478
+
+FEATURE_NAMES = ('left_ear', 'right_ear', 'brow_distance', 'mouth_ratio', 'corners_raised', 'yaw', 'pitch', 'roll',
+                 'gaze_x', 'gaze_y')
+
+# both sides stacked (left, right) for the brow kernel
+EYE_TOPS = np.stack([LEFT_EYE_TOP, RIGHT_EYE_TOP])
+BROWS = np.stack([LEFT_BROW, RIGHT_BROW])
+
+
+def _norm(vectors):
+    """euclidean length over the last axis"""
+    return np.sqrt((vectors * vectors).sum(axis=-1))
+
+
+# ── Point kernels ────────────────────────────────────────────────
+# every metric is computed here once, on already gathered (x, y) points; the landmark functions below
+# and detectors.feature_graph (which gathers all points in one go) both call these
+
+def ear(points):
+    """EAR = (|p2-p6| + |p3-p5|) / (2 |p1-p4|) of the 6 eye points p1..p6, (..., 6, 2)"""
+    #rows: p2-p6, p3-p5, p1-p4
+    lengths = _norm(points[..., [1, 2, 0], :] - points[..., [5, 4, 3], :])
+    return (lengths[..., 0] + lengths[..., 1]) / (2.0 * lengths[..., 2])
+
+
+def brow_gap(tops_y, brows_y):
+    """eye top y (..., 2 sides, 2) and brow y (..., 2 sides, 3) -> mean eye-top to brow distance of both sides"""
+    gap = tops_y.sum(axis=-1) / tops_y.shape[-1] - brows_y.sum(axis=-1) / brows_y.shape[-1]
+    return (gap[..., 0] + gap[..., 1]) / 2
+
+
+def mouth_shape(points):
+    """left corner, right corner, upper center, lower center (..., 4, 2) -> (width/height ratio, corner raise)"""
+    #rows: right-left (width), lower-upper (height)
+    width, height = np.moveaxis(_norm(points[..., [1, 3], :] - points[..., [0, 2], :]), -1, 0)
+    ratio = np.where(height != 0, width / np.where(height != 0, height, 1), 0)
+
+    # Positive if corners are above the vertical center of the mouth
+    y = points[..., 1]
+    raise_amount = (y[..., 2] + y[..., 3]) / 2 - (y[..., 0] + y[..., 1]) / 2
+    return ratio, raise_amount
+
+
+def yaw_pitch(points):
+    """nose, left ear, right ear, chin, forehead (..., 5, 2) -> (yaw, pitch)"""
+    x, y = points[..., 0], points[..., 1]
+    # Yaw: nose horizontal relative to ears
+    yaw = (x[..., 0] - (x[..., 1] + x[..., 2]) / 2) * 5.0
+    # Pitch: nose vertical relative to forehead/chin
+    pitch = (y[..., 0] - (y[..., 4] + y[..., 3]) / 2) * 5.0
+    return yaw, pitch
+
+
+def roll_angle(left_eye_outer, right_eye_outer):
+    """eye line angle in degrees from the outer eye corners (..., 2)"""
+    delta = right_eye_outer - left_eye_outer
+    return np.arctan2(delta[..., 1], delta[..., 0]) * (180 / np.pi)
+
+
+def iris_gaze(start, end, iris):
+    """per eye (..., 2 eyes, 2): image-left corner, image-right corner, iris centre -> (gaze_x, gaze_y), see gaze()"""
+    axis = end - start
+    iris = iris - start
+    width2 = (axis * axis).sum(axis=-1)
+    width2 = np.where(width2 > 0, width2, 1)
+    along = (iris * axis).sum(axis=-1) / width2
+    across = (axis[..., 0] * iris[..., 1] - axis[..., 1] * iris[..., 0]) / width2
+    return (along[..., 0] + along[..., 1]) / 2, (across[..., 0] + across[..., 1]) / 2
+
+
+# ── Landmark functions ───────────────────────────────────────────
+def eye_aspect_ratio(landmarks, eye=LEFT_EYE):
+    """EAR for the 6 eye indices given"""
+    return ear(landmarks[..., eye, :2])
+
+
+def eyebrow_distance(landmarks):
+    """average normalized vertical distance between eye top and brow (larger = raised)"""
+    y = landmarks[..., 1]
+    return brow_gap(y[..., EYE_TOPS], y[..., BROWS])
+
+
+def mouth_metrics(landmarks):
+    """returns (width/height ratio, corner raise). ratio is 0 where the mouth height is 0"""
+    return mouth_shape(landmarks[..., MOUTH_POINTS, :2])
+
+
+def head_pose(landmarks):
+    """returns (yaw, pitch, roll) from the nose/ears/chin/forehead/eye-corner points"""
+    points = landmarks[..., POSE_POINTS, :2]
+    yaw, pitch = yaw_pitch(points[..., :5, :])
+    return yaw, pitch, roll_angle(points[..., 5, :], points[..., 6, :])
+
+
+def gaze(landmarks):
+    """
+    returns (gaze_x, gaze_y), both eyes in one pass and averaged:
+    gaze_x -> iris position along the corner-to-corner line, 0 = at the image-left corner, 1 = image-right, ~0.5 centred
+    gaze_y -> iris distance off that line in eye widths, + = below (looking down)
+    measured in the eye's own frame, so head roll and distance to the camera cancel out.
+    NaN when the landmarks have no iris points (468-pt. mesh)
+    """
+    if landmarks.shape[-2] < NUM_IRIS_LANDMARKS:
+        nan = np.full(landmarks.shape[:-2], np.nan, dtype=np.float32)
+        return nan, nan
+    points = landmarks[..., GAZE_POINTS, :2]                   #(..., 2 eyes, 3 pts, 2)
+    return iris_gaze(points[..., 0, :], points[..., 1, :], points[..., 2, :])
+
+
+def extract_features(landmarks):
+    """
+    all detector metrics in one vectorized pass.
+    landmarks: (N, 3), (T, N, 3) or (F, N, 3) -> dict of FEATURE_NAMES -> scalar / (T,) / (F,) arrays
+    (read from the shared feature graph, so batches get the same face-scale normalization as live detectors)
+    """
+    from detectors.feature_graph import FrameFeatures    #the graph imports this module for the point kernels
+    frame = FrameFeatures(landmarks)
+    return {name: frame[name] for name in FEATURE_NAMES}
@@ -0,0 +1,78 @@
+import math
+import time
+import numpy as np
+from utils.config import GAZE_CONFIG
+from detectors.feature_graph import frame_features
+from detectors.events import GestureEvent, GAZE_ZONES, DWELL
+
+class GazeDetector:
+    """
+    Iris position -> one of 3x3 screen zones -> dwell-select events.
+
+    Each zone has a leaky dwell timer (9 floats, constant memory): looking at a zone adds the frame's
+    time to it, every other zone drains at `decay` x real time. A zone reaching `dwell_sec` fires
+    'dwell_<zone>' once and all timers start over. Closed eyes (blink) neither add nor drain.
+    """
+    def __init__(self, x_edge=GAZE_CONFIG['X_EDGE'], y_edge=GAZE_CONFIG['Y_EDGE'], dwell_sec=GAZE_CONFIG['DWELL_SEC'],
+                 decay=GAZE_CONFIG['DECAY'], closed_ear=GAZE_CONFIG['CLOSED_EAR'], face_id=0):
+        """
+        x_edge / y_edge -> gaze offset from the centre where the side / top-bottom zones begin
+        closed_ear      -> below this EAR (either eye) the iris isn't trusted
+        """
+        self.x_edge = x_edge
+        self.y_edge = y_edge
+        self.dwell_sec = dwell_sec
+        self.decay = decay
+        self.closed_ear = closed_ear
+        self.face_id = face_id
+        self.center = tuple(GAZE_CONFIG['CENTER'])   #neutral (looking at the screen centre) gaze, calibration overrides it
+
+        self.dwell = np.zeros(len(GAZE_ZONES))
+        self.last_timestamp = None
+        self.max_step = 0.2                          #longest frame gap counted (face lost, app stalled)
+
+    def zone(self, gaze_x, gaze_y):
+        """index into GAZE_ZONES"""
+        dx, dy = gaze_x - self.center[0], gaze_y - self.center[1]
+        col = 0 if dx < -self.x_edge else 2 if dx > self.x_edge else 1
+        row = 0 if dy < -self.y_edge else 2 if dy > self.y_edge else 1
+        return row * 3 + col
+
+    def process(self, landmarks, timestamp=None):
+        """
+        landmarks: (N, 3) array or the frame's shared FrameFeatures (EAR then comes for free from the eyes)
+        timestamp: capture time of the frame (seconds, perf_counter clock), now if not given
+        """
+        if landmarks is None:
+            return {'zone': None, 'dwell': 0.0, 'events': []}
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        frame = frame_features(landmarks)
+        return self.process_metrics(float(frame['gaze_x']), float(frame['gaze_y']), float(frame['min_ear']), timestamp)
+
+    def process_metrics(self, gaze_x, gaze_y, ear, timestamp):
+        """state update from already computed metrics (ear -> the lower of both eyes) -> same dict as process()"""
+        step = 0.0 if self.last_timestamp is None else min(max(timestamp - self.last_timestamp, 0.0), self.max_step)
+        self.last_timestamp = timestamp
+
+        if ear < self.closed_ear or math.isnan(gaze_x):
+            return {'zone': None, 'gaze_x': gaze_x, 'gaze_y': gaze_y, 'dwell': 0.0, 'events': []}
+
+        zone = self.zone(gaze_x, gaze_y)
+        held = self.dwell[zone] + step
+        self.dwell -= self.decay * step
+        np.maximum(self.dwell, 0.0, out=self.dwell)
+        self.dwell[zone] = held
+
+        events = []
+        if held >= self.dwell_sec - 1e-6:
+            events.append(GestureEvent(DWELL[zone], timestamp, self.face_id, held))
+            self.dwell[:] = 0.0
+
+        return {
+            'zone': GAZE_ZONES[zone],
+            'gaze_x': gaze_x,
+            'gaze_y': gaze_y,
+            'dwell': held / self.dwell_sec,        #progress 0..1 of the zone looked at, for the HUD
+            'events': events
+        }
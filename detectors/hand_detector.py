@@ -0,0 +1,91 @@
+import numpy as np
+from utils.config import HAND_CONFIG
+from detectors.debounce import HoldDebouncer
+from detectors.events import GestureEvent, FIST, OPEN_PALM, PINCH, FINGERS
+
+# ── Landmark indices (MediaPipe Hands) ──────────────────────────────
+WRIST = 0
+MIDDLE_MCP = 9
+PINKY_MCP = 17
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])        #thumb, index, middle, ring, pinky
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])        #joint below each tip (thumb: IP)
+
+HANDS = ('Left', 'Right')                         #event face_id = index in here
+
+
+def hand_metrics(hands):
+    """
+    hands: (H, 21, 3) -> (extended (H, 5) bool, finger count (H,), pinch distance (H,)), no loop over hands
+    a finger is extended when its tip is farther from the wrist than its middle joint
+    (thumb: farther from the pinky knuckle, it folds sideways); pinch distance is thumb tip <-> index tip
+    in palm sizes (wrist <-> middle knuckle), so it doesn't depend on how far the hand is from the camera
+    """
+    points = hands[..., :2]
+    palm = np.linalg.norm(points[:, MIDDLE_MCP] - points[:, WRIST], axis=-1)
+    palm = np.where(palm > 0, palm, 1.0)
+
+    anchor = np.repeat(points[:, None, WRIST], 5, axis=1)
+    anchor[:, 0] = points[:, PINKY_MCP]
+    tip = np.linalg.norm(points[:, FINGER_TIPS] - anchor, axis=-1)
+    pip = np.linalg.norm(points[:, FINGER_PIPS] - anchor, axis=-1)
+    extended = tip > pip * HAND_CONFIG['EXTEND_RATIO']
+
+    pinch = np.linalg.norm(points[:, 4] - points[:, 8], axis=-1) / palm
+    return extended, extended.sum(axis=-1), pinch
+
+
+class HandDetector:
+    """
+    Hand poses -> GestureEvents: fist, open palm, 1-4 fingers up, pinch (thumb + index tips together).
+    One set of debouncers per hand (user's left / right), so each hand has its own holds.
+    """
+    def __init__(self, hold_sec=HAND_CONFIG['HOLD_SEC'], pinch_threshold=HAND_CONFIG['PINCH_THRESHOLD'],
+                 pinch_release=HAND_CONFIG['PINCH_RELEASE']):
+        self.hold_sec = hold_sec
+        self.pinch_threshold = pinch_threshold
+        self.pinch_release = pinch_release
+        # per hand: one debouncer per finger count 0..5 (0 = fist, 5 = open palm) + pinch
+        self.counts = [[HoldDebouncer(hold=hold_sec) for _ in range(6)] for _ in HANDS]
+        self.pinch = [HoldDebouncer(hold=hold_sec) for _ in HANDS]
+        self.count_events = (FIST,) + FINGERS + (OPEN_PALM,)
+
+    def process(self, landmarks, handedness, timestamp):
+        """
+        landmarks  -> (H, 21, 3) array (H may be 0), handedness -> 'Left' / 'Right' per row
+        timestamp  -> capture time of the frame the hands were found on
+        """
+        events = []
+        states = {'fingers': {}, 'pinch': {}}
+        if len(landmarks):
+            extended, count, pinch = hand_metrics(np.asarray(landmarks, dtype=np.float32))
+            count, pinch = count.tolist(), pinch.tolist()
+        else:
+            count, pinch = [], []
+
+        seen = {}
+        for i, label in enumerate(handedness):
+            if label in HANDS and label not in seen:
+                seen[label] = i
+
+        for hand, label in enumerate(HANDS):
+            i = seen.get(label)
+            fingers = count[i] if i is not None else -1
+            distance = pinch[i] if i is not None else float('inf')
+            pinching = distance < self.pinch_threshold
+
+            # a pinch bends thumb + index, don't also report it as a finger count
+            for n, debouncer in enumerate(self.counts[hand]):
+                debouncer.update(fingers == n and not pinching, timestamp)
+                if debouncer.triggered:
+                    events.append(GestureEvent(self.count_events[n], timestamp, hand, float(n)))
+
+            self.pinch[hand].update(pinching, timestamp, off=distance > self.pinch_release)
+            if self.pinch[hand].triggered:
+                events.append(GestureEvent(PINCH, timestamp, hand, distance))
+
+            if i is not None:
+                states['fingers'][label] = fingers
+                states['pinch'][label] = distance
+
+        states['events'] = events
+        return states
@@ -1,46 +1,36 @@
-import numpy as np
 import time
 from utils.config import YAW_THRESHOLD
+from detectors.feature_graph import frame_features
+from detectors.debounce import HoldDebouncer
+from detectors.events import GestureEvent, HEAD_TURN_LEFT, HEAD_TURN_RIGHT
 
 class HeadDetector:
-    def __init__(self, yaw_threshold=YAW_THRESHOLD, fps=30):
+    def __init__(self, yaw_threshold=YAW_THRESHOLD, face_id=0):
         # ── Thresholds ──
         self.yaw_threshold = yaw_threshold
         self.return_threshold = yaw_threshold * 0.7
+        self.yaw_offset = 0.0                 #neutral yaw of this user / camera placement (calibration profile)
+        self.face_id = face_id
         
         # ── State Tracking (Memory) ──
-        self.head_state = "center"
-        self.last_action_time = 0.0
+        # active while turned, re-arms only after coming back under return_threshold
         self.cooldown = 0.5                   #seconds between allowed triggers to avoid spam
+        self.turn = HoldDebouncer(cooldown=self.cooldown)
+        self.head_state = "center"
 
     def update(self, landmarks):
-        """Calculates the real time yaw, pitch, roll. Call this every frame"""
+        """Calculates the real time yaw, pitch, roll. Call this every frame (landmarks or the frame's FrameFeatures)"""
         if landmarks is None or len(landmarks) < 468:
             return {'yaw':0.0, 'pitch':0.0, 'roll':0.0, 'direction':'center'}
 
         # ────────────────────────── Landmark Math ────────────────> start
-        nose = np.array(landmarks[11])
-        left_ear = np.array(landmarks[234])
-        right_ear = np.array(landmarks[454])
-        chin = np.array(landmarks[152])
-        forehead = np.array(landmarks[10])
-        left_eye_outer = np.array(landmarks[33])
-        right_eye_outer = np.array(landmarks[263])
-        
-        # Yaw: nose horizontal relative to ears
-        ear_center_x = (left_ear[0] + right_ear[0]) / 2
-        yaw = (nose[0] - ear_center_x) * 5.0
-
-        # Pitch: nose vertical relative to forehead/chin
-        vertical_center = (forehead[1] + chin[1]) / 2
-        pitch = (nose[1] - vertical_center) * 5.0
-
-        # Roll: eye line angle
-        roll = np.arctan2(right_eye_outer[1] - left_eye_outer[1],
-                          right_eye_outer[0] - left_eye_outer[0]) * (180/np.pi)
-
+        frame = frame_features(landmarks)
         # ────────────────────────── Landmark Math ────────────────> end
+        return self.pose(frame['yaw'], frame['pitch'], frame['roll'])
 
+    def pose(self, yaw, pitch, roll):
+        """pose dict from already computed angles"""
+        yaw, pitch, roll = float(yaw) - self.yaw_offset, float(pitch), float(roll)
         direction = 'center'
         if yaw>self.yaw_threshold:
             direction='right'
@@ -49,32 +39,42 @@ class HeadDetector:
         
         return {'yaw':yaw, 'pitch':pitch, 'roll':roll, 'direction':direction}
 
-    def detect_single_turn(self, current_yaw):
+    def detect_single_turn(self, current_yaw, timestamp=None):
         """
         Logic : Trigger once when crossing threshold 
         Reset only when returning to center
+        timestamp: capture time of the frame (seconds), now if not given
         """
-        action = None
-        now = time.time()
+        if timestamp is None:
+            timestamp = time.perf_counter()
 
         # ─────────────────────── Edge Detection Logic ──────────────> start
-        #1. Check if we are currently in "center" and just turned
-        if self.head_state == 'center':
-            if current_yaw < -self.yaw_threshold:
-                if now - self.last_action_time > self.cooldown:
-                    action = 'left'
-                    self.head_state = 'left'
-                    self.last_action_time = now
-            elif current_yaw > self.yaw_threshold:
-                if now - self.last_action_time > self.cooldown:
-                    action = 'right'
-                    self.head_state = 'right'
-                    self.last_action_time = now
-        #2. check if we have returned to center to reset the state
-        else :
-            #if we are left or right, we must come back towards 0 to allow another trigger (means head comes back at center)
-            if abs(current_yaw) < self.return_threshold:
-                self.head_state = 'center'
+        magnitude = abs(current_yaw)
+        self.turn.update(magnitude > self.yaw_threshold, timestamp, off=magnitude < self.return_threshold)
+        if not self.turn.active:
+            self.head_state = 'center'
+        elif self.turn.triggered:
+            self.head_state = 'left' if current_yaw < 0 else 'right'
+            return self.head_state
         # ─────────────────────── Edge Detection Logic ──────────────> end
-        
-        return action 
\ No newline at end of file
+        return None
+
+    def process(self, landmarks, timestamp=None):
+        """update() + detect_single_turn() for one frame -> pose dict with 'turn' and 'events' added"""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        return self.process_pose(self.update(landmarks), timestamp)
+
+    def process_pose(self, pose, timestamp):
+        """turn detection + events on a pose dict (from update() or pose()) -> the same dict, extended"""
+        turn = self.detect_single_turn(pose['yaw'], timestamp)
+        pose['turn'] = turn
+        pose['events'] = []
+        if turn is not None:
+            event_type = HEAD_TURN_LEFT if turn == 'left' else HEAD_TURN_RIGHT
+            pose['events'].append(GestureEvent(event_type, timestamp, self.face_id, pose['yaw']))
+        return pose
+
+    def near_threshold(self, pose, margin=0.15):
+        """True while yaw is within `margin` (fraction) of the turn trigger, or a turn still waits for its reset"""
+        return abs(pose['yaw']) > self.yaw_threshold * (1 - margin) or self.turn.active
@@ -1,19 +1,22 @@
-import numpy as np
-from collections import deque
-from utils.config import SMILE_THRESHOLD, SMILE_HOLD_FRAMES, SMILE_RESET, CORNERS_RAISE_THRESHOLD
+import time
+from utils.config import MOUTH_CONFIG
+from detectors.feature_graph import frame_features
+from detectors.debounce import HoldDebouncer
+from detectors.events import GestureEvent, SMILE
 
 class MouthDetector:
-    def __init__(self, smile_threshold=SMILE_THRESHOLD, min_hold_frames=SMILE_HOLD_FRAMES, reset_threshold=SMILE_RESET, corner_raise_threshold=CORNERS_RAISE_THRESHOLD):
+    def __init__(self, smile_threshold=MOUTH_CONFIG['SMILE_THRESHOLD'], min_hold_sec=MOUTH_CONFIG['SMILE_HOLD_SEC'],
+                 reset_threshold=MOUTH_CONFIG['SMILE_RESET'], corner_raise_threshold=MOUTH_CONFIG['CORNERS_RAISE_THRESHOLD'],
+                 face_id=0):
         self.smile_threshold = smile_threshold
-        self.min_hold_frames = min_hold_frames
+        self.min_hold_sec = min_hold_sec
         self.reset_threshold = reset_threshold
         self.corner_raise_threshold = corner_raise_threshold
+        self.face_id = face_id
 
-        # History for stability (to prevent accidental tiny twitches)
-        self.smile_history = deque(maxlen=min_hold_frames)
-
-        # The State Lock
-        self.active_smile_lock = False  # When True, we are "waiting" for you to stop smiling
+        # Hold (to prevent accidental tiny twitches) + the state lock in one:
+        # active == "waiting" for you to stop smiling before the next trigger
+        self.smile = HoldDebouncer(hold=min_hold_sec)
 
         # Landmark indices
         self.LEFT_CORNER = 61
@@ -21,53 +24,47 @@ class MouthDetector:
         self.UPPER_CENTER = 13
         self.LOWER_CENTER = 14
 
-    def _get_mouth_metrics(self, landmarks):
-        """Calculates width/height ratio and corner elevation"""
-        left = np.array(landmarks[self.LEFT_CORNER][:2])
-        right = np.array(landmarks[self.RIGHT_CORNER][:2])
-        upper = np.array(landmarks[self.UPPER_CENTER][:2])
-        lower = np.array(landmarks[self.LOWER_CENTER][:2])
-
-        width = np.linalg.norm(right - left)
-        height = np.linalg.norm(lower - upper)
-        ratio = width / height if height != 0 else 0
-        
-        # Positive if corners are above the vertical center of the mouth
-        center_y = (landmarks[self.UPPER_CENTER][1] + landmarks[self.LOWER_CENTER][1]) / 2
-        corners_y = (landmarks[self.LEFT_CORNER][1] + landmarks[self.RIGHT_CORNER][1]) / 2
-        raise_amount = center_y - corners_y
-
-        return ratio, raise_amount
-
-    def process(self, landmarks):
+    def process(self, landmarks, timestamp=None):
+        """
+        landmarks: (N, 3) array or the frame's shared FrameFeatures
+        timestamp: capture time of the frame (seconds, perf_counter clock), now if not given
+        """
         if landmarks is None:
-            return {'is_smiling': False, 'smile_triggered': False}
+            return {'is_smiling': False, 'smile_triggered': False, 'events': []}
+        if timestamp is None:
+            timestamp = time.perf_counter()
+
+        frame = frame_features(landmarks)
+        return self.process_metrics(float(frame['mouth_ratio']), float(frame['corners_raised']), timestamp)
 
-        ratio, corners_raised = self._get_mouth_metrics(landmarks)
-        
+    def process_metrics(self, ratio, corners_raised, timestamp):
+        """state update from already computed mouth metrics -> same dict as process()"""
         # 1. Detection
         is_smiling_now = (ratio > self.smile_threshold) and (corners_raised > self.corner_raise_threshold)
-        self.smile_history.append(is_smiling_now)
-        confirmed_smile = all(self.smile_history) and len(self.smile_history) == self.min_hold_frames
 
-        smile_triggered = False
+        # 2. One-shot after the hold, lock released when the mouth ratio drops below
+        # the reset threshold OR the landmarks show you are definitely NOT smiling anymore
+        self.smile.update(is_smiling_now, timestamp, off=ratio < self.reset_threshold or not is_smiling_now)
+        confirmed_smile = is_smiling_now and self.smile.held_for(timestamp) >= self.min_hold_sec
+        smile_triggered = self.smile.triggered
 
-        # 2. Logic for One-Shot
-        if confirmed_smile:
-            if not self.active_smile_lock:
-                smile_triggered = True
-                self.active_smile_lock = True # Lock is now ON
-        
-        # 3. THE FIX: Better Reset Logic
-        # If your mouth ratio drops below the reset threshold OR 
-        # if the landmarks show you are definitely NOT smiling anymore
-        if ratio < self.reset_threshold or not is_smiling_now:
-            self.active_smile_lock = False # Lock is now OFF
+        events = [GestureEvent(SMILE, timestamp, self.face_id, ratio)] if smile_triggered else []
 
         return {
             "is_smiling": confirmed_smile,
             "smile_triggered": smile_triggered,
             "mouth_ratio": ratio,
             "corners_raised": corners_raised,
-            "lock": self.active_smile_lock # Return this so we can see it on screen
-        }
\ No newline at end of file
+            "lock": self.smile.active, # Return this so we can see it on screen
+            "events": events
+        }
+
+    def near_threshold(self, states, margin=0.15):
+        """
+        True while the whole smile condition is within `margin` (fraction) of its trigger, or a smile is held.
+        both halves have to be close: a closed mouth has a huge ratio (tens to hundreds) but flat corners,
+        so the ratio alone says nothing
+        """
+        ratio_near = states.get('mouth_ratio', 0.0) > self.smile_threshold * (1 - margin)
+        corners_near = states.get('corners_raised', 0.0) > self.corner_raise_threshold * (1 - margin)
+        return (ratio_near and corners_near) or self.smile.on_since is not None or self.smile.active
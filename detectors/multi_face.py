@@ -0,0 +1,81 @@
+from detectors import features
+from detectors.eye_detector import EyeDetector
+from detectors.head_detector import HeadDetector
+from detectors.mouth_detector import MouthDetector
+from detectors.gaze_detector import GazeDetector
+
+
+class MultiFaceDetectors:
+    """
+    Per-face detector state for several people in view.
+
+    Metrics for all faces come from one features.extract_features() call on the (F, N, 3) batch,
+    then each face only runs its own O(1) state update (process_metrics / process_pose).
+    Detectors are created the first time a face ID shows up and dropped when the tracker forgets it,
+    so one person's half-finished hold never fires for someone else.
+    """
+    def __init__(self, needed=('head', 'eye', 'mouth', 'gaze')):
+        self.needed = set(needed)
+        self.faces = {}                   #face_id -> {'head': HeadDetector, 'eye': ..., 'mouth': ...}
+        self.debug = True                 #EyeDetector debug prints for every face
+        self.debug_skipped = False        #last frame had a debug print to show for some face but debug was off
+
+    def _detectors(self, face_id):
+        detectors = self.faces.get(face_id)
+        if detectors is None:
+            detectors = self.faces[face_id] = {
+                'head': HeadDetector(face_id=face_id),
+                'eye': EyeDetector(face_id=face_id),
+                'mouth': MouthDetector(face_id=face_id),
+                'gaze': GazeDetector(face_id=face_id),
+            }
+        return detectors
+
+    def forget(self, face_ids):
+        """drops the state of faces the tracker lost"""
+        for face_id in face_ids:
+            self.faces.pop(face_id, None)
+
+    def process(self, faces, face_ids, timestamp):
+        """
+        faces: (F, N, 3) landmarks, face_ids: (F,) IDs from core.face_tracker.FaceTracker
+        returns (states, events) -> states: face_id -> {'pose', 'eye', 'mouth', 'gaze'} dicts, events: GestureEvents of all faces
+        """
+        states = {}
+        events = []
+        self.debug_skipped = False
+        if faces is None or not len(faces):
+            return states, events
+
+        #one batched pass for every face, then plain python floats per face
+        columns = {name: values.tolist() for name, values in features.extract_features(faces).items()}
+
+        for row, face_id in enumerate(face_ids.tolist()):
+            detectors = self._detectors(face_id)
+            face_states = {}
+            if 'head' in self.needed:
+                head = detectors['head']
+                pose = head.process_pose(head.pose(columns['yaw'][row], columns['pitch'][row], columns['roll'][row]),
+                                         timestamp)
+                face_states['pose'] = pose
+                events.extend(pose['events'])
+            if 'eye' in self.needed:
+                detectors['eye'].debug = self.debug
+                eye_states = detectors['eye'].process_metrics(columns['left_ear'][row], columns['right_ear'][row],
+                                                              columns['brow_distance'][row], timestamp)
+                face_states['eye'] = eye_states
+                self.debug_skipped |= detectors['eye'].debug_skipped
+                events.extend(eye_states['events'])
+            if 'mouth' in self.needed:
+                mouth_states = detectors['mouth'].process_metrics(columns['mouth_ratio'][row],
+                                                                  columns['corners_raised'][row], timestamp)
+                face_states['mouth'] = mouth_states
+                events.extend(mouth_states['events'])
+            if 'gaze' in self.needed:
+                gaze_states = detectors['gaze'].process_metrics(
+                    columns['gaze_x'][row], columns['gaze_y'][row],
+                    min(columns['left_ear'][row], columns['right_ear'][row]), timestamp)
+                face_states['gaze'] = gaze_states
+                events.extend(gaze_states['events'])
+            states[face_id] = face_states
+        return states, events
@@ -1,149 +1,552 @@
-import cv2
-import numpy as np
-import time 
-from utils.config import CAMERA_INDEX
+import time
+from utils.startup import StartupTimer, BackgroundLoader       #first -> its clock starts ~at process start
+from utils.config import CAMERA_INDEX, CAMERA_SOURCE, CAMERA_SOURCES, CAMERA_THREADED, RECORD_PATH, FRAME_LOG_CONFIG, PIPELINE_CONFIG, ROI_CONFIG, FACE_CONFIG, INFERENCE_CONFIG, OVERLAY_CONFIG, METRICS_CONFIG, ACTIONS_CONFIG, GESTURE_BINDINGS, STARTUP_CONFIG, CALIBRATION_CONFIG, FRAME_CONFIG, HAND_CONFIG, LOAD_SHEDDING_CONFIG, POINTER_CONFIG
 from utils.fps_counter import FPSCounter
-from core.webcam import WebCam
-from core.face_mesh_engine import FaceMeshEngine
+from utils.landmark_recording import LandmarkRecorder
+from utils.frame_log import FrameLog
+from utils.metrics import Metrics, MetricsExporter
+from utils.profiles import default_user, load_profile, save_profile
+from utils.load_shedding import LoadShedder, HUD, MESH, DEBUG
+from core.pipeline import Pipeline, FrameJob
+from core.inference_scheduler import AdaptiveInference
+from core.face_tracker import FaceTracker
 from detectors.eye_detector import EyeDetector
 from detectors.head_detector import HeadDetector
+from detectors.mouth_detector import MouthDetector
+from detectors.multi_face import MultiFaceDetectors
+from detectors.hand_detector import HandDetector
+from detectors.gaze_detector import GazeDetector
+from detectors.calibration import Calibrator, apply_profile
+from detectors import features
+from detectors.feature_graph import FrameFeatures
 from actions.keyboard_actions import KeyboardActions
-
-
-def main():
-    try:
-        cam = WebCam(CAMERA_INDEX)
-    except RuntimeError as e:
-        print(e)
+from actions.backends import make_backend
+from actions.gesture_rules import GestureRules
+from actions.pointer import PointerMapper, PointerController
+# cv2, mediapipe (FaceMeshEngine, HandEngine, overlay) and the camera pool are imported where first used, see main()
+# numpy stays an eager import (~100 of the ~120 ms of `import main`): the detectors, frame log, metrics and
+# trackers above all vectorize with it at module level, and cv2 imports it too, so the camera open and the
+# first processed frame need it anyway - deferring it would only move those ms, not save them
+
+
+def detect(landmarks, timestamp, head_detector, eye_detector, mouth_detector, rules, needed, metrics, gaze_detector=None):
+    """
+    runs the detectors in `needed` ('head' / 'eye' / 'mouth' / 'gaze') on one frame's landmarks,
+    collects their gesture events (timed by the frame's capture timestamp) and dispatches the bound actions
+    -> dict of states for the overlay, 'events' -> GestureEvents of this frame
+    all detectors read one FrameFeatures, so eye points / EAR / corners shared between them are computed once
+    """
+    states = {}
+    events = []
+    frame = FrameFeatures(landmarks)
+
+    # ── Head pose & movements ──
+    if 'head' in needed:
+        with metrics.timer('head'):
+            pose = head_detector.process(frame, timestamp)
+        states['pose'] = pose
+        events.extend(pose['events'])
+
+    # ── Eye wink and eyebrow ──
+    if 'eye' in needed:
+        with metrics.timer('eye'):
+            eye_states = eye_detector.process(frame, timestamp)
+        states['eye'] = eye_states
+        events.extend(eye_states['events'])
+
+    # ── Mouth ──
+    if 'mouth' in needed:
+        with metrics.timer('mouth'):
+            mouth_states = mouth_detector.process(frame, timestamp)
+        states['mouth'] = mouth_states
+        events.extend(mouth_states['events'])
+
+    # ── Gaze dwell ──
+    if 'gaze' in needed and gaze_detector is not None:
+        with metrics.timer('gaze'):
+            gaze_states = gaze_detector.process(frame, timestamp)
+        states['gaze'] = gaze_states
+        events.extend(gaze_states['events'])
+
+    with metrics.timer('actions'):
+        rules.dispatch(events)
+
+    states['events'] = events
+    return states
+
+
+def detect_faces(faces, timestamp, tracker, face_detectors, rules, metrics):
+    """
+    multi-face variant of detect(): faces (F, N, 3) or None -> every face keeps its own detector state.
+    states: 'faces' -> face_id -> per-face states, 'events' -> GestureEvents of all faces (carrying face_id),
+    plus the lowest visible ID's states at the top level for the HUD
+    """
+    with metrics.timer('tracking'):
+        face_ids = tracker.update(faces, timestamp)
+        face_detectors.forget(tracker.lost)
+    with metrics.timer('detectors'):
+        face_states, events = face_detectors.process(faces, face_ids, timestamp)
+    metrics.gauge('faces', len(face_ids))
+
+    with metrics.timer('actions'):
+        rules.dispatch(events)
+
+    states = dict(face_states[min(face_states)]) if face_states else {}
+    states['faces'] = face_states
+    states['face_ids'] = face_ids
+    states['face_boxes'] = [] if faces is None else list(zip(*(a.tolist() for a in tracker.boxes(faces))))
+    states['events'] = events
+    return states
+
+
+def draw_face_labels(renderer, states, shape):
+    """queues the tracked face ID above each face"""
+    h, w = shape[:2]
+    for face_id, ((x, y), size) in zip(states['face_ids'].tolist(), states['face_boxes']):
+        renderer.text(f"#{face_id}", (int(x * w), int((y - size * 0.6) * h)), 0.8, (0, 255, 255), 2)
+
+
+def draw_overlay(renderer, states):
+    """queues the debug/tuning text for one frame's detector states on the renderer HUD"""
+    pose, eye_states, mouth_states = states['pose'], states['eye'], states['mouth']
+
+    #show real time direction on camera window
+    renderer.text(f"Head: {pose['direction']} ",(10, 90), 0.8, (255, 0, 255), 2)
+
+    # Show real time pitch, yaw and roll on camera window for debugging/tuning
+    renderer.text(f"Pitch: {pose['pitch']:.2f}  Yaw: {pose['yaw']:.2f} Roll: {pose['roll']:.2f}",(10, 150), 0.7, (255, 165, 0), 2)
+
+    #show real time EAR for left and right eye for fine tuning and debugging
+    renderer.text(f"L EAR: {eye_states['left_ear']:.2f}  R EAR: {eye_states['right_ear']:.2f}",(10, 120), 0.6, (255, 255, 0), 2)
+
+    # Eyebrow raise display for fine tuning
+    renderer.text(f"Brow dist: {eye_states['brow_distance']:.3f}",(10, 200), 0.6, (255, 165, 0), 2)
+
+    if eye_states["both_blink"]:
+        renderer.text("NATURAL BLINK (ignored)",(10, 180), 0.8, (0, 255, 0), 2)
+    elif eye_states["left_wink"]:
+        renderer.text("LEFT WINK!",(10, 180), 1, (0, 0, 255), 3)
+    elif eye_states["right_wink"]:
+        renderer.text("RIGHT WINK!",(10, 180), 1, (0, 255, 255), 3)
+
+    if eye_states["eyebrow_raised_3sec"]:
+        renderer.text("EYEBROWS RAISED 3s → ACTION!",(10, 240), 1, (255, 0, 255), 3)
+
+    if eye_states.get("eyebrow_triggered", False):
+        renderer.text("LOCK TRIGGERED!",(10, 280), 1, (0, 255, 255), 3)
+
+    #for debugging and fine tuning smiling
+    renderer.text(f"Mouth Ratio: {mouth_states['mouth_ratio']:.2f}", (10, 280), 0.6, (50, 255, 255), 2)
+
+    renderer.text(f"Corner Raised: {mouth_states['corners_raised']:.4f}", (10, 310), 0.6, (50, 255, 255), 2)
+
+    if mouth_states['smile_triggered']:
+        renderer.text(f"SMILE DETECTED", (10, 350), 0.6, (255, 165, 0), 2)
+
+    # The VISUAL (Stays on screen while you are smiling)
+    if mouth_states['is_smiling']:
+        renderer.text("SMILING", (10, 360), 0.8, (0, 255, 0), 2)
+
+    gaze_states = states.get('gaze')
+    if gaze_states is not None and gaze_states['zone'] is not None:
+        renderer.text(f"Gaze: {gaze_states['zone']} {gaze_states['dwell']:.0%}  "
+                      f"({gaze_states['gaze_x']:.2f}, {gaze_states['gaze_y']:.2f})", (10, 60), 0.6, (0, 255, 255), 2)
+
+
+def draw_hand_overlay(renderer, hand_states):
+    """queues finger count / pinch distance per visible hand"""
+    for row, (label, fingers) in enumerate(sorted(hand_states['fingers'].items())):
+        renderer.text(f"{label} hand: {fingers} fingers  pinch {hand_states['pinch'][label]:.2f}",
+                      (10, 400 + 30 * row), 0.6, (0, 200, 0), 2)
+
+
+def run_cameras(sources):
+    """
+    multi-camera mode: one worker process per source (capture, FaceMesh, detectors),
+    this process only merges their gesture events, runs the bound actions and shows the windows
+    """
+    import cv2
+    from core.camera_pool import CameraSupervisor
+    from ui.overlay_renderer import OverlayRenderer
+
+    keyboard_action = KeyboardActions(backend=make_backend(ACTIONS_CONFIG['BACKEND']))
+    rules = GestureRules(GESTURE_BINDINGS, keyboard_action)
+    needed = set(rules.detectors)
+    if 'hand' in needed and not HAND_CONFIG['ENABLED']:
+        needed.discard('hand')
+        print("Hand gesture bindings ignored: set HAND_CONFIG['ENABLED'] to run the hand model")
+    supervisor = CameraSupervisor(sources, {
+        'roi': ROI_CONFIG['ENABLED'], 'roi_size': ROI_CONFIG['SIZE'], 'roi_padding': ROI_CONFIG['PADDING'],
+        'needed': sorted(needed),
+        'hands': {'max_hands': HAND_CONFIG['MAX_HANDS'], 'mode': HAND_CONFIG['MODE'],
+                  'cpu_budget': HAND_CONFIG['CPU_BUDGET']},
+    })
+    cameras = supervisor.start()
+    if not cameras:
+        supervisor.stop()
+        keyboard_action.close()
         return
-    
-    # ────────────── Initialize components ────────────>start
-    fps_counter = FPSCounter()
-    mesh_engine = FaceMeshEngine()
-    eye_detector = EyeDetector()
-    head_detector = HeadDetector()
-    keyboard_action = KeyboardActions()
-    # ────────────── Initialize components ────────────>end
+    fps_counters = {camera: FPSCounter() for camera in cameras}
+    renderers = {camera: OverlayRenderer(OVERLAY_CONFIG['LEVEL'], OVERLAY_CONFIG['DISPLAY_FPS']) for camera in cameras}
 
     print("Press 'q' to quit!")
-
-    while True:
-        frame = cam.read_frame()
-        if frame is None:
-            print('Failed to grab frame!')
+    while supervisor.alive:
+        for camera, event in supervisor.poll():
+            print(f"Camera {camera}: {event.type}")
+            rules.dispatch((event,))
+
+        key = None
+        for camera in cameras:
+            packet = supervisor.read(camera)
+            if packet is None:
+                continue
+            fps_counters[camera].update()
+            renderer = renderers[camera]
+            if not renderer.due():
+                continue
+            _, _, image, landmarks = packet
+            renderer.text(f"Cam {camera}  {fps_counters[camera].get_text()}", (10, 30), 1, (0, 255, 0), 2)
+            cv2.imshow(f"Iris-OS - Camera {camera}", renderer.render(image, landmarks))
+            key = cv2.waitKey(1) & 0xFF
+        if key is None:
+            time.sleep(0.002)             #nothing new from any camera
+        elif key == ord('q'):
             break
 
-        frame = cv2.flip(frame, 1)        #Mirror camera for natural view
-
-        # ────── Face Mesh Processing to get landmarks (468 pts. on face) ─────
-        results = mesh_engine.process(frame)
-        frame = mesh_engine.draw_mesh(frame, results)
-
-        if results.multi_face_landmarks:
-            landmarks = mesh_engine.get_landmarks(results)
-
-            # ──────────────────────────────────────────────────────────────── Head pose & movements ────────────────────────────────────────────────────────────>start
-            pose = head_detector.update(landmarks)
-            current_pitch = pose['pitch']
-            current_yaw = pose['yaw']
-            current_roll = pose['roll']
-            direction = pose['direction']
-
-            # ──────────Action based on the Head turn left or right ─────>start
-            turn = head_detector.detect_single_turn(current_yaw)
-            if turn == 'right':
-                #action if head turns right
-                pass
-            elif turn == 'left':
-                #action if head turns left
-                pass
-            # ──────────Action based on the Head turn left or right ─────>end
-
-            #show real time direction on camera window
-            cv2.putText(frame, f"Head: {direction} ",(10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 255), 2)
-
-            # Show real time pitch, yaw and roll on camera window for debugging/tuning  
-            cv2.putText(frame, f"Pitch: {current_pitch:.2f}  Yaw: {current_yaw:.2f} Roll: {current_roll:.2f}",(10, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
-
-
-            # ──────────────────────────────────────────────────────────────── Head pose & movements ────────────────────────────────────────────────────────────>end
-
-
-            # ─────────────────────────────────────────────────────  Eye Wink and EyeBrow Detection  ────────────────────────────────────────────────────────────>start
-            # ── Eye detection ──
-            eye_states = eye_detector.process(landmarks)
-
-            #show real time EAR for left and right eye for fine tuning and debugging
-            cv2.putText(frame, f"L EAR: {eye_states['left_ear']:.2f}  R EAR: {eye_states['right_ear']:.2f}",(10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-
-            # Eyebrow raise display for fine tuning
-            cv2.putText(frame, f"Brow dist: {eye_states['brow_distance']:.3f}",(10, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 165, 0), 2)
-
-            # ─────────────────────────────Action based on the Eye wink and EyeBrow raise ─────────────────────────────────────>start
-            if eye_states["both_blink"]:
-                cv2.putText(frame, "NATURAL BLINK (ignored)",(10, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-                #no action here, its for both eye natural blink, so it's ignored
-                pass
+    supervisor.stop()
+    keyboard_action.close()
+    cv2.destroyAllWindows()
+    print(f"Frames processed per camera: {supervisor.processed}")
 
-            elif eye_states["left_wink"]:
-                cv2.putText(frame, "LEFT WINK!",(10, 180), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
-                # Add action here if needed
-                pass
 
-            elif eye_states["right_wink"]:
-                cv2.putText(frame, "RIGHT WINK!",(10, 180), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 3)
-                # Add action here if needed
-                pass
+def main():
+    if CAMERA_SOURCES:
+        run_cameras(CAMERA_SOURCES)
+        return
 
-            if eye_states["eyebrow_raised_3sec"]:
-                cv2.putText(frame, "EYEBROWS RAISED 3s → ACTION!",(10, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 255), 3)
-                pass
+    timer = StartupTimer()
+    timer.mark('main() entered')
+    metrics = Metrics(window=METRICS_CONFIG['WINDOW'], enabled=METRICS_CONFIG['ENABLED'])
+    multi_face = FACE_CONFIG['MAX_FACES'] > 1
+    buffer_pool = FRAME_CONFIG['BUFFER_POOL']     #mirror landmarks, not images
+
+    use_hands = HAND_CONFIG['ENABLED']
+
+    # ── model import + graph build runs while the camera opens (both mostly outside the GIL) ──
+    def load_engine():
+        with timer.phase('model import'):
+            from core.face_mesh_engine import FaceMeshEngine
+        with timer.phase('model build'):
+            engine = FaceMeshEngine(max_faces=FACE_CONFIG['MAX_FACES'], roi=ROI_CONFIG['ENABLED'], roi_size=ROI_CONFIG['SIZE'],
+                                    roi_padding=ROI_CONFIG['PADDING'], mirror=buffer_pool, metrics=metrics)
+        hand_scheduler = None
+        if use_hands:
+            with timer.phase('hand model build'):
+                from core.hand_engine import HandEngine
+                from core.hand_scheduler import HandScheduler
+                hand_engine = HandEngine(max_hands=HAND_CONFIG['MAX_HANDS'], mirror=buffer_pool, metrics=metrics)
+                hand_scheduler = HandScheduler(hand_engine, mode=HAND_CONFIG['MODE'],
+                                               cpu_budget=HAND_CONFIG['CPU_BUDGET'], metrics=metrics)
+        return engine, hand_scheduler
+    loader = BackgroundLoader(load_engine, name='ModelLoader')
+    if not STARTUP_CONFIG['BACKGROUND_MODEL_LOAD']:
+        loader.result()
 
-            # One-shot eyebrow trigger (if you added it)
-            if eye_states.get("eyebrow_triggered", False):
-                cv2.putText(frame, "LOCK TRIGGERED!",(10, 280), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 3)
-                # kb.lock_windows()  # or your lock function
-                pass
+    try:
+        with timer.phase('camera open'):
+            import cv2
+            from core.webcam import WebCam
+            source = CAMERA_INDEX if CAMERA_SOURCE is None else CAMERA_SOURCE
+            cam = WebCam(source, threaded=CAMERA_THREADED)
+    except RuntimeError as e:
+        print(e)
+        return
 
-            # ─────────────────────────────Action based on the Eye wink and EyeBrow raise ─────────────────────────────────────>start
-            # ─────────────────────────────────────────────────────  Eye Wink and EyeBrow Detection  ────────────────────────────────────────────────────────────>end
-            
-            
-            # ─────────────────────────────────────────────────────  Mouth Detection and Action Logic  ────────────────────────────────────────────────────────────>start
-            mouth_states = mouth_detector.process(landmarks)
+    # ────────────── Initialize components ────────────>start
+    with timer.phase('components'):
+        from ui.overlay_renderer import OverlayRenderer
+        fps_counter = FPSCounter()
+        exporter = MetricsExporter(metrics, METRICS_CONFIG['JSONL_PATH'], METRICS_CONFIG['PROMETHEUS_PATH'],
+                                   interval=METRICS_CONFIG['EXPORT_INTERVAL'])
+        renderer = OverlayRenderer(OVERLAY_CONFIG['LEVEL'], OVERLAY_CONFIG['DISPLAY_FPS'])
+        eye_detector = EyeDetector()
+        head_detector = HeadDetector()
+        mouth_detector = MouthDetector()
+        gaze_detector = GazeDetector()
+        hand_detector = HandDetector() if use_hands else None
+        keyboard_action = KeyboardActions(backend=make_backend(ACTIONS_CONFIG['BACKEND']), metrics=metrics)
+        keyboard_action.warm_up()                  #backend import happens on the action worker
+        rules = GestureRules(GESTURE_BINDINGS, keyboard_action)
+        shedder = LoadShedder(LOAD_SHEDDING_CONFIG['BUDGET_MS'] / 1000, headroom=LOAD_SHEDDING_CONFIG['HEADROOM'],
+                              restore_frames=LOAD_SHEDDING_CONFIG['RESTORE_FRAMES'],
+                              enabled=LOAD_SHEDDING_CONFIG['ENABLED'])
+
+        pointer = None
+        if POINTER_CONFIG['ENABLED']:
+            pointer_mapper = PointerMapper(POINTER_CONFIG['SOURCE'], gain=POINTER_CONFIG['GAIN'])
+            pointer = PointerController(keyboard_action.backend, rate=POINTER_CONFIG['RATE_HZ'],
+                                        max_predict=POINTER_CONFIG['MAX_PREDICT_MS'] / 1000,
+                                        smoothing=POINTER_CONFIG['SMOOTHING_MS'] / 1000)
+            pointer.start()
+
+        #detectors only run when a binding needs them, or when the HUD shows their values
+        needed = {'head', 'eye', 'mouth', 'gaze'} if renderer.shows_hud else set(rules.detectors)
+        if multi_face:
+            tracker = FaceTracker(max_distance=FACE_CONFIG['MATCH_DISTANCE'], max_age=FACE_CONFIG['MAX_AGE'])
+            face_detectors = MultiFaceDetectors(needed)
+
+        #per-user thresholds: saved profile, or calibrate on a neutral face first (single face only)
+        calibrator = None
+        profile_user = CALIBRATION_CONFIG['USER'] or default_user()
+        if CALIBRATION_CONFIG['ENABLED'] and not multi_face:
+            profile = None
+            if not CALIBRATION_CONFIG['RECALIBRATE']:
+                profile = load_profile(CALIBRATION_CONFIG['PROFILE_DIR'], profile_user, source)
+            if profile is not None:
+                apply_profile(profile, eye_detector, head_detector, mouth_detector, gaze_detector)
+                print(f"Loaded calibration profile for {profile_user} @ camera {source}")
+            else:
+                calibrator = Calibrator(duration=CALIBRATION_CONFIG['DURATION'])
+
+    # ── live camera: show frames right away while the model is still warming up ──
+    quit_requested = False
+    while not loader.ready and not cam.is_file:
+        packet = cam.read()
+        if packet is None:
+            continue
+        timer.mark('first frame shown')
+        renderer.text("Loading face model...", (10, 30), 1, (0, 255, 255), 2)
+        cv2.imshow("Iris-OS - Webcam", renderer.render(packet.image, None, mirror=True))
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            quit_requested = True
+            break
 
-            #for debugging and fine tuning smiling 
-            cv2.putText(frame, f"Mouth Ratio: {mouth_states['mouth_ratio']:.2f}", (10, 280), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (50, 255, 255), 2)
+    with timer.phase('wait for model'):
+        mesh_engine, hand_scheduler = loader.result()
 
-            cv2.putText(frame, f"Corner Raised: {mouth_states['corners_raised']:.4f}", (10, 310), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (50, 255, 255), 2)
+    recorder = LandmarkRecorder(RECORD_PATH, mesh_engine.num_landmarks) if RECORD_PATH else None
+    frame_log = FrameLog(FRAME_LOG_CONFIG['PATH'], FRAME_LOG_CONFIG['CAPACITY']) if FRAME_LOG_CONFIG['ENABLED'] else None
+    scheduler = None
+    if INFERENCE_CONFIG['ADAPTIVE'] and not multi_face:       #landmark prediction is single-face only
+        scheduler = AdaptiveInference(mesh_engine, max_interval=INFERENCE_CONFIG['MAX_INTERVAL'],
+                                      still_speed=INFERENCE_CONFIG['STILL_SPEED'],
+                                      moving_speed=INFERENCE_CONFIG['MOVING_SPEED'])
+    # ────────────── Initialize components ────────────>end
 
-            # One-shot Action to be performed on smiling
-            if mouth_states['smile_triggered']:
-                cv2.putText(frame, f"SMILE DETECTED", (10, 350), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 165, 0), 2)
-                print('Smile Detected')
-                # kb.copy()
+    # ────────────── Frame stages (shared by the serial loop and the pipeline) ────────────>start
+    def inference_stage(job):
+        if not buffer_pool:
+            with metrics.timer('mirror'):
+                job.image = cv2.flip(job.image, 1)        #Mirror camera for natural view
+
+        #one BGR -> RGB conversion per frame, shared by the face and the hand model
+        rgb = None
+        if hand_scheduler is not None:
+            with metrics.timer('color'):
+                rgb = hand_scheduler.prepare(job.image)
+        face_start = time.perf_counter()
+
+        # ────── Face Mesh Processing to get landmarks (468 pts. on face + 10 iris pts.) ─────
+        if scheduler is not None:
+            job.results, landmarks, _ = scheduler.step(job.image, job.timestamp, rgb=rgb)
+        else:
+            job.results = mesh_engine.process(job.image, rgb=rgb)
+            with metrics.timer('landmarks'):
+                if multi_face:
+                    landmarks = mesh_engine.get_all_landmarks(job.results)     #(F, N, 3)
+                else:
+                    landmarks = mesh_engine.get_landmarks(job.results)
+        #engine reuses its landmark buffer -> copy when the next frame may be inferred concurrently
+        if landmarks is not None and pipeline is not None:
+            landmarks = landmarks.copy()
+        job.landmarks = landmarks
+
+        # ────── Hands: every K-th frame (interleave) or the newest frame the hand thread is free for ─────
+        if hand_scheduler is not None:
+            with metrics.timer('hands'):
+                job.hands = hand_scheduler.step(rgb, job.timestamp, time.perf_counter() - face_start)
+
+        if recorder is not None:
+            recorder.write(landmarks[0] if multi_face and landmarks is not None else landmarks, job.timestamp)
+        return job
+
+    def detection_stage(job):
+        nonlocal calibrator
+        if calibrator is not None:
+            if job.landmarks is not None and calibrator.update(features.extract_features(job.landmarks), job.timestamp):
+                profile = calibrator.profile()
+                apply_profile(profile, eye_detector, head_detector, mouth_detector, gaze_detector)
+                path = save_profile(CALIBRATION_CONFIG['PROFILE_DIR'], profile_user, source, profile)
+                print(f"Calibration done, profile saved to {path}")
+                calibrator = None
+            else:
+                job.states = {'calibrating': calibrator.remaining(job.timestamp)}   #no actions meanwhile
+            return job
+
+        hand_states = None
+        if job.hands is not None:
+            with metrics.timer('hand'):
+                hand_states = hand_detector.process(job.hands.landmarks, job.hands.handedness, job.hands.timestamp)
+            with metrics.timer('actions'):
+                rules.dispatch(hand_states['events'])
+
+        # ── pointer target (the cursor thread moves towards it at its own rate) ──
+        if pointer is not None:
+            if pointer_mapper.source == 'index':
+                if job.hands is not None and len(job.hands.landmarks):
+                    pointer.update(*pointer_mapper.map(job.hands.landmarks[0]), job.hands.timestamp)
+            elif job.landmarks is not None:
+                face = job.landmarks[0] if multi_face else job.landmarks
+                if len(face):
+                    pointer.update(*pointer_mapper.map(face), job.timestamp)
+
+        #debug prints are the first thing to go when the frame is late (counted as shed only when one was due)
+        if 'eye' in needed:
+            debug = shedder.allows(DEBUG, job.timestamp, count=False)
+            if multi_face:
+                face_detectors.debug = debug
+            else:
+                eye_detector.debug = debug
+
+        if multi_face:
+            job.states = detect_faces(job.landmarks, job.timestamp, tracker, face_detectors, rules, metrics)
+        elif job.landmarks is not None:
+            job.states = states = detect(job.landmarks, job.timestamp, head_detector, eye_detector, mouth_detector,
+                                         rules, needed, metrics, gaze_detector)
+
+            #close to a trigger -> next frame must use real landmarks, not a prediction
+            margin = INFERENCE_CONFIG['NEAR_MARGIN']
+            if scheduler is not None and (
+                    ('eye' in states and eye_detector.near_threshold(states['eye'], margin)) or
+                    ('mouth' in states and mouth_detector.near_threshold(states['mouth'], margin)) or
+                    ('pose' in states and head_detector.near_threshold(states['pose'], margin))):
+                scheduler.request_inference()
+        if 'eye' in needed and not debug and job.landmarks is not None and (
+                face_detectors.debug_skipped if multi_face else eye_detector.debug_skipped):
+            shedder.skip(DEBUG)
+        if hand_states is not None:
+            if job.states is None:
+                job.states = {'events': []}
+            job.states['hand'] = hand_states
+            job.states['events'] = job.states['events'] + hand_states['events']
+        return job
+    # ────────────── Frame stages (shared by the serial loop and the pipeline) ────────────>end
+
+    pipeline = None
+    if PIPELINE_CONFIG['ENABLED']:
+        pipeline = Pipeline(cam, [('inference', inference_stage), ('detection', detection_stage)],
+                            queue_size=PIPELINE_CONFIG['QUEUE_SIZE'])
+        pipeline.start()
 
-            # The VISUAL (Stays on screen while you are smiling)
-            if mouth_states['is_smiling']:
-                cv2.putText(frame, "SMILING", (10, 360), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-    
-            
-            # ─────────────────────────────────────────────────────  Mouth Detection and Action Logic  ────────────────────────────────────────────────────────────>end
-            
+    print("Press 'q' to quit!")
 
-        # ── Display FPS on cam window ──
-        cv2.putText(frame, fps_counter.get_text(),(10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+    shown_hands = None
+    while not quit_requested:
+        if pipeline is not None:
+            job = pipeline.get()
+            if job is None:
+                if pipeline.finished:
+                    print('Failed to grab frame!')
+                    break
+                continue
+        else:
+            with metrics.timer('capture'):
+                packet = cam.read()
+            if packet is None:
+                print('Failed to grab frame!')
+                break
+            job = detection_stage(inference_stage(FrameJob(packet.seq, packet.timestamp, packet.image)))
+
+        if 'first processed frame' not in timer.marks:
+            timer.mark('first processed frame')
+            if STARTUP_CONFIG['PRINT_TIMING']:
+                timer.report()
+
+        fps_counter.update()
+        now = time.perf_counter()
+        metrics.observe('frame_latency', now - job.timestamp)    #capture -> decision
+        metrics.count('frames')
+        if frame_log is not None:
+            frame_log.write(job.timestamp, job.states, now)
+        if METRICS_CONFIG['ENABLED']:
+            metrics.gauge('fps', fps_counter.fps)
+            metrics.set_counter('dropped_capture', cam.dropped_frames)
+            metrics.gauge('shed_level', shedder.level)
+            for tier, shed in shedder.report().items():
+                metrics.set_counter(f'shed_{tier}', shed)
+            if pipeline is not None:
+                for stage, dropped in pipeline.dropped().items():
+                    metrics.set_counter(f'dropped_{stage}', dropped)
+            exporter.maybe_export()
+
+        if job.hands is not None:
+            shown_hands = job.hands.landmarks             #hand model doesn't run every frame, keep the last skeleton
+
+        # ── Rendering stage (at display rate, not on every processed frame) ──
+        if not renderer.due():
+            shedder.end(job.timestamp)
+            continue
+        with metrics.timer('draw'):
+            #optional tiers only while the frame is within its deadline (and the shedder hasn't dropped them)
+            if shedder.allows(HUD, job.timestamp):
+                if job.states is not None and 'calibrating' in job.states:
+                    renderer.text(f"Calibrating - keep a neutral face ({job.states['calibrating']:.1f}s)",
+                                  (10, 90), 0.8, (0, 255, 255), 2)
+                elif job.states is not None and renderer.shows_hud:
+                    if multi_face:
+                        draw_face_labels(renderer, job.states, job.image.shape)
+                    if 'pose' in job.states:
+                        draw_overlay(renderer, job.states)
+                    if 'hand' in job.states:
+                        draw_hand_overlay(renderer, job.states['hand'])
+
+                # ── Display FPS on cam window ──
+                renderer.text(fps_counter.get_text(), (10, 30), 1, (0, 255, 0), 2)
+            if shedder.allows(MESH, job.timestamp):
+                frame = renderer.render(job.image, job.landmarks, mirror=buffer_pool, hands=shown_hands)
+            else:
+                frame = renderer.render(job.image, None, mirror=buffer_pool)
 
         # Show the camera window
-        cv2.imshow("Iris-OS - Webcam", frame)
+        with metrics.timer('display'):
+            cv2.imshow("Iris-OS - Webcam", frame)
+            key = cv2.waitKey(1) & 0xFF
 
-        if cv2.waitKey(1) & 0xFF == ord('q'):
+        shedder.end(job.timestamp)
+        if key == ord('q'):
             break
 
     # Cleanup
+    if METRICS_CONFIG['ENABLED']:
+        exporter.export()
+    if pipeline is not None:
+        pipeline.stop()
+        print(f"Pipeline frames dropped per stage: {pipeline.dropped()}")
+    if LOAD_SHEDDING_CONFIG['ENABLED']:
+        print(f"Frames over the {shedder.budget * 1000:.0f}ms budget: {shedder.late_frames}/{shedder.frames}  "
+              f"shed per tier: {shedder.report()}")
+    if scheduler is not None:
+        print(f"Model ran on {scheduler.inference_ratio:.0%} of frames")
+    if pointer is not None:
+        pointer.stop()
+        stats = pointer.stats()
+        print(f"Pointer: {stats['moves']} moves from {stats['samples']} samples, tick {stats['tick_ms']:.2f}"
+              f"±{stats['jitter_ms']:.2f}ms, capture->move {stats['latency_ms']:.1f}ms (p95 {stats['latency_p95_ms']:.1f})")
+    if hand_scheduler is not None:
+        hand_scheduler.stop()
+        print(f"Hand model ran on {hand_scheduler.run_ratio:.0%} of frames ({hand_scheduler.mode})")
+    if recorder is not None:
+        recorder.close()
+        print(f"Recorded {recorder.frames} frames to {RECORD_PATH}")
+    if frame_log is not None:
+        frame_log.close()
+        print(f"Frame log: {frame_log.frames - frame_log.start} frames this session, last "
+              f"{min(frame_log.frames, frame_log.capacity)} kept in {FRAME_LOG_CONFIG['PATH']}")
+    keyboard_action.close()
     cam.release()
     cv2.destroyAllWindows()
+    print(f"Frames captured: {cam.seq}  dropped (stale): {cam.dropped_frames}")
     print("Webcam closed cleanly.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,37 @@
+import sys
+import threading
+import unittest
+
+from utils.metrics import Metrics
+
+
+class MetricsThreadsTest(unittest.TestCase):
+    def test_no_lost_updates_across_threads(self):
+        metrics = Metrics(window=64)
+        threads, per_thread = 4, 5000
+
+        def work():
+            for _ in range(per_thread):
+                metrics.count('frames')
+                metrics.observe('stage', 0.001)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)       #switch threads as often as possible
+        try:
+            workers = [threading.Thread(target=work) for _ in range(threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['counters']['frames'], threads * per_thread)
+        self.assertEqual(snapshot['stages']['stage']['count'], threads * per_thread)
+        self.assertIn(f'oculink_stage_latency_seconds_count{{stage="stage"}} {threads * per_thread}',
+                      metrics.to_prometheus())
+
+
+if __name__ == '__main__':
+    unittest.main()
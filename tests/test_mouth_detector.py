@@ -0,0 +1,25 @@
+import unittest
+
+from detectors.mouth_detector import MouthDetector
+
+
+class NearThresholdTest(unittest.TestCase):
+    def test_neutral_closed_mouth_does_not_force_inference(self):
+        detector = MouthDetector()
+        for i, ratio in enumerate((27.0, 150.0, 667.0)):
+            states = detector.process_metrics(ratio, 0.0, i / 30)
+            self.assertFalse(detector.near_threshold(states))
+
+    def test_smile_about_to_trigger_forces_inference(self):
+        detector = MouthDetector()
+        states = detector.process_metrics(detector.smile_threshold * 0.95, detector.corner_raise_threshold * 0.95, 0.0)
+        self.assertTrue(detector.near_threshold(states))
+
+    def test_held_smile_forces_inference(self):
+        detector = MouthDetector()
+        states = detector.process_metrics(detector.smile_threshold + 1, detector.corner_raise_threshold * 2, 0.0)
+        self.assertTrue(detector.near_threshold(states))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from collections import namedtuple
+
+from core.pipeline import Pipeline
+
+Packet = namedtuple('Packet', ['seq', 'timestamp', 'image'])
+
+
+class FakeCam:
+    """endless frames, like a live camera"""
+    def __init__(self):
+        self.seq = 0
+
+    def read(self):
+        self.seq += 1
+        return Packet(self.seq, float(self.seq), None)
+
+
+class PipelineErrorTest(unittest.TestCase):
+    def test_stage_exception_reaches_get(self):
+        calls = []
+
+        def detection(job):
+            calls.append(job.seq)
+            if len(calls) == 2:
+                raise ValueError('detector failed')
+            return job
+
+        pipeline = Pipeline(FakeCam(), [('inference', lambda job: job), ('detection', detection)])
+        pipeline.start()
+        try:
+            with self.assertRaises(ValueError):
+                for _ in range(100):          #bounded: a hang fails the test instead of blocking it
+                    pipeline.get(timeout=0.1)
+            self.assertTrue(pipeline.queues[-1].closed)     #the stage thread closed its outbox on the way out
+        finally:
+            pipeline.stop()
+
+    def test_jobs_flow_through_stages(self):
+        pipeline = Pipeline(FakeCam(), [('inference', lambda job: job)])
+        pipeline.start()
+        try:
+            job = pipeline.get(timeout=1.0)
+            self.assertIsNotNone(job)
+            self.assertIsNone(pipeline.error)
+        finally:
+            pipeline.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Allocation benchmark of the per-frame path (mirror -> colour conversion -> FaceMesh -> landmarks -> overlay),
+legacy mode (flip every frame, new images everywhere) vs buffer-pool mode (utils.config FRAME_CONFIG).
+
+Bytes are counted with tracemalloc (numpy / OpenCV output arrays go through it): for every frame the
+peak of new allocations above the memory already held is recorded, plus the frame time.
+
+usage:  python -m tools.alloc_bench [--video clip.mp4] [--frames 200] [--size 1920x1080] [--level full]
+without --video, a synthetic frame of the given size is used (no face -> measures the image path only)
+"""
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from core.face_mesh_engine import FaceMeshEngine
+from ui.overlay_renderer import OverlayRenderer
+
+
+def load_frames(video, count, size):
+    """up to `count` BGR frames from a video, or one synthetic frame repeated"""
+    if video is None:
+        w, h = size
+        rng = np.random.default_rng(0)
+        frame = cv2.GaussianBlur(rng.integers(0, 255, (h, w, 3), dtype=np.uint8), (0, 0), 5)
+        return [frame] * count
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"No frames read from {video}")
+    return frames
+
+
+def run(frames, buffer_pool, level):
+    """one pass over the frames -> (bytes allocated per frame, seconds per frame) arrays"""
+    engine = FaceMeshEngine(mirror=buffer_pool)
+    renderer = OverlayRenderer(level, display_fps=0)
+    engine.get_landmarks(engine.process(frames[0]))      #warm-up: graph + lazily built buffers
+
+    allocated = np.zeros(len(frames), dtype=np.int64)
+    seconds = np.zeros(len(frames))
+    tracemalloc.start()
+    for i, image in enumerate(frames):
+        tracemalloc.reset_peak()
+        held, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+
+        if not buffer_pool:
+            image = cv2.flip(image, 1)
+        landmarks = engine.get_landmarks(engine.process(image))
+        if buffer_pool:
+            renderer.render(image, landmarks, mirror=True)
+        else:
+            renderer.render(image, landmarks)
+
+        seconds[i] = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        allocated[i] = peak - held
+        del image
+    tracemalloc.stop()
+    return allocated, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame allocation benchmark, legacy vs buffer-pool frame path")
+    parser.add_argument('--video', help="video file to take frames from (default: synthetic frame)")
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--size', default='1920x1080', help="synthetic frame size WxH")
+    parser.add_argument('--level', default='full', help="overlay level drawn on every frame")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+    frames = load_frames(args.video, args.frames, size)
+    h, w = frames[0].shape[:2]
+    fps = 30
+    print(f"{len(frames)} frames of {w}x{h}\n")
+    print(f"{'mode':<13}{'KB/frame':>10}{'MB/s @30fps':>13}{'ms/frame':>10}{'p95 ms':>8}{'std ms':>8}")
+    for name, buffer_pool in (('legacy', False), ('buffer pool', True)):
+        allocated, seconds = run(frames, buffer_pool, args.level)
+        ms = seconds * 1000
+        print(f"{name:<13}{allocated.mean() / 1024:>10.0f}{allocated.mean() * fps / 1e6:>13.1f}"
+              f"{ms.mean():>10.2f}{np.percentile(ms, 95):>8.2f}{ms.std():>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
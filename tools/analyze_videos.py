@@ -0,0 +1,198 @@
+"""
+Offline gesture analytics over recorded videos, parallel across cores.
+
+Every video is cut into chunks of --chunk-seconds; chunks run on a process pool
+(FaceMeshEngine + all detectors, one engine per chunk, OpenCV single-threaded per worker)
+so throughput grows ~linearly with cores. Each chunk also decodes --warmup seconds before its start
+(not reported) so holds / cooldowns that straddle a chunk border behave like in one continuous run.
+
+Output per video, columnar:
+    <out>/<name>.frames.parquet   frame, timestamp, has_face + every detectors.features metric
+    <out>/<name>.events.parquet   frame, timestamp, type, value
+(.npz with the same columns when pyarrow isn't installed)
+
+usage:  python -m tools.analyze_videos session1.mp4 session2.mp4 [--out analytics] [--workers 8]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from detectors.features import FEATURE_NAMES
+
+
+def plan_chunks(videos, chunk_seconds):
+    """-> list of (video, start frame, end frame, fps) covering every video"""
+    import cv2
+    chunks = []
+    for video in videos:
+        cap = cv2.VideoCapture(video)
+        if not cap.isOpened():
+            print(f"Skipping {video}: cannot open")
+            continue
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        cap.release()
+        step = max(int(chunk_seconds * fps), 1)
+        for start in range(0, frames, step):
+            chunks.append((video, start, min(start + step, frames), fps))
+    return chunks
+
+
+def _init_worker():
+    import cv2
+    cv2.setNumThreads(1)                  #one core per worker, the pool provides the parallelism
+
+
+def analyze_chunk(chunk, warmup_seconds=2.0):
+    """
+    worker: runs one chunk -> (video, start, columns dict, events list of (frame, timestamp, type, value), cpu seconds)
+    timestamps are video time (frame / fps), so results don't depend on how fast this ran
+    """
+    import cv2
+    from core.face_mesh_engine import FaceMeshEngine
+    from detectors import features
+    from detectors.eye_detector import EyeDetector
+    from detectors.head_detector import HeadDetector
+    from detectors.mouth_detector import MouthDetector
+    from detectors.gaze_detector import GazeDetector
+
+    video, start, end, fps = chunk
+    cpu_start = time.process_time()
+    first = max(start - int(warmup_seconds * fps), 0)
+
+    cap = cv2.VideoCapture(video)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+    engine = FaceMeshEngine(mirror=True)               #same selfie orientation as the live app
+
+    count = end - first
+    landmarks = np.zeros((count, engine.num_landmarks, 3), dtype=np.float32)
+    has_face = np.zeros(count, dtype=bool)
+    decoded = 0
+    while decoded < count:
+        ret, image = cap.read()
+        if not ret:
+            break
+        points = engine.get_landmarks(engine.process(image))
+        if points is not None:
+            landmarks[decoded] = points
+            has_face[decoded] = True
+        decoded += 1
+    cap.release()
+    landmarks, has_face = landmarks[:decoded], has_face[:decoded]
+
+    #every metric of every frame with a face in one vectorized pass (zero-filled faceless rows would only
+    #divide by zero), scattered back per frame with NaN elsewhere; detectors then only update their state
+    found_metrics = features.extract_features(landmarks[has_face])
+    metrics = {}
+    for name in FEATURE_NAMES:
+        metrics[name] = np.full(decoded, np.nan, dtype=np.float32)
+        metrics[name][has_face] = found_metrics[name]
+    rows = {name: metrics[name].tolist() for name in FEATURE_NAMES}
+    eye_detector, head_detector, mouth_detector = EyeDetector(debug=False), HeadDetector(), MouthDetector()
+    gaze_detector = GazeDetector()
+    events = []
+    for i in np.flatnonzero(has_face).tolist():
+        frame = first + i
+        timestamp = frame / fps
+        found = head_detector.process_pose(head_detector.pose(rows['yaw'][i], rows['pitch'][i], rows['roll'][i]),
+                                           timestamp)['events']
+        found += eye_detector.process_metrics(rows['left_ear'][i], rows['right_ear'][i],
+                                              rows['brow_distance'][i], timestamp)['events']
+        found += mouth_detector.process_metrics(rows['mouth_ratio'][i], rows['corners_raised'][i],
+                                                timestamp)['events']
+        found += gaze_detector.process_metrics(rows['gaze_x'][i], rows['gaze_y'][i],
+                                               min(rows['left_ear'][i], rows['right_ear'][i]), timestamp)['events']
+        if frame >= start:                             #warm-up frames only prime the detectors
+            events += [(frame, event.timestamp, event.type, event.value) for event in found]
+
+    keep = slice(start - first, None)
+    frames = np.arange(first, first + decoded, dtype=np.int64)[keep]
+    columns = {'frame': frames, 'timestamp': frames / fps, 'has_face': has_face[keep]}
+    for name in FEATURE_NAMES:
+        columns[name] = metrics[name][keep]
+    return video, start, columns, events, time.process_time() - cpu_start
+
+
+def write_table(path, columns, fmt):
+    """columns: name -> 1-D array; parquet via pyarrow, else .npz. returns the path written"""
+    if fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.table(columns), path + '.parquet')
+        return path + '.parquet'
+    np.savez(path + '.npz', **columns)
+    return path + '.npz'
+
+
+def _merge(parts):
+    """chunk column dicts (in order) -> one dict"""
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel offline gesture analytics over video files")
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--out', default='analytics', help="output directory")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processes (default: all cores)")
+    parser.add_argument('--chunk-seconds', type=float, default=30.0)
+    parser.add_argument('--warmup', type=float, default=2.0, help="seconds decoded before each chunk to prime detectors")
+    parser.add_argument('--format', choices=('auto', 'parquet', 'npz'), default='auto')
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt == 'auto':
+        try:
+            import pyarrow.parquet  # noqa: F401
+            fmt = 'parquet'
+        except ImportError:
+            fmt = 'npz'
+
+    chunks = plan_chunks(args.videos, args.chunk_seconds)
+    if not chunks:
+        return
+    os.makedirs(args.out, exist_ok=True)
+    print(f"{len(chunks)} chunks from {len(args.videos)} videos on {args.workers} workers -> {args.out}/ ({fmt})")
+
+    start = time.perf_counter()
+    results = {}
+    cpu_seconds = 0.0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(analyze_chunk, chunk, args.warmup) for chunk in chunks]
+        for done, future in enumerate(futures, 1):
+            video, chunk_start, columns, events, cpu = future.result()
+            results.setdefault(video, []).append((chunk_start, columns, events))
+            cpu_seconds += cpu
+            print(f"\r  chunks done: {done}/{len(chunks)}", end='', flush=True)
+    wall = time.perf_counter() - start
+    print()
+
+    total_frames = 0
+    for video, parts in results.items():
+        parts.sort(key=lambda part: part[0])
+        frames = _merge([columns for _, columns, _ in parts])
+        events = [event for _, _, chunk_events in parts for event in chunk_events]
+        name = os.path.join(args.out, os.path.splitext(os.path.basename(video))[0])
+        write_table(name + '.frames', frames, fmt)
+        write_table(name + '.events', {
+            'frame': np.array([e[0] for e in events], dtype=np.int64),
+            'timestamp': np.array([e[1] for e in events], dtype=np.float64),
+            'type': np.array([e[2] for e in events], dtype=str),
+            'value': np.array([e[3] for e in events], dtype=np.float32),
+        }, fmt)
+        total_frames += len(frames['frame'])
+        counts = {}
+        for event in events:
+            counts[event[2]] = counts.get(event[2], 0) + 1
+        faces = frames['has_face'].mean() if len(frames['has_face']) else 0.0
+        print(f"  {video}: {len(frames['frame'])} frames, face in {faces:.0%}, events "
+              + (", ".join(f"{k}={v}" for k, v in sorted(counts.items())) or "none"))
+
+    print(f"\nThroughput: {total_frames / wall:,.1f} frames/s over {wall:.1f}s wall"
+          f"  (per core: {total_frames / cpu_seconds:,.1f} frames/s, cpu time / wall = x{cpu_seconds / wall:.1f})")
+
+
+if __name__ == '__main__':
+    main()
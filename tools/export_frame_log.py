@@ -0,0 +1,112 @@
+"""
+Exports a window of the frame ring log (utils.frame_log) to tables.
+
+Output, columnar like tools.analyze_videos:
+    <out>.frames.<ext>   frame, timestamp, unix_time, latency, faces, every logged metric, events (';' separated)
+    <out>.events.<ext>   frame, timestamp, unix_time, type (one row per fired event)
+formats: csv, parquet (needs pyarrow), npz; auto -> parquet when pyarrow is installed, else csv
+
+usage:  python -m tools.export_frame_log frames.ofl                       # the whole ring
+        python -m tools.export_frame_log frames.ofl --last 30             # last 30 s
+        python -m tools.export_frame_log frames.ofl --around left_wink    # +-5 s around every left wink
+"""
+import argparse
+import csv
+import os
+
+import numpy as np
+
+from utils.frame_log import load_frame_log, event_names, METRIC_NAMES
+from tools.analyze_videos import write_table
+
+
+def select(records, event_types, last=None, start=None, end=None, around=None, window=5.0):
+    """boolean mask of the records to export; start / end are seconds relative to the first record"""
+    timestamps = records['unix_time']            #perf_counter timestamps restart with every session of the log
+    keep = np.ones(len(records), dtype=bool)
+    if not len(records):
+        return keep
+    if last is not None:
+        keep &= timestamps >= timestamps[-1] - last
+    if start is not None:
+        keep &= timestamps >= timestamps[0] + start
+    if end is not None:
+        keep &= timestamps <= timestamps[0] + end
+    if around is not None:
+        if around not in event_types:
+            raise SystemExit(f"Unknown event type '{around}', the log has: {', '.join(event_types)}")
+        hits = timestamps[(records['events'] >> np.uint64(event_types.index(around))) & np.uint64(1) == 1]
+        near = np.zeros(len(records), dtype=bool)
+        for hit in hits:
+            near |= np.abs(timestamps - hit) <= window
+        keep &= near
+    return keep
+
+
+def tables(records, info):
+    """-> (frames columns, events columns), name -> 1-D array"""
+    event_types = info['event_types']
+    unix_time = records['unix_time']
+    fired = [event_names(mask, event_types) for mask in records['events'].tolist()]
+
+    frames = {'frame': records['frame'].astype(np.int64), 'timestamp': records['timestamp'],
+              'unix_time': unix_time, 'latency': records['latency'], 'faces': records['faces']}
+    for name in METRIC_NAMES:
+        frames[name] = records[name]
+    frames['events'] = np.array([';'.join(names) for names in fired], dtype=str)
+
+    rows = [(i, name) for i, names in enumerate(fired) for name in names]
+    index = np.array([i for i, _ in rows], dtype=np.int64)
+    events = {'frame': frames['frame'][index], 'timestamp': records['timestamp'][index],
+              'unix_time': unix_time[index], 'type': np.array([name for _, name in rows], dtype=str)}
+    return frames, events
+
+
+def write_csv(path, columns):
+    with open(path + '.csv', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(zip(*(values.tolist() for values in columns.values())))
+    return path + '.csv'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a window of the frame ring log to CSV / Parquet tables")
+    parser.add_argument('log', help="frame log file (FRAME_LOG_CONFIG['PATH'])")
+    parser.add_argument('--out', help="output path without extension (default: next to the log)")
+    parser.add_argument('--format', choices=('auto', 'csv', 'parquet', 'npz'), default='auto')
+    parser.add_argument('--last', type=float, help="only the last N seconds")
+    parser.add_argument('--start', type=float, help="seconds after the first record")
+    parser.add_argument('--end', type=float, help="seconds after the first record")
+    parser.add_argument('--around', help="only frames within --window s of this event type")
+    parser.add_argument('--window', type=float, default=5.0)
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt == 'auto':
+        try:
+            import pyarrow.parquet  # noqa: F401
+            fmt = 'parquet'
+        except ImportError:
+            fmt = 'csv'
+
+    records, info = load_frame_log(args.log)
+    keep = select(records, info['event_types'], args.last, args.start, args.end, args.around, args.window)
+    records = records[keep]
+    frames, events = tables(records, info)
+
+    out = args.out or os.path.splitext(args.log)[0]
+    written = []
+    for suffix, columns in (('.frames', frames), ('.events', events)):
+        if fmt == 'csv':
+            written.append(write_csv(out + suffix, columns))
+        else:
+            written.append(write_table(out + suffix, columns, fmt))
+
+    span = float(records['unix_time'][-1] - records['unix_time'][0]) if len(records) else 0.0
+    print(f"{info['written']} frames logged, ring keeps {info['capacity']}; exported {len(records)} frames "
+          f"({span:.1f}s) and {len(events['type'])} events -> {', '.join(written)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Headless replay of a landmark recording through the detectors.
+No camera, no MediaPipe -> deterministic CPU-only benchmark of the detector hot path.
+
+usage:  python -m tools.replay session.olm [--repeat 5] [--events]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from utils.landmark_recording import load_recording
+from detectors.eye_detector import EyeDetector
+from detectors.head_detector import HeadDetector
+from detectors.mouth_detector import MouthDetector
+
+STAGES = ('eye', 'head', 'mouth')
+
+
+def replay(recording):
+    """
+    runs every frame of a recording through fresh detectors, timed by the recorded capture timestamps
+    (so holds / cooldowns behave exactly like they did live, however fast the replay runs).
+    returns (events, timings) -> events: list of (frame, GestureEvent), timings: stage -> ns per frame
+    """
+    eye_detector = EyeDetector(debug=False)
+    head_detector = HeadDetector()
+    mouth_detector = MouthDetector()
+
+    timings = {stage: [] for stage in STAGES}
+    events = []
+    clock = time.perf_counter_ns
+
+    for i in range(len(recording)):
+        if not recording['has_face'][i]:
+            continue
+        landmarks = recording['landmarks'][i]
+        timestamp = float(recording['timestamp'][i])
+
+        t0 = clock()
+        eye_states = eye_detector.process(landmarks, timestamp)
+        t1 = clock()
+        pose = head_detector.process(landmarks, timestamp)
+        t2 = clock()
+        mouth_states = mouth_detector.process(landmarks, timestamp)
+        t3 = clock()
+
+        timings['eye'].append(t1 - t0)
+        timings['head'].append(t2 - t1)
+        timings['mouth'].append(t3 - t2)
+
+        for event in eye_states['events'] + pose['events'] + mouth_states['events']:
+            events.append((i, event))
+
+    return events, {stage: np.array(ns, dtype=np.int64) for stage, ns in timings.items()}
+
+
+def print_report(events, timings, wall_seconds, show_events=False):
+    frames = len(timings['eye'])
+    print(f"\nFrames with a face: {frames}")
+
+    counts = {}
+    for _, event in events:
+        counts[event.type] = counts.get(event.type, 0) + 1
+    print("Events: " + (", ".join(f"{name}={n}" for name, n in sorted(counts.items())) or "none"))
+    if show_events:
+        for frame, event in events:
+            print(f"  frame {frame:>6}  t={event.timestamp:10.3f}s  {event.type:<16} value={event.value:.4f}")
+
+    if frames == 0:
+        return
+    print(f"\n{'stage':<8}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'mean us':>10}")
+    total = sum(timings.values())
+    for stage, ns in list(timings.items()) + [('total', total)]:
+        p50, p95, p99 = np.percentile(ns, [50, 95, 99]) / 1000
+        print(f"{stage:<8}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{ns.mean() / 1000:>10.1f}")
+
+    print(f"\nDetector throughput: {frames / (total.sum() / 1e9):,.0f} frames/s"
+          f"  (wall incl. replay overhead: {frames / wall_seconds:,.0f} frames/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a landmark recording through the detectors")
+    parser.add_argument('recording', help="file written by utils.landmark_recording.LandmarkRecorder")
+    parser.add_argument('--repeat', type=int, default=1, help="replay N times and report the last run (warm caches)")
+    parser.add_argument('--events', action='store_true', help="print every event, not just counts")
+    args = parser.parse_args()
+
+    recording = load_recording(args.recording)
+    print(f"Loaded {len(recording)} frames from {args.recording}")
+
+    for _ in range(max(1, args.repeat)):
+        start = time.perf_counter()
+        events, timings = replay(recording)
+        wall = time.perf_counter() - start
+
+    print_report(events, timings, wall, show_events=args.events)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import time
+
+import cv2
+import numpy as np
+
+# overlay levels, each one includes everything of the previous ones
+LEVELS = ('none', 'hud', 'contours', 'full')
+
+
+def _connection_array(connections):
+    """MediaPipe connection set {(a, b), ...} -> (E, 2) int index array, built once"""
+    return np.array(sorted(connections), dtype=np.int32)
+
+
+class OverlayRenderer:
+    """
+    Camera window overlay drawn straight from the (N, 3) landmark array.
+    The whole mesh is one cv2.polylines call on precomputed connection indices,
+    instead of drawing_utils' python loop over ~2.5k connections.
+
+    level       -> 'none' | 'hud' (text only) | 'contours' (+ face outline, eyes, lips, iris) | 'full' (+ tesselation)
+    display_fps -> max window refresh rate, frames in between skip drawing and imshow entirely
+    """
+    def __init__(self, level='full', display_fps=60):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown overlay level '{level}', use one of {LEVELS}")
+        self.level = LEVELS.index(level)
+        self.min_interval = 1.0 / display_fps if display_fps else 0.0
+        self.last_render = 0.0
+
+        #connection index arrays, built on the first mesh draw (mediapipe import is slow, keeps startup light)
+        self.tesselation = self.contours = self.irises = self.hand_bones = None
+
+        self.mesh_color = (224, 224, 224)
+        self.iris_color = (0, 0, 255)
+        self.hand_color = (0, 200, 0)
+        self.hud = []                     #text lines queued for the current frame
+        self._canvas = None               #reused mirrored display frame (render(mirror=True))
+
+    def due(self, now=None):
+        """True when the window should be refreshed (display rate limit), marks the refresh"""
+        now = time.perf_counter() if now is None else now
+        if now - self.last_render < self.min_interval:
+            return False
+        self.last_render = now
+        return True
+
+    @property
+    def shows_hud(self):
+        """False at level 'none' -> callers can skip formatting HUD text at all"""
+        return self.level >= LEVELS.index('hud')
+
+    def text(self, text, org, scale, color, thickness):
+        """queues one HUD line (drawn by render() when the level allows it)"""
+        self.hud.append((text, org, scale, color, thickness))
+
+    def draw_mesh(self, frame, landmarks):
+        """mesh for one face (N, 3) or several faces (F, N, 3), normalized array -> still one polylines call"""
+        if landmarks is None or self.level < LEVELS.index('contours'):
+            return frame
+        h, w = frame.shape[:2]
+        points = (landmarks[..., :2] * np.float32((w, h))).astype(np.int32)
+        if points.ndim == 2:
+            points = points[None]
+        if self.tesselation is None:
+            self._load_connections()
+
+        mesh = self.tesselation if self.level == LEVELS.index('full') else self.contours
+        cv2.polylines(frame, points[:, mesh].reshape(-1, 2, 2), False, self.mesh_color, 1)
+        if points.shape[1] > self.irises.max():
+            cv2.polylines(frame, points[:, self.irises].reshape(-1, 2, 2), False, self.iris_color, 1)
+        return frame
+
+    def draw_hands(self, frame, hands):
+        """hand skeletons from an (H, 21, 3) normalized array, one polylines call for all hands"""
+        if hands is None or not len(hands) or self.level < LEVELS.index('contours'):
+            return frame
+        h, w = frame.shape[:2]
+        points = (hands[..., :2] * np.float32((w, h))).astype(np.int32)
+        if self.tesselation is None:
+            self._load_connections()
+        cv2.polylines(frame, points[:, self.hand_bones].reshape(-1, 2, 2), False, self.hand_color, 2)
+        return frame
+
+    def _load_connections(self):
+        import mediapipe as mp
+        face_mesh = mp.solutions.face_mesh
+        self.tesselation = _connection_array(face_mesh.FACEMESH_TESSELATION)
+        self.contours = _connection_array(face_mesh.FACEMESH_CONTOURS)
+        self.irises = _connection_array(face_mesh.FACEMESH_IRISES)
+        self.hand_bones = _connection_array(mp.solutions.hands.HAND_CONNECTIONS)
+
+    def render(self, frame, landmarks, mirror=False, hands=None):
+        """
+        draws mesh + queued HUD text onto the frame, clears the HUD queue.
+        mirror -> frame is the raw camera image: draw on its horizontal flip in a reused canvas
+                  instead (frame itself stays untouched, no new image per refresh)
+        hands  -> optional (H, 21, 3) hand landmarks, same orientation as `landmarks`
+        """
+        if mirror:
+            if self._canvas is None or self._canvas.shape != frame.shape:
+                self._canvas = np.empty_like(frame)
+            frame = cv2.flip(frame, 1, dst=self._canvas)
+        self.draw_mesh(frame, landmarks)
+        self.draw_hands(frame, hands)
+        if self.shows_hud:
+            for text, org, scale, color, thickness in self.hud:
+                cv2.putText(frame, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+        self.hud.clear()
+        return frame
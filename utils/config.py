@@ -7,6 +7,126 @@ Settings for camera, facial landmark thresholds, and gesture timing.
 # 0: Default Integrated Webcam | 1+: External/Android Webcams
 CAMERA_INDEX = 0 
 
+# Optional video file or image folder to drive the loop without a webcam (None -> use CAMERA_INDEX)
+CAMERA_SOURCE = None
+
+# Several cameras at once, e.g. [0, 1] or [0, "lobby.mp4"]: one capture + inference process per source,
+# frames and landmarks shared through shared memory, gesture events merged in the main process.
+# None -> single camera (CAMERA_SOURCE / CAMERA_INDEX) in this process
+CAMERA_SOURCES = None
+
+# Grab frames on a background thread and keep only the newest one (no stale driver-buffered frames)
+CAMERA_THREADED = True
+
+# ── STARTUP ──────────────────────────────────────────────────────
+# Build the face model on a background thread while the camera opens; live frames are shown
+# (without landmarks) until it is ready. Timing breakdown is printed at the first processed frame.
+STARTUP_CONFIG = {
+    "BACKGROUND_MODEL_LOAD": True,
+    "PRINT_TIMING": True
+}
+
+# ── FRAME BUFFERS ────────────────────────────────────────────────
+# Buffer-pool mode: the camera frame is never flipped, landmarks are mirrored instead, and the colour
+# conversion / ROI crop / display frame are written into reused arrays -> no full-size image allocated
+# per frame (measure with: python -m tools.alloc_bench)
+FRAME_CONFIG = {
+    "BUFFER_POOL": True
+}
+
+# ── FACE ROI MODE ────────────────────────────────────────────────
+# Run FaceMesh only on a padded square crop around last frame's face, downscaled to SIZE px.
+# Big win on 720p/1080p cameras; falls back to the full frame whenever the face is lost.
+ROI_CONFIG = {
+    "ENABLED": False,
+    "SIZE": 256,               # Crop side (px) fed to the model
+    "PADDING": 0.3             # Margin around the face box, fraction of face size
+}
+
+# ── MULTI-FACE MODE ──────────────────────────────────────────────
+# MAX_FACES > 1 tracks several people (kiosk / meeting-room cameras), each with its own gesture state.
+# Faces keep a stable ID across frames; every face's events carry it. Disables ROI and adaptive inference.
+FACE_CONFIG = {
+    "MAX_FACES": 1,
+    "MATCH_DISTANCE": 0.5,     # Largest centroid jump between frames (fraction of face size) for the same ID
+    "MAX_AGE": 0.5             # Seconds a face may be missing before its ID and gesture state are dropped
+}
+
+# ── HAND TRACKING ────────────────────────────────────────────────
+# Hand gestures (fist, open palm, 1-4 fingers, pinch) next to the face ones. Shares the frame's
+# colour conversion with FaceMesh; the hand model runs only as often as CPU_BUDGET allows.
+HAND_CONFIG = {
+    "ENABLED": False,
+    "MAX_HANDS": 2,
+    "MODE": "interleave",      # interleave (every K-th frame, same thread) | parallel (own thread, newest frame)
+    "CPU_BUDGET": 0.5,         # Hand model time allowed per frame, as a fraction of face model time
+    "HOLD_SEC": 0.3,           # Pose must be held this long to trigger
+    "EXTEND_RATIO": 1.1,       # Finger counts as up when its tip is this much farther from the wrist than its middle joint
+    "PINCH_THRESHOLD": 0.25,   # Thumb-index tip distance (palm sizes) that counts as a pinch
+    "PINCH_RELEASE": 0.4       # Distance the tips must separate again before the next pinch
+}
+
+# ── ADAPTIVE INFERENCE RATE ──────────────────────────────────────
+# Run FaceMesh only every K frames while the face is still, predict landmarks in between.
+# Any detector close to its threshold forces a real model run on the next frame.
+INFERENCE_CONFIG = {
+    "ADAPTIVE": False,
+    "MAX_INTERVAL": 3,         # Longest gap (frames) between two model runs
+    "STILL_SPEED": 0.03,       # Landmark speed (frame widths / s) below which K may grow
+    "MOVING_SPEED": 0.10,      # Speed above which the model runs every frame again
+    "NEAR_MARGIN": 0.15        # How close (fraction of threshold) counts as "near a trigger"
+}
+
+# ── PIPELINE MODE ────────────────────────────────────────────────
+# Run capture, inference and detection on separate threads (render stays on the main thread).
+# Frame time becomes the slowest stage instead of the sum of all stages.
+PIPELINE_CONFIG = {
+    "ENABLED": False,
+    "QUEUE_SIZE": 2            # Frames buffered between stages; when full the oldest is dropped
+}
+
+# ── LOAD SHEDDING ─────────────────────────────────────────────────
+# Every frame must be done BUDGET_MS after capture. When frames run late, optional work is dropped
+# tier by tier (debug prints, then mesh drawing, then HUD text) and restored once there is headroom again.
+# Gesture detection and actions always run.
+LOAD_SHEDDING_CONFIG = {
+    "ENABLED": True,
+    "BUDGET_MS": 50,           # Capture -> frame done deadline
+    "HEADROOM": 0.3,           # Fraction of the budget left over that counts as spare time
+    "RESTORE_FRAMES": 30       # Frames in a row with spare time before one tier comes back
+}
+
+# ── OVERLAY / DISPLAY ────────────────────────────────────────────
+OVERLAY_CONFIG = {
+    "LEVEL": "full",           # none | hud (text only) | contours | full (whole mesh)
+    "DISPLAY_FPS": 60          # Window refresh cap, frames in between are not drawn at all
+}
+
+# ── METRICS / INSTRUMENTATION ────────────────────────────────────
+# Per-stage latency (mean, p50/p95/p99, histograms) and dropped-frame counters
+METRICS_CONFIG = {
+    "ENABLED": False,
+    "WINDOW": 300,                        # Frames kept for the rolling mean / percentiles
+    "EXPORT_INTERVAL": 5.0,               # Seconds between snapshots
+    "JSONL_PATH": "metrics.jsonl",        # One JSON snapshot per line (None = off)
+    "PROMETHEUS_PATH": "metrics.prom"     # Prometheus text format, rewritten each export (None = off)
+}
+
+# ── LANDMARK RECORDING ───────────────────────────────────────────
+# Path to stream per-frame landmarks to (replay later with: python -m tools.replay <file>)
+# None -> recording off
+RECORD_PATH = None
+
+# ── FRAME LOG ────────────────────────────────────────────────────
+# Fixed-size memory-mapped ring of per-frame metrics (EAR, brow, mouth, pose, gaze) + fired events,
+# for tracing false triggers after the fact. Disk use is fixed: CAPACITY records x 69 bytes.
+# Export a window with: python -m tools.export_frame_log frames.ofl --last 30
+FRAME_LOG_CONFIG = {
+    "ENABLED": True,
+    "PATH": "frames.ofl",
+    "CAPACITY": 18000          # Records kept, 18000 = the last 10 min at 30 fps (~1.2 MB)
+}
+
 # ── HEAD POSE SETTINGS ───────────────────────────────────────────
 # Higher = requires a further head turn (less sensitive)
 # Lower  = easier to trigger (more sensitive)
@@ -18,12 +138,12 @@ YAW_THRESHOLD = 0.45
 EYE_CONFIG = {
     "LEFT_THRESHOLD": 0.22,    # Sensitivity for left eye
     "RIGHT_THRESHOLD": 0.22,   # Sensitivity for right eye
-    "CONSEC_FRAMES": 4         # Frames the eye must be closed to trigger
+    "CLOSED_HOLD_SEC": 0.1     # Seconds the eye must stay closed to trigger (~4 frames @ 30fps)
 }
 
 """
 TUNING GUIDE FOR EYES:
-- Natural blinks triggering actions? -> Increase CONSEC_FRAMES to 6.
+- Natural blinks triggering actions? -> Increase CLOSED_HOLD_SEC to 0.17.
 - Winks not detecting?               -> Decrease THRESHOLD to 0.19.
 - Glasses causing false triggers?    -> Decrease THRESHOLD to 0.17.
 """
@@ -32,18 +152,109 @@ TUNING GUIDE FOR EYES:
 # Distance between eye top and eyebrow
 BROW_CONFIG = {
     "RAISE_THRESHOLD": 0.070,  # Normalized distance trigger
-    "HOLD_FRAMES": 30          # Required hold duration (~1.0s @ 30fps)
+    "HOLD_SEC": 1.0            # Required hold duration in seconds (frame-rate independent)
+}
+
+# ── CALIBRATION PROFILES ─────────────────────────────────────────
+# On the first launch for a user + camera, watch a neutral face for DURATION seconds and derive
+# personal eye / brow / smile / yaw thresholds from it (actions are paused meanwhile).
+# The profile is saved to PROFILE_DIR and loaded instantly on every later launch.
+# Calibrated thresholds are kept within 0.5x - 2x of the defaults below, so they stay reachable.
+# Off by default: when on, the first launch pauses all actions for DURATION seconds and creates
+# PROFILE_DIR in the working directory.
+CALIBRATION_CONFIG = {
+    "ENABLED": False,
+    "USER": None,              # Profile owner, None -> OS login name
+    "PROFILE_DIR": "profiles",
+    "DURATION": 5.0,           # Seconds of neutral face
+    "RECALIBRATE": False       # True -> ignore the saved profile and calibrate again
 }
 
 # ── KEYBOARD COOLDOWN ─────────────────────────────────────────────
 # Prevents a single gesture from spamming multiple key presses
 GLOBAL_COOLDOWN = 0.6
 
+# ── ACTION DISPATCH ───────────────────────────────────────────────
+# Actions run on a worker thread, the frame loop only queues them
+ACTIONS_CONFIG = {
+    "BACKEND": "pyautogui"     # pyautogui (real input) | null (discard) | recording (keep in memory, for tests)
+}
+
+
+# ── POINTER CONTROL ──────────────────────────────────────────────
+# Steer the mouse cursor with a landmark. The cursor moves on its own thread at RATE_HZ,
+# predicting between camera frames; the position where tracking starts is the screen centre.
+POINTER_CONFIG = {
+    "ENABLED": False,
+    "SOURCE": "nose",          # nose | iris | index (fingertip, needs HAND_CONFIG["ENABLED"])
+    "GAIN": 5.0,               # Moving 1/GAIN of the frame width from the start point reaches the screen edge
+    "RATE_HZ": 120,            # Cursor updates per second
+    "MAX_PREDICT_MS": 50,      # Longest extrapolation past the last camera sample
+    "SMOOTHING_MS": 15         # Smoothing time constant, 0 = off (more jitter, less lag)
+}
+
+
+# ── GESTURE -> ACTION BINDINGS ────────────────────────────────────
+# Action: KeyboardActions method ("copy", "task_view", "lock_windows", ...),
+#         "press:<key>" or "hotkey:<key>+<key>", or a list of them. None = gesture disabled.
+# Unbound gestures cost nothing: their detector doesn't even run (unless the HUD shows it).
+GESTURE_BINDINGS = {
+    "left_wink": None,         # e.g. "copy"
+    "right_wink": None,        # e.g. "paste"
+    "both_blink": None,        # natural blink, keep unbound
+    "eyebrow_hold": None,      # e.g. "lock_windows"
+    "smile": None,             # e.g. "copy"
+    "head_turn_left": None,    # e.g. "hotkey:ctrl+win+left"
+    "head_turn_right": None,   # e.g. "task_view"
+    # gaze dwell on a 3x3 screen zone
+    "dwell_top_left": None,
+    "dwell_top": None,         # e.g. "page_up"
+    "dwell_top_right": None,
+    "dwell_left": None,
+    "dwell_center": None,
+    "dwell_right": None,
+    "dwell_bottom_left": None,
+    "dwell_bottom": None,      # e.g. "page_down"
+    "dwell_bottom_right": None,
+    # hand gestures, need HAND_CONFIG["ENABLED"]
+    "fist": None,              # e.g. "lock_windows"
+    "open_palm": None,
+    "pinch": None,             # e.g. "press:enter"
+    "fingers_1": None,
+    "fingers_2": None,
+    "fingers_3": None,
+    "fingers_4": None,
+}
+
+
+# ── FEATURES ─────────────────────────────────────────────────────
+# Detector metrics are computed once per frame in a shared, lazy feature graph (detectors.feature_graph).
+# SCALE_NORMALIZE rescales the metrics measured in image units (brow distance, corner raise, yaw, pitch)
+# to a face whose eye corners are REFERENCE_SCALE frame widths apart -> same thresholds near or far from
+# the camera. Off by default: the thresholds below were tuned on raw values (recalibrate after switching).
+FEATURE_CONFIG = {
+    "SCALE_NORMALIZE": False,
+    "REFERENCE_SCALE": 0.11    # Inter-ocular distance (frame widths) the thresholds were tuned at
+}
+
+
+# ── GAZE (IRIS) SETTINGS ─────────────────────────────────────────
+# The screen is split into 3x3 zones; looking at one for DWELL_SEC fires "dwell_<zone>".
+# Gaze values come from detectors.features.gaze() (x ~0.5 and y ~-0.1 when looking straight ahead).
+GAZE_CONFIG = {
+    "CENTER": (0.5, -0.1),     # Neutral gaze (calibration replaces it with yours)
+    "X_EDGE": 0.05,            # Horizontal offset from CENTER where the left / right zones begin
+    "Y_EDGE": 0.04,            # Vertical offset where the top / bottom zones begin
+    "DWELL_SEC": 1.0,          # Look this long at one zone to select it
+    "DECAY": 2.0,              # How fast the other zones' dwell time drains (x real time)
+    "CLOSED_EAR": 0.15         # Eye aspect ratio below which the iris is ignored (blinks)
+}
+
 
 # ── MOUTH RELATED SETTINGS ─────────────────────────────────────────────
 MOUTH_CONFIG = {
     "SMILE_THRESHOLD": 3.7,              #threshold to detect smile
-    "SMILE_HOLD_FRAMES": 4,              #frames to hold to look for smile
+    "SMILE_HOLD_SEC": 0.1,               #seconds to hold to look for smile
     "SMILE_RESET": 3.5,                  #threshold for lips to reset from smile
     "CORNERS_RAISE_THRESHOLD": 0.006     #threshold for corners to identify lips as smiling
 }
@@ -52,6 +263,6 @@ MOUTH_CONFIG = {
 # -----------------------------------|---------------------------------|------------------
 # Doesn’t detect your smile,         | Lower smile_threshold,         | 3.4 – 3.7
 # Triggers on small smiles / talking,| Raise smile_threshold,         | 4.0 – 4.5
-# Too many false positives,          | Increase min_hold_frames,      | 5–8
-# Action too slow to register,       | Decrease min_hold_frames,      | 3
+# Too many false positives,          | Increase min_hold_sec,         | 0.15–0.25
+# Action too slow to register,       | Decrease min_hold_sec,         | 0.07
 # Corners not detected well,         | Lower corners_raised threshold,| 0.003 – 0.008
\ No newline at end of file
@@ -1,17 +1,24 @@
 import time 
 
 class FPSCounter:
-    def __init__(self):
-        self.prev_time = time.time()
+    def __init__(self, smoothing=0.9):
+        """smoothing -> weight of the previous value (0 = raw 1/dt, closer to 1 = steadier readout)"""
+        self.prev_time = time.perf_counter()
         self.fps = 0.0
+        self.smoothing = smoothing
     
     def update(self):
-        current_time = time.time()
+        """call once per processed frame"""
+        current_time = time.perf_counter()
         dt = current_time - self.prev_time
         if dt > 0:
-            self.fps = 1/dt
+            instant = 1/dt
+            if self.fps == 0.0:
+                self.fps = instant
+            else:
+                self.fps = self.smoothing * self.fps + (1 - self.smoothing) * instant
         self.prev_time = current_time
         return self.fps
     
     def get_text(self, decimals=1):
-        return f"FPS : {self.fps:.{decimals}f}"
\ No newline at end of file
+        return f"FPS : {self.fps:.{decimals}f}"
@@ -0,0 +1,182 @@
+"""
+Fixed-size, memory-mapped ring log of per-frame detector metrics and gesture events.
+
+The file is sized once when the log opens (capacity records) and mapped into memory; every frame
+overwrites the oldest record in place. No per-frame syscalls, no string formatting: a record is one
+structured numpy assignment into the mapping, the kernel writes the dirty pages back on its own
+(and they survive the app crashing). Disk use is bounded by `capacity`, the log keeps the last
+capacity / fps seconds -> enough to trace back a false trigger after the fact.
+A restart reopens the existing log and keeps writing after its last record, so the trace of the
+session that misfired is still there; a log of another layout is moved aside to <path>.1 first.
+
+File layout (little endian):
+    header  : 1024 bytes -> magic b'OCFL', version (u2), number of event types (u2), record size (u4),
+              capacity (u4), frames written (u8, the ring cursor), then the event type names
+              ('\\n' separated utf-8) from offset 64, zero padding
+    records : `capacity` fixed-size records, see record_dtype(); record i holds frame number i % capacity
+
+read with load_frame_log(), export with:  python -m tools.export_frame_log frames.ofl --last 30
+"""
+import os
+import struct
+import time
+
+import numpy as np
+
+from detectors.events import EVENT_TYPES
+
+MAGIC = b'OCFL'
+VERSION = 1
+HEADER_SIZE = 1024
+NAMES_OFFSET = 64
+_HEADER = struct.Struct('<4sHHII')
+_WRITTEN_OFFSET = 16              #u8 frames written so far, updated in the mapping after each record
+
+# detector state dict -> metrics logged from it (NaN when that detector didn't run on the frame)
+METRICS = (
+    ('eye', ('left_ear', 'right_ear', 'brow_distance')),
+    ('mouth', ('mouth_ratio', 'corners_raised')),
+    ('pose', ('yaw', 'pitch', 'roll')),
+    ('gaze', ('gaze_x', 'gaze_y')),
+)
+METRIC_NAMES = tuple(name for _, names in METRICS for name in names)
+
+
+def record_dtype():
+    """numpy dtype of one frame record"""
+    return np.dtype([('frame', '<u8'),               #frames logged before this one
+                     ('timestamp', '<f8'),           #capture time (perf_counter clock)
+                     ('unix_time', '<f8'),           #capture time as unix time (comparable across sessions)
+                     ('latency', '<f4'),             #capture -> logged (s)
+                     ('faces', '<u1')] +
+                    [(name, '<f4') for name in METRIC_NAMES] +
+                    [('events', '<u8')])             #bit i set -> event type i fired on this frame
+
+
+class FrameLog:
+    """
+    Ring log writer, one record per processed frame.
+    usage:  log = FrameLog('frames.ofl', capacity=18000);  log.write(job.timestamp, job.states);  log.close()
+    """
+    def __init__(self, path, capacity=18000, event_types=EVENT_TYPES):
+        """
+        capacity    -> records kept (18000 = 10 min at 30 fps), the file is HEADER_SIZE + capacity x record size bytes
+        event_types -> names of the event bits, at most 64 (stored in the header, the reader doesn't need this code)
+        """
+        if len(event_types) > 64:
+            raise ValueError(f"At most 64 event types fit the events bitmask, got {len(event_types)}")
+        names = '\n'.join(event_types).encode('utf-8')
+        if NAMES_OFFSET + len(names) > HEADER_SIZE:
+            raise ValueError("Event type names don't fit the frame log header")
+
+        self.path = path
+        self.capacity = capacity
+        self.dtype = record_dtype()
+        self.resumed = False              #True -> appending to the log of an earlier session
+        self._bits = {name: 1 << i for i, name in enumerate(event_types)}
+        self._nan_row = (np.nan,) * len(METRIC_NAMES)
+        self._clock_offset = time.time() - time.perf_counter()
+
+        #the whole file is mapped once; header fields and records are numpy views into the mapping
+        header = _HEADER.pack(MAGIC, VERSION, len(event_types), self.dtype.itemsize, capacity)
+        size = HEADER_SIZE + capacity * self.dtype.itemsize
+        written = _resumable(path, header, names, size)
+        if written is not None:
+            self._map = np.memmap(path, dtype=np.uint8, mode='r+', shape=(size,))
+            self.resumed = True
+        else:
+            if os.path.exists(path):
+                os.replace(path, path + '.1')
+                print(f"Frame log {path} has another layout, moved to {path}.1")
+            written = 0
+            self._map = np.memmap(path, dtype=np.uint8, mode='w+', shape=(size,))
+            self._map[:len(header)] = np.frombuffer(header, dtype=np.uint8)
+            self._map[NAMES_OFFSET:NAMES_OFFSET + len(names)] = np.frombuffer(names, dtype=np.uint8)
+        self.frames = written             #frame number of the next record, counts across sessions
+        self.start = written              #first frame of this session
+        self._written = self._map[_WRITTEN_OFFSET:_WRITTEN_OFFSET + 8].view('<u8')
+        self._records = self._map[HEADER_SIZE:].view(self.dtype)
+
+    def write(self, timestamp, states, now=None):
+        """
+        timestamp: capture time of the frame, states: its detect() / detect_faces() states (None = no face)
+        now: perf_counter time the frame finished, for the latency column
+        """
+        if now is None:
+            now = time.perf_counter()
+        metrics = self._nan_row
+        events = 0
+        faces = 0
+        if states is not None:
+            faces = len(states['face_ids']) if 'face_ids' in states else int('pose' in states or 'eye' in states)
+            metrics = tuple(states[key].get(name, np.nan) if key in states else np.nan
+                            for key, names in METRICS for name in names)
+            bits = self._bits
+            for event in states.get('events', ()):
+                events |= bits.get(event.type, 0)
+
+        self._records[self.frames % self.capacity] = ((self.frames, timestamp, timestamp + self._clock_offset,
+                                                       now - timestamp, faces) + metrics + (events,))
+        self.frames += 1
+        self._written[0] = self.frames           #after the record -> a reader never sees a half-written one as valid
+
+    def close(self):
+        """writes the mapping back (the only syscall of the log after opening)"""
+        if self._map is not None:
+            self._map.flush()
+            self._map = self._records = self._written = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _resumable(path, header, names, size):
+    """frames written of an existing log with this exact layout (header fields + event names), else None"""
+    if not os.path.exists(path) or os.path.getsize(path) != size:
+        return None
+    with open(path, 'rb') as f:
+        old = f.read(HEADER_SIZE)
+    if old[:len(header)] != header or old[NAMES_OFFSET:].rstrip(b'\0') != names:
+        return None
+    written, = struct.unpack_from('<Q', old, _WRITTEN_OFFSET)
+    return written
+
+
+def load_frame_log(path):
+    """
+    reads a ring log, also while the app is still writing it (or after it crashed)
+    -> (records, info): records in frame order (oldest first) as a structured array (copy, see record_dtype()),
+       info: 'event_types' (bit order), 'capacity', 'written'
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    magic, version, num_events, record_size, capacity = _HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a frame log")
+    if version != VERSION:
+        raise ValueError(f"Unsupported frame log version {version} in '{path}'")
+    dtype = record_dtype()
+    if dtype.itemsize != record_size or os.path.getsize(path) < HEADER_SIZE + capacity * record_size:
+        raise ValueError(f"Corrupt frame log header in '{path}'")
+
+    written, = struct.unpack_from('<Q', header, _WRITTEN_OFFSET)
+    names = header[NAMES_OFFSET:].rstrip(b'\0').decode('utf-8').split('\n')[:num_events]
+    info = {'event_types': tuple(names), 'capacity': capacity, 'written': written}
+
+    records = np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(capacity,))
+    if written <= capacity:
+        ordered = np.array(records[:written])
+    else:
+        start = written % capacity                #oldest record, the ring wrapped
+        ordered = np.concatenate([records[start:], records[:start]])
+    #a live writer may have overwritten some of the oldest records since the header was read -> drop those
+    return ordered[ordered['frame'] < written], info
+
+
+def event_names(mask, event_types):
+    """events bitmask of one record -> list of event type names"""
+    mask = int(mask)
+    return [name for i, name in enumerate(event_types) if mask >> i & 1]
@@ -0,0 +1,89 @@
+"""
+Compact binary recording of per-frame FaceMesh landmarks.
+
+File layout (little endian):
+    header  : 64 bytes -> magic b'OCLM', version (u2), num_landmarks (u2), record size (u4), zero padding
+    records : fixed size, one per frame -> timestamp (f8), has_face (u4), landmarks (num_landmarks, 3) f4
+
+Fixed-size records mean the whole file maps straight into numpy (np.memmap) without parsing,
+so recordings of any length open instantly and rec['landmarks'] is a (T, N, 3) float32 view.
+"""
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'OCLM'
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct('<4sHHI')
+
+
+def record_dtype(num_landmarks):
+    """numpy dtype of one frame record"""
+    return np.dtype([('timestamp', '<f8'),
+                     ('has_face', '<u4'),
+                     ('landmarks', '<f4', (num_landmarks, 3))])
+
+
+class LandmarkRecorder:
+    """
+    Streams landmarks frame by frame into a recording file.
+    usage:  with LandmarkRecorder('session.olm') as rec:  rec.write(landmarks, timestamp)
+    """
+    def __init__(self, path, num_landmarks=478):
+        self.path = path
+        self.num_landmarks = num_landmarks
+        self.frames = 0
+
+        #one reusable record -> no per-frame allocation, just a memcpy + buffered write
+        self._record = np.zeros(1, dtype=record_dtype(num_landmarks))
+        self._file = open(path, 'wb')
+        header = _HEADER.pack(MAGIC, VERSION, num_landmarks, self._record.itemsize)
+        self._file.write(header.ljust(HEADER_SIZE, b'\0'))
+
+    def write(self, landmarks, timestamp):
+        """landmarks: (N, 3) array or None when no face was found on this frame"""
+        record = self._record[0]
+        record['timestamp'] = timestamp
+        if landmarks is None:
+            record['has_face'] = 0
+            record['landmarks'] = 0.0
+        else:
+            record['has_face'] = 1
+            record['landmarks'] = np.asarray(landmarks)[:self.num_landmarks]
+        self._file.write(self._record.data)
+        self.frames += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_recording(path):
+    """
+    memory-maps a recording -> structured array with fields
+    'timestamp' (T,), 'has_face' (T,) and 'landmarks' (T, N, 3) float32
+    """
+    with open(path, 'rb') as f:
+        magic, version, num_landmarks, record_size = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a landmark recording")
+    if version != VERSION:
+        raise ValueError(f"Unsupported recording version {version} in '{path}'")
+
+    dtype = record_dtype(num_landmarks)
+    if dtype.itemsize != record_size:
+        raise ValueError(f"Corrupt recording header in '{path}'")
+
+    #a partially written last record (e.g. app killed mid-write) is ignored
+    frames = (os.path.getsize(path) - HEADER_SIZE) // record_size
+    if frames == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(frames,))
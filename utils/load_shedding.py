@@ -0,0 +1,82 @@
+import time
+
+# ── Priority tiers (lower = more important) ─────────────────────────
+CRITICAL = 0        #gesture detection + action dispatch, never shed
+HUD = 1             #HUD text (values, FPS)
+MESH = 2            #face mesh / hand skeleton drawing
+DEBUG = 3           #debug prints
+
+TIER_NAMES = ('critical', 'hud', 'mesh', 'debug')
+
+
+class LoadShedder:
+    """
+    Per-frame deadlines with priority tiers, so an overloaded machine drops the nice-to-have work
+    instead of letting gesture latency grow.
+
+    Every frame's deadline is its capture timestamp + budget. Optional work asks allows(tier, timestamp) first:
+    - `level` is the least important tier still allowed. A frame finishing past its deadline lowers it by one
+      tier (debug prints go first, then mesh drawing, then HUD text); `restore_frames` frames in a row
+      finishing with `headroom` of the budget to spare raise it back one tier
+    - independent of the level, optional work is skipped when its frame is already past the deadline
+    Skipped work is counted per tier (shed). Work that only sometimes runs (debug prints) asks with count=False
+    and reports skip(tier) itself when it actually had something to do.
+    """
+    def __init__(self, budget=0.05, headroom=0.3, restore_frames=30, enabled=True):
+        """
+        budget         -> seconds from capture to the end of the frame's work
+        headroom       -> fraction of the budget left over that counts as "room to restore a tier"
+        restore_frames -> consecutive frames with headroom before the next tier comes back
+        """
+        self.budget = budget
+        self.headroom = headroom
+        self.restore_frames = restore_frames
+        self.enabled = enabled
+
+        self.level = DEBUG
+        self.shed = [0] * len(TIER_NAMES)
+        self.late_frames = 0
+        self.frames = 0
+        self._calm = 0                    #consecutive frames with headroom
+
+    def allows(self, tier, timestamp, now=None, count=True):
+        """
+        True when work of `tier` may run for the frame captured at `timestamp`
+        count -> count it as shed if not (False: the caller calls skip() once it knows the work would have run)
+        """
+        if tier == CRITICAL or not self.enabled:
+            return True
+        now = time.perf_counter() if now is None else now
+        if tier <= self.level and now < timestamp + self.budget:
+            return True
+        if count:
+            self.shed[tier] += 1
+        return False
+
+    def skip(self, tier):
+        """counts one frame of `tier` work as shed (after allows(..., count=False) said no and the work was due)"""
+        self.shed[tier] += 1
+
+    def end(self, timestamp, now=None):
+        """call once per frame when its work is done -> adjusts the level, returns it"""
+        now = time.perf_counter() if now is None else now
+        self.frames += 1
+        spare = timestamp + self.budget - now
+
+        if spare < 0:                     #overran -> drop the least important tier still running
+            self.late_frames += 1
+            self._calm = 0
+            if self.level > CRITICAL:
+                self.level -= 1
+        elif spare >= self.headroom * self.budget:
+            self._calm += 1
+            if self._calm >= self.restore_frames and self.level < DEBUG:
+                self.level += 1
+                self._calm = 0
+        else:
+            self._calm = 0
+        return self.level
+
+    def report(self):
+        """tier name -> frames its work was skipped"""
+        return {name: self.shed[tier] for tier, name in enumerate(TIER_NAMES) if tier != CRITICAL}
@@ -0,0 +1,218 @@
+"""
+Per-stage timing instrumentation.
+
+    metrics = Metrics()
+    with metrics.timer('inference'):
+        results = engine.process(frame)
+    metrics.count('dropped_frames')
+
+Each stage keeps a rolling window of recent latencies (mean, p50/p95/p99) plus a cumulative
+latency histogram. MetricsExporter periodically writes snapshots as JSON lines and as a
+Prometheus text-format file (for node_exporter's textfile collector).
+"""
+import bisect
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# histogram bucket upper bounds in seconds (+Inf is implicit)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.066, 0.1, 0.25, 0.5)
+
+
+class RollingStat:
+    """fixed-size ring of the latest samples + cumulative histogram, O(1) per sample, thread safe"""
+    def __init__(self, window=300, buckets=LATENCY_BUCKETS):
+        self.values = np.zeros(window, dtype=np.float64)
+        self.window = window
+        self.index = 0
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()     #one stage can be timed from several threads at once
+
+    def add(self, value):
+        with self._lock:
+            self.values[self.index] = value
+            self.index = (self.index + 1) % self.window
+            self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.total += value
+            self.count += 1
+
+    def histogram(self):
+        """(bucket counts, total, count) taken together"""
+        with self._lock:
+            return list(self.bucket_counts), self.total, self.count
+
+    def summary(self):
+        """mean / percentiles over the rolling window, in seconds"""
+        with self._lock:
+            count = self.count
+            recent = self.values[:min(count, self.window)].copy()
+        if len(recent) == 0:
+            return {'count': 0}
+        p50, p95, p99 = np.percentile(recent, [50, 95, 99])
+        return {'count': count, 'mean': float(recent.mean()), 'p50': float(p50),
+                'p95': float(p95), 'p99': float(p99), 'max': float(recent.max())}
+
+
+class _Timer:
+    """context manager feeding one RollingStat, one per timer() call (threads may time the same stage at once)"""
+    __slots__ = ('stat', 'start')
+
+    def __init__(self, stat):
+        self.stat = stat
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stat.add(time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Named stage timers + counters + gauges.
+    enabled=False turns every call into a no-op so instrumented code needs no branches.
+    Used from several threads (pipeline stages, action dispatcher, hand worker): names are added and
+    counters incremented under a lock, each RollingStat locks its own samples, and exports iterate a copy,
+    so a stage showing up mid-export can't break the export.
+    """
+    def __init__(self, window=300, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.stages = {}                  #name -> RollingStat
+        self.counters = {}                #name -> int (monotonic)
+        self.gauges = {}                  #name -> float (last value)
+        self._lock = threading.Lock()     #new names + counter increments vs. snapshot() / to_prometheus()
+
+    def timer(self, name):
+        """context manager timing one stage: with metrics.timer('draw'): ..."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self._stat(name))
+
+    def observe(self, name, seconds):
+        """records an already measured latency"""
+        if self.enabled:
+            self._stat(name).add(seconds)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:              #read-modify-write, several threads count the same names
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_counter(self, name, value):
+        """for counters owned elsewhere (e.g. WebCam.dropped_frames)"""
+        if self.enabled:
+            self._set(self.counters, name, value)
+
+    def gauge(self, name, value):
+        if self.enabled:
+            self._set(self.gauges, name, value)
+
+    def _set(self, values, name, value):
+        if name in values:
+            values[name] = value          #existing key -> dict size unchanged, safe next to an export
+        else:
+            with self._lock:
+                values[name] = value
+
+    def _stat(self, name):
+        stat = self.stages.get(name)
+        if stat is None:
+            with self._lock:
+                stat = self.stages.get(name)
+                if stat is None:
+                    stat = self.stages[name] = RollingStat(self.window)
+        return stat
+
+    def _copy(self):
+        """(stages items, counters, gauges) copied under the lock, for the exports"""
+        with self._lock:
+            return list(self.stages.items()), dict(self.counters), dict(self.gauges)
+
+    def snapshot(self):
+        stages, counters, gauges = self._copy()
+        return {
+            'time': time.time(),
+            'stages': {name: stat.summary() for name, stat in stages},
+            'counters': counters,
+            'gauges': gauges,
+        }
+
+    def to_prometheus(self, prefix='oculink'):
+        """Prometheus text exposition format of the current state"""
+        lines = [f'# HELP {prefix}_stage_latency_seconds Per-stage frame latency.',
+                 f'# TYPE {prefix}_stage_latency_seconds histogram']
+        stages, counters, gauges = self._copy()
+        for name, stat in stages:
+            bucket_counts, total, count = stat.histogram()
+            cumulative = 0
+            for bound, n in zip(stat.buckets + (float('inf'),), bucket_counts):
+                cumulative += n
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_stage_latency_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_latency_seconds_sum{{stage="{name}"}} {total}')
+            lines.append(f'{prefix}_stage_latency_seconds_count{{stage="{name}"}} {count}')
+
+        lines.append(f'# HELP {prefix}_stage_latency_quantile_seconds Rolling-window latency quantiles.')
+        lines.append(f'# TYPE {prefix}_stage_latency_quantile_seconds gauge')
+        for name, stat in stages:
+            summary = stat.summary()
+            for q in ('p50', 'p95', 'p99'):
+                if q in summary:
+                    lines.append(f'{prefix}_stage_latency_quantile_seconds{{stage="{name}",quantile="{q}"}} {summary[q]}')
+
+        for name, value in counters.items():
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        for name, value in gauges.items():
+            lines.append(f'# TYPE {prefix}_{name} gauge')
+            lines.append(f'{prefix}_{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """writes a snapshot every `interval` seconds: appends to a JSON lines file, rewrites the .prom file"""
+    def __init__(self, metrics, jsonl_path=None, prometheus_path=None, interval=5.0):
+        self.metrics = metrics
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.interval = interval
+        self.last_export = time.perf_counter()
+
+    def maybe_export(self, now=None):
+        now = time.perf_counter() if now is None else now
+        if now - self.last_export >= self.interval:
+            self.export()
+            self.last_export = now
+
+    def export(self):
+        if self.jsonl_path:
+            with open(self.jsonl_path, 'a') as f:
+                f.write(json.dumps(self.metrics.snapshot()) + '\n')
+        if self.prometheus_path:
+            #write + rename so a scraper never reads a half written file
+            tmp_path = self.prometheus_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(self.metrics.to_prometheus())
+            os.replace(tmp_path, self.prometheus_path)
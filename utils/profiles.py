@@ -0,0 +1,45 @@
+"""
+Per-user calibration profiles on disk: one small JSON file per (user, camera),
+so the next launch loads its thresholds instantly instead of calibrating again.
+"""
+import getpass
+import json
+import os
+import re
+
+
+def default_user():
+    try:
+        return getpass.getuser()
+    except Exception:                     #no login name (service / container)
+        return 'default'
+
+
+def profile_path(directory, user, camera):
+    """profiles/<user>@<camera>.json, anything unsafe in a file name replaced by '_'"""
+    key = f"{user}@{camera}"
+    return os.path.join(directory, re.sub(r'[^A-Za-z0-9_.@-]', '_', key) + '.json')
+
+
+def load_profile(directory, user, camera):
+    """the stored profile dict, or None if there is none (or it can't be read)"""
+    path = profile_path(directory, user, camera)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable profile {path}: {e}")
+        return None
+
+
+def save_profile(directory, user, camera, profile):
+    """writes atomically (temp file + rename) so a crash never leaves half a profile; returns the path"""
+    os.makedirs(directory, exist_ok=True)
+    path = profile_path(directory, user, camera)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(dict(profile, user=user, camera=str(camera)), f, indent=2)
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,78 @@
+"""
+Startup helpers: per-phase timing and background loading of slow subsystems.
+
+Time to the first processed frame matters (launched on login / on demand), so the face model
+is imported and built on a thread while the camera opens and first frames are already shown.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+# set when this module is first imported -> main.py imports it first, so it is ~process start
+PROCESS_START = time.perf_counter()
+
+
+class StartupTimer:
+    """records named phases (start / end, which thread) and one-off milestones, prints a breakdown"""
+    def __init__(self, start=PROCESS_START):
+        self.start = start
+        self.phases = []                  #(name, start, end, thread name)
+        self.marks = {}                   #milestone -> seconds since start
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append((name, begin, end, threading.current_thread().name))
+
+    def mark(self, name):
+        """first call wins: records seconds from start to now under `name`"""
+        with self._lock:
+            if name not in self.marks:
+                self.marks[name] = time.perf_counter() - self.start
+
+    def report(self):
+        print("\nStartup timing (ms from process start):")
+        print(f"  {'phase':<22}{'start':>8}{'end':>8}{'took':>8}  thread")
+        for name, begin, end, thread in sorted(self.phases, key=lambda p: p[1]):
+            print(f"  {name:<22}{(begin - self.start) * 1000:>8.0f}{(end - self.start) * 1000:>8.0f}"
+                  f"{(end - begin) * 1000:>8.0f}  {thread}")
+        for name, seconds in sorted(self.marks.items(), key=lambda m: m[1]):
+            print(f"  -> {name:<19}{seconds * 1000:>8.0f}")
+        print()
+
+
+class BackgroundLoader:
+    """runs factory() on a daemon thread; poll `ready`, then result() returns it (or re-raises its error)"""
+    def __init__(self, factory, name='loader'):
+        self.factory = factory
+        self._result = None
+        self._error = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self._result = self.factory()
+        except BaseException as e:        #handed to the caller in result()
+            self._error = e
+        finally:
+            self._done.set()
+
+    @property
+    def ready(self):
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        """blocks until the factory finished (timeout -> None if still running)"""
+        if not self._done.wait(timeout):
+            return None
+        if self._error is not None:
+            raise self._error
+        return self._result